@@ -0,0 +1,61 @@
+import os
+import sys
+import time
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+from synthetic_data import build_synthetic_db
+
+# End-to-end cost of one cron-style crowd index run (fresh interpreter, imports, queries,
+# scoring): the pandas-free calculate_crowd_index_lite() path vs the pandas batch path.
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+RUN_TEMPLATE = """
+import sys, sqlite3
+sys.path.insert(0, {root!r})
+from utils.crowd_index_utils import {function}, get_latest_timestamp, PARKS
+conn = sqlite3.connect({db!r})
+{function}(conn, PARKS, get_latest_timestamp(conn))
+print('pandas' in sys.modules)
+"""
+
+VARIANTS = {
+    'interpreter': "print(False)",
+    'lite': 'calculate_crowd_index_lite',
+    'batch': 'calculate_crowd_index_batch',
+}
+
+
+def run_once(code):
+    start = time.perf_counter()
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    return time.perf_counter() - start, output.strip().splitlines()[-1] == 'True'
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Benchmark crowd index CLI start-up (lite vs pandas).")
+    arg_parser.add_argument("--db", help="Existing live.db; default: build a synthetic one")
+    arg_parser.add_argument("--runs", type=int, default=7)
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = args.db
+        if not db_path:
+            db_path = os.path.join(tmp, "live.db")
+            build_synthetic_db(db_path, days=2, attractions_per_park=60, poll_minutes=5)
+
+        print(f"\n📊 Fresh interpreter per run, median of {args.runs}")
+        for name, variant in VARIANTS.items():
+            code = variant if name == 'interpreter' else RUN_TEMPLATE.format(root=ROOT, function=variant, db=db_path)
+            timings, pandas_loaded = [], False
+            for _ in range(args.runs):
+                elapsed, pandas_loaded = run_once(code)
+                timings.append(elapsed)
+            print(f"   {name:<12} {statistics.median(timings) * 1000:>8.1f} ms   pandas imported: {'yes' if pandas_loaded else 'no'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+import os
+import sys
+import time
+import random
+import sqlite3
+import argparse
+import tempfile
+from datetime import date, timedelta
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils.crowd_index import available_strategies, evaluate, get_strategy
+from utils.crowd_index_backfill import load_snapshot_data
+from synthetic_data import build_synthetic_db
+
+# Side-by-side benchmark of the registered crowd index strategies on one dataset:
+#   batch - strategy.compute() over every poll cycle of the preloaded range (evaluate())
+#   live  - strategy.calculate() per sampled poll against the database, with its query count
+# plus the distribution of each strategy's index and levels over the range.
+#
+#   python Tools/benchmark_crowd_index_strategies.py                        # synthetic data
+#   python Tools/benchmark_crowd_index_strategies.py --db warehouse.db --start 2025-07-01 --end 2025-07-07
+
+
+def timed_live(conn, strategy, parks, timestamp):
+    statements = []
+    conn.set_trace_callback(statements.append)
+    start = time.perf_counter()
+    strategy.calculate(conn, parks, timestamp)
+    elapsed = time.perf_counter() - start
+    conn.set_trace_callback(None)
+    return elapsed, len(statements)
+
+
+def print_distribution(name, frame, strategy):
+    index = frame['crowd_index'].to_numpy()
+    quantiles = np.percentile(index, [0, 25, 50, 75, 100])
+    print(f"\n   {name}: mean {index.mean():5.1f}   min/p25/p50/p75/max "
+          + "/".join(f"{q:.0f}" for q in quantiles))
+    levels = frame['crowd_index'].map(strategy.crowd_level).value_counts()
+    for level, count in levels.items():
+        print(f"      {level:<16} {count:>7}  {count / len(frame) * 100:5.1f}%")
+    confidence = frame['confidence'].value_counts()
+    print("      confidence: " + ", ".join(f"{k} {v / len(frame) * 100:.0f}%" for k, v in confidence.items()))
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Benchmark crowd index strategies side by side.")
+    arg_parser.add_argument("--db", help="warehouse.db or live.db; default: build a synthetic one")
+    arg_parser.add_argument("--start", help="First UTC day (YYYY-MM-DD); default: two days before --end")
+    arg_parser.add_argument("--end", help="Last UTC day (YYYY-MM-DD); default: last day with data")
+    arg_parser.add_argument("--strategies", nargs="+", help=f"default: all ({', '.join(available_strategies())})")
+    arg_parser.add_argument("--live-samples", type=int, default=10, help="Polls timed through the live path")
+    args = arg_parser.parse_args()
+
+    strategies = [get_strategy(name) for name in (args.strategies or available_strategies())]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = args.db
+        if not db_path:
+            db_path = os.path.join(tmp, "warehouse.db")
+            build_synthetic_db(db_path, days=35, attractions_per_park=60, poll_minutes=5)
+
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        try:
+            last_day = conn.execute("SELECT MAX(timestamp) FROM queue_status").fetchone()[0][:10]
+            end_day = date.fromisoformat(args.end or last_day)
+            start_day = date.fromisoformat(args.start) if args.start else end_day - timedelta(days=2)
+
+            started = time.perf_counter()
+            data = load_snapshot_data(db_path, start_day, end_day)
+            load_time = time.perf_counter() - started
+            if data is None:
+                print(f"❌ No polls between {start_day} and {end_day}")
+                sys.exit(1)
+            snaps = len(data.snaps)
+            print(f"\n📊 {start_day} → {end_day}: {snaps} poll cycles x {len(data.parks)} parks, "
+                  f"{len(data.rows)} rows loaded in {load_time:.2f}s")
+
+            results, batch_times = {}, {}
+            for strategy in strategies:
+                started = time.perf_counter()
+                results.update(evaluate([strategy], data))
+                batch_times[strategy.name] = time.perf_counter() - started
+
+            polls = data.snaps['poll_timestamp'].tolist()
+            sample = random.Random(7).sample(polls, min(args.live_samples, len(polls)))
+            print(f"\n   {'strategy':<10} {'batch total':>12} {'per poll':>10}   {'live/poll':>10} {'queries':>8}")
+            for strategy in strategies:
+                live = [timed_live(conn, strategy, data.parks, ts) for ts in sample]
+                live_ms = sum(t for t, _ in live) / len(live) * 1000
+                queries = sum(q for _, q in live) / len(live)
+                print(f"   {strategy.name:<10} {batch_times[strategy.name]:>11.2f}s "
+                      f"{batch_times[strategy.name] / snaps * 1000:>8.2f}ms   {live_ms:>8.1f}ms {queries:>8.1f}")
+        finally:
+            conn.close()
+
+    print("\n📈 Output distribution (all poll cycles x parks)")
+    for strategy in strategies:
+        print_distribution(strategy.name, results[strategy.name], strategy)
+
+
+if __name__ == "__main__":
+    main()
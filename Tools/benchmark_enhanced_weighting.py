@@ -0,0 +1,92 @@
+import os
+import sys
+import timeit
+import argparse
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils.improved_crowd_index_util import weight_attractions
+
+# Micro-benchmark of the enhanced crowd index's per-attraction weighting: the former
+# iterrows() loop with substring key matching vs the entity-weight map + NumPy version.
+
+
+def build_frame(resorts, entities_per_resort, keys_per_resort, seed=11):
+    """df_latest-shaped frame plus the key names, key weights and entity weight map for it."""
+    rng = np.random.default_rng(seed)
+    rows, key_attractions, key_weights, entity_weights = [], [], {}, {}
+    for r in range(resorts):
+        for i in range(entities_per_resort):
+            is_key = i < keys_per_resort
+            name = f"Resort {r} Key Ride {i} Adventure" if is_key else f"Resort {r} Ride {i}"
+            rows.append({
+                'entity_id': f"R{r}-{i}",
+                'attraction_name': name,
+                'wait_minutes': int(rng.integers(5, 120)),
+                # ~10% of attractions have no positive 7-day average
+                'avg_recent_wait': float(rng.uniform(5, 90)) if rng.random() > 0.1 else None,
+            })
+            if is_key:
+                key = f"Resort {r} Key Ride {i} "
+                key_attractions.append(key)
+                key_weights[key] = min(float(rng.uniform(10, 100)) / 30.0, 3.0)
+                entity_weights[f"R{r}-{i}"] = key_weights[key] * 2.0
+    return pd.DataFrame(rows), key_attractions, key_weights, entity_weights
+
+
+def legacy_weighted_avg(df_latest, key_attractions, key_attraction_weights, baseline_wait):
+    """The weighting loop as it was in calculate_enhanced_crowd_index()."""
+    weighted_waits = []
+    total_weight = 0
+    for _, row in df_latest.iterrows():
+        wait_time = row['wait_minutes']
+        attraction_name = row['attraction_name']
+        is_key_attraction = any(key in attraction_name for key in key_attractions)
+        if is_key_attraction:
+            weight = max([key_attraction_weights.get(key, 1.0)
+                          for key in key_attractions if key in attraction_name])
+            weight *= 2.0
+        else:
+            weight = 1.0
+        if pd.notna(row['avg_recent_wait']) and row['avg_recent_wait'] > 0:
+            weight *= min(row['avg_recent_wait'] / baseline_wait, 3.0)
+        weighted_waits.append(wait_time * weight)
+        total_weight += weight
+    return sum(weighted_waits) / total_weight
+
+
+def vectorized_weighted_avg(df_latest, entity_weights, baseline_wait):
+    weights = weight_attractions(df_latest, entity_weights, baseline_wait)
+    return float(np.dot(df_latest['wait_minutes'].to_numpy(dtype=float), weights) / weights.sum())
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Benchmark the enhanced crowd index attraction weighting.")
+    arg_parser.add_argument("--resorts", type=int, default=6)
+    arg_parser.add_argument("--entities", type=int, default=80, help="Attractions per resort")
+    arg_parser.add_argument("--keys", type=int, default=8, help="Key attractions per resort")
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    args = arg_parser.parse_args()
+
+    baseline_wait = 15
+    df_latest, key_attractions, key_weights, entity_weights = build_frame(args.resorts, args.entities, args.keys)
+
+    legacy = legacy_weighted_avg(df_latest, key_attractions, key_weights, baseline_wait)
+    vectorized = vectorized_weighted_avg(df_latest, entity_weights, baseline_wait)
+    if not np.isclose(legacy, vectorized, rtol=1e-12):
+        print(f"❌ Results differ: legacy {legacy!r} vs vectorized {vectorized!r}")
+        sys.exit(1)
+
+    print(f"\n📊 {len(df_latest)} attractions ({args.resorts} resorts), {len(key_attractions)} key attractions")
+    for label, fn in (('legacy', lambda: legacy_weighted_avg(df_latest, key_attractions, key_weights, baseline_wait)),
+                      ('vector', lambda: vectorized_weighted_avg(df_latest, entity_weights, baseline_wait))):
+        runs = 10 if label == 'legacy' else 200
+        best = min(timeit.repeat(fn, number=runs, repeat=args.repeat)) / runs
+        print(f"   {label:<7} {best * 1000:>8.3f} ms per weighting pass")
+    print(f"✅ Weighted averages match ({vectorized:.6f} min)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+import os
+import sys
+import time
+import sqlite3
+import argparse
+import tempfile
+import statistics
+
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils.park_frames import compact_park_frame, top_rides_hourly
+from synthetic_data import build_synthetic_db, PARKS
+
+# Time of the dashboard's hourly trends data for one park: the previous per-ride loop (filter, copy,
+# groupby and merge for each top ride) vs the single groupby/pivot in utils/park_frames.py, on a
+# day's polls at a few polling rates, plus a check that both return the same dict.
+#
+#   python Tools/benchmark_hourly_trends.py                      # synthetic, polls every 5/2/1 min
+#   python Tools/benchmark_hourly_trends.py --db live.db
+
+FRAME_QUERY = """
+SELECT
+      e.name AS Name,
+      e.type AS Type,
+      qs.wait_minutes AS wait_minutes,
+      qs.timestamp AS timestamp,
+      qs.status
+  FROM queue_status qs
+  JOIN entities e ON qs.entity_id = e.id
+  WHERE e.park = ?
+  AND e.type = 'ATTRACTION'
+  AND qs.wait_minutes > 1
+ ORDER BY qs.timestamp DESC;
+"""
+
+
+def legacy_hourly(park_df, num_rides=10, today=None):
+    """get_top_rides_hourly_data_today as it was before the groupby/pivot version."""
+    if park_df.empty:
+        return {}
+    today_eastern = today if today is not None else pd.Timestamp.now(tz='US/Eastern').normalize()
+    today_df = park_df[park_df['Timestamp'].dt.normalize() == today_eastern]
+    if today_df.empty:
+        return {}
+    top_rides = today_df.groupby('Name', observed=True)['Wait Minutes'].mean().nlargest(num_rides).index.tolist()
+
+    hourly_dict = {}
+    all_hours = pd.DataFrame({'Hour': range(7, 25)})
+    for ride in top_rides:
+        filtered_df = today_df.loc[today_df['Name'] == ride]
+        ride_df = pd.DataFrame(filtered_df.copy()).reset_index(drop=True)
+        ride_df['Hour'] = ride_df['Timestamp'].dt.hour
+        hourly = ride_df.groupby('Hour')['Wait Minutes'].mean().reset_index().rename(columns={'Wait Minutes': 'AvgWait'})
+        hourly = all_hours.merge(hourly, on='Hour', how='left').fillna(0)
+        hourly = hourly[hourly['AvgWait'] > 5]
+        if not hourly.empty:
+            hourly_dict[ride] = hourly
+    return hourly_dict
+
+
+def same_result(legacy, grouped):
+    if list(legacy) != list(grouped):
+        return False
+    for ride, frame in legacy.items():
+        try:
+            pd.testing.assert_frame_equal(frame, grouped[ride], check_index_type=False)
+        except AssertionError:
+            return False
+    return True
+
+
+def timed(build, df, today, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = build(df, today=today)
+        timings.append(time.perf_counter() - start)
+    return result, statistics.median(timings)
+
+
+def benchmark_db(db_path, runs):
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        parks = [row[0] for row in conn.execute("SELECT DISTINCT park FROM entities WHERE type = 'ATTRACTION'")] or PARKS
+        for park_name in parks:
+            df = compact_park_frame(pd.read_sql_query(FRAME_QUERY, conn, params=(park_name,)))
+            if df.empty:
+                continue
+            today = df['Timestamp'].max().normalize()  # the newest day in the file stands in for today
+            today_rows = int((df['Timestamp'].dt.normalize() == today).sum())
+            legacy, legacy_time = timed(legacy_hourly, df, today, runs)
+            grouped, grouped_time = timed(top_rides_hourly, df, today, runs)
+            print(f"   {park_name:<20} {len(df):>8} {today_rows:>8}   {legacy_time * 1000:>9.1f} {grouped_time * 1000:>10.1f}   "
+                  f"{legacy_time / grouped_time:>6.1f}x   {'✅' if same_result(legacy, grouped) else '❌'}")
+    finally:
+        conn.close()
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Benchmark the dashboard's hourly trends data (per-ride loop vs groupby/pivot).")
+    arg_parser.add_argument("--db", help="Existing live.db; default: build synthetic ones")
+    arg_parser.add_argument("--poll-minutes", type=int, nargs='+', default=[5, 2, 1])
+    arg_parser.add_argument("--attractions", type=int, default=60, help="Synthetic attractions per park")
+    arg_parser.add_argument("--runs", type=int, default=5)
+    args = arg_parser.parse_args()
+
+    header = f"   {'park':<20} {'rows':>8} {'today':>8}   {'legacy ms':>9} {'grouped ms':>10}   {'speedup':>7}   same dict"
+    if args.db:
+        print(f"\n📊 {args.db}: median of {args.runs} runs per park")
+        print(header)
+        benchmark_db(args.db, args.runs)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for poll_minutes in args.poll_minutes:
+            db_path = os.path.join(tmp, f"live_{poll_minutes}.db")
+            build_synthetic_db(db_path, days=2, attractions_per_park=args.attractions, poll_minutes=poll_minutes)
+            print(f"\n📊 Polls every {poll_minutes} min, 2 days: median of {args.runs} runs per park")
+            print(header)
+            benchmark_db(db_path, args.runs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+import os
+import sys
+import time
+import sqlite3
+import argparse
+import tempfile
+import statistics
+
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils.park_frames import compact_park_frame, frame_memory_mb
+from synthetic_data import build_synthetic_db, PARKS
+
+# Per-park memory and load time of the dashboard's live frame: the previous schema (object strings,
+# three copies of the timestamp, per-row HH:MM strings) vs the slim one from utils/park_frames.py,
+# plus a check that both give the same per (attraction, weekday, hour) means.
+#
+#   python Tools/benchmark_park_frames.py                 # synthetic 2-day live.db
+#   python Tools/benchmark_park_frames.py --db live.db
+
+LEGACY_QUERY = """
+SELECT
+      e.name AS Name,
+      e.type AS Type,
+      qs.wait_minutes AS wait_minutes,
+      qs.timestamp AS timestamp,
+      qs.status,
+      qs.lightning_lane_available,
+      qs.lightning_lane_cost
+  FROM queue_status qs
+  JOIN entities e ON qs.entity_id = e.id
+  WHERE e.park = ?
+  AND e.type = 'ATTRACTION'
+  AND qs.wait_minutes > 1
+ ORDER BY qs.timestamp DESC;
+"""
+
+COMPACT_QUERY = """
+SELECT
+      e.name AS Name,
+      e.type AS Type,
+      qs.wait_minutes AS wait_minutes,
+      qs.timestamp AS timestamp,
+      qs.status
+  FROM queue_status qs
+  JOIN entities e ON qs.entity_id = e.id
+  WHERE e.park = ?
+  AND e.type = 'ATTRACTION'
+  AND qs.wait_minutes > 1
+ ORDER BY qs.timestamp DESC;
+"""
+
+
+def load_legacy(conn, park_name):
+    """load_park_data as it was before the slim schema."""
+    df = pd.read_sql_query(LEGACY_QUERY, conn, params=(park_name,))
+    df['Timestamp'] = pd.to_datetime(df['timestamp'], errors='coerce').dt.tz_localize('UTC').dt.tz_convert('US/Eastern')
+    df['Day of Week'] = df['Timestamp'].dt.day_name()
+    df['Hour of Day'] = df['Timestamp'].dt.hour
+    df['Wait Minutes'] = df['wait_minutes'].fillna(0)
+    df['Wait Time - Stand By'] = df['wait_minutes'].apply(
+        lambda x: f"{int(x//60):02d}:{int(x%60):02d}" if pd.notna(x) and x > 0 else ""
+    )
+    df['Day of Week'] = df['Timestamp'].dt.day_name()
+    df['Hour of Day'] = df['Timestamp'].dt.hour
+    df['Last Updated'] = df['Timestamp']
+    return df
+
+
+def load_compact(conn, park_name):
+    return compact_park_frame(pd.read_sql_query(COMPACT_QUERY, conn, params=(park_name,)))
+
+
+def cell_means(df):
+    means = df.groupby(['Name', 'Day of Week', 'Hour of Day'], observed=True)['Wait Minutes'].mean().reset_index()
+    means = means.astype({'Name': str, 'Day of Week': str, 'Hour of Day': 'int64'})
+    return means.sort_values(['Name', 'Day of Week', 'Hour of Day'], ignore_index=True)
+
+
+def timed(load, conn, park_name, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        df = load(conn, park_name)
+        timings.append(time.perf_counter() - start)
+    return df, statistics.median(timings)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Benchmark the dashboard's live frame schema (legacy vs slim).")
+    arg_parser.add_argument("--db", help="Existing live.db; default: build a synthetic one")
+    arg_parser.add_argument("--runs", type=int, default=3)
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = args.db
+        if not db_path:
+            db_path = os.path.join(tmp, "live.db")
+            build_synthetic_db(db_path, days=2, attractions_per_park=60, poll_minutes=5)
+
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        try:
+            parks = [row[0] for row in conn.execute("SELECT DISTINCT park FROM entities WHERE type = 'ATTRACTION'")] or PARKS
+            print(f"\n📊 Median of {args.runs} loads per park")
+            print(f"   {'park':<20} {'rows':>8}   {'legacy MB':>9} {'slim MB':>8}   {'legacy s':>8} {'slim s':>7}   same means")
+            for park_name in parks:
+                legacy, legacy_time = timed(load_legacy, conn, park_name, args.runs)
+                compact, compact_time = timed(load_compact, conn, park_name, args.runs)
+                same = cell_means(legacy).equals(cell_means(compact))
+                print(f"   {park_name:<20} {len(compact):>8}   {frame_memory_mb(legacy):>9.1f} {frame_memory_mb(compact):>8.1f}   "
+                      f"{legacy_time:>8.2f} {compact_time:>7.2f}   {'✅' if same else '❌'}")
+        finally:
+            conn.close()
+
+
+if __name__ == "__main__":
+    main()
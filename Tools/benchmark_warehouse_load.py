@@ -0,0 +1,95 @@
+import os
+import sys
+import time
+import sqlite3
+import argparse
+import tempfile
+import tracemalloc
+from datetime import date, timedelta
+
+import pandas as pd
+import pyarrow as pa
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils.warehouse_parquet import export_date_range, load_warehouse_parquet
+from synthetic_data import build_synthetic_db
+
+# The dashboard's current SQLite path (load_warehouse_data in app_dashboard.py)
+SQLITE_QUERY = """
+SELECT
+    e.name AS Name,
+    e.type AS Type,
+    qs.wait_minutes AS wait_minutes,
+    qs.timestamp AS timestamp,
+    qs.status
+FROM queue_status qs
+JOIN entities e ON qs.entity_id = e.id
+WHERE qs.park = ?
+AND e.type = 'ATTRACTION'
+AND qs.wait_minutes > 1
+ORDER BY qs.timestamp DESC;
+"""
+
+
+def load_sqlite(db_path, park_name):
+    conn = sqlite3.connect(db_path)
+    df = pd.read_sql_query(SQLITE_QUERY, conn, params=(park_name,))
+    conn.close()
+    df['Timestamp'] = pd.to_datetime(df['timestamp'], errors='coerce').dt.tz_localize('UTC').dt.tz_convert('US/Eastern')
+    return df
+
+
+def load_parquet(parquet_root, park_name):
+    df = load_warehouse_parquet([park_name], columns=['name', 'type', 'wait_minutes', 'timestamp', 'status'],
+                                parquet_root=parquet_root)
+    df = df[(df['type'] == 'ATTRACTION') & (df['wait_minutes'].fillna(0) > 1)]
+    df['Timestamp'] = df['timestamp'].dt.tz_convert('US/Eastern')
+    return df
+
+
+def measure(label, fn, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    df = fn(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    frame_mb = df.memory_usage(deep=True).sum() / 1e6
+    print(f"   {label:<8} {elapsed * 1000:>9.1f} ms   peak {peak / 1e6:>8.1f} MB   frame {frame_mb:>8.1f} MB   rows {len(df):>9}")
+    return elapsed, peak
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Compare warehouse load time/memory: SQLite vs Parquet.")
+    arg_parser.add_argument("--db", help="Existing warehouse.db (default: build a synthetic one)")
+    arg_parser.add_argument("--parquet", help="Existing Parquet export root (default: export into a temp dir)")
+    arg_parser.add_argument("--days", type=int, default=60, help="Days of synthetic data")
+    arg_parser.add_argument("--park", default="Magic Kingdom")
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = args.db
+        if not db_path:
+            db_path = os.path.join(tmp, "warehouse.db")
+            print(f"Building {args.days} days of synthetic data...")
+            build_synthetic_db(db_path, days=args.days)
+
+        parquet_root = args.parquet
+        if not parquet_root:
+            parquet_root = os.path.join(tmp, "parquet")
+            with sqlite3.connect(db_path) as conn:
+                first, last = conn.execute("SELECT MIN(timestamp), MAX(timestamp) FROM queue_status").fetchone()
+            export_date_range(db_path, date.fromisoformat(first[:10]) - timedelta(days=1),
+                              date.fromisoformat(last[:10]), parquet_root)
+
+        print(f"\n📊 Warehouse load for {args.park}")
+        sqlite_time, sqlite_peak = measure("sqlite", load_sqlite, db_path, args.park)
+        parquet_time, parquet_peak = measure("parquet", load_parquet, parquet_root, args.park)
+        # Arrow buffers are allocated outside tracemalloc's view, so count the Arrow pool's high-water mark too
+        parquet_peak += pa.default_memory_pool().max_memory() or 0
+        print(f"\n   Parquet is {sqlite_time / parquet_time:.1f}x faster and peaks at "
+              f"{parquet_peak / sqlite_peak:.0%} of the SQLite path's memory.")
+
+
+if __name__ == "__main__":
+    main()
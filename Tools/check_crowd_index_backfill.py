@@ -0,0 +1,75 @@
+import os
+import sys
+import sqlite3
+import argparse
+import tempfile
+from datetime import date, timedelta
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils.crowd_index_backfill import run_backfill
+from utils.crowd_index_history import HISTORY_COLUMNS
+from synthetic_data import build_synthetic_db
+
+# Verifies that the crowd index backfill doesn't depend on where its chunks start and end: every
+# chunk size must write exactly the rows a single chunk over the whole range writes. Polls just
+# after 00:00 UTC need the hour before their day (last-hour operating count) and poll cycles that
+# straddle midnight need the seconds after the previous chunk's last day.
+#
+#   python Tools/check_crowd_index_backfill.py                   # synthetic 4-day DB, 5-minute polls
+#   python Tools/check_crowd_index_backfill.py --db warehouse.db --start 2025-07-01 --end 2025-07-04
+
+
+def history_rows(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        # HISTORY_COLUMNS leaves out the write time, which differs between runs
+        return conn.execute(f"SELECT {', '.join(HISTORY_COLUMNS)} FROM crowd_index_history "
+                            f"ORDER BY poll_timestamp, park").fetchall()
+    finally:
+        conn.close()
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Check that chunked and single-range crowd index backfills match.")
+    arg_parser.add_argument("--db", help="Existing warehouse.db; default: build a synthetic one")
+    arg_parser.add_argument("--start", help="First UTC day (YYYY-MM-DD); default: the synthetic DB's second day")
+    arg_parser.add_argument("--end", help="Last UTC day (YYYY-MM-DD); default: the synthetic DB's last day")
+    arg_parser.add_argument("--chunk-days", type=int, nargs='+', default=[1, 2])
+    arg_parser.add_argument("--workers", type=int, default=2)
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = args.db
+        end_day = date.fromisoformat(args.end) if args.end else date.today()
+        start_day = date.fromisoformat(args.start) if args.start else end_day - timedelta(days=2)
+        if not db_path:
+            db_path = os.path.join(tmp, "warehouse.db")
+            build_synthetic_db(db_path, days=4, attractions_per_park=20, poll_minutes=5, end_date=end_day)
+
+        days = (end_day - start_day).days + 1
+        single_db = os.path.join(tmp, "single.db")
+        run_backfill(start_day, end_day, db_path, single_db, chunk_days=days, workers=args.workers)
+        expected = history_rows(single_db)
+
+        failures = 0
+        for chunk_days in args.chunk_days:
+            chunked_db = os.path.join(tmp, f"chunked_{chunk_days}.db")
+            run_backfill(start_day, end_day, db_path, chunked_db, chunk_days=chunk_days, workers=args.workers)
+            actual = history_rows(chunked_db)
+            differing = sorted(set(expected) ^ set(actual))
+            if differing or len(actual) != len(expected):
+                failures += 1
+                print(f"❌ {chunk_days}-day chunks: {len(actual)} rows vs {len(expected)}, {len(differing)} differ")
+                for row in differing[:10]:
+                    print(f"   {'single ' if row in expected else 'chunked'} {row}")
+            else:
+                print(f"✅ {chunk_days}-day chunks: {len(actual)} rows identical")
+
+    print(f"\n📊 {start_day} → {end_day}: {len(expected)} rows from a single {days}-day chunk")
+    if failures:
+        sys.exit(1)
+    print("✅ Chunked backfills identical to the single-range backfill")
+
+
+if __name__ == "__main__":
+    main()
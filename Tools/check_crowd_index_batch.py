@@ -0,0 +1,103 @@
+import os
+import sys
+import time
+import random
+import sqlite3
+import argparse
+import tempfile
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils.crowd_index_utils import (calculate_crowd_index, calculate_crowd_index_batch, calculate_crowd_index_lite,
+                                     get_latest_timestamp, PARKS, DB_PATH)
+from synthetic_data import build_synthetic_db
+
+# Verifies that calculate_crowd_index_batch() and the pandas-free calculate_crowd_index_lite()
+# return exactly what the per-park calculate_crowd_index() loop returns, and compares query
+# counts and latency.
+
+
+def add_edge_cases(db_path):
+    """Rows the dedup/filters must agree on: duplicate attraction names, NULL and out-of-range waits."""
+    with sqlite3.connect(db_path) as conn:
+        latest = conn.execute("SELECT MAX(timestamp) FROM queue_status").fetchone()[0]
+        conn.execute("""INSERT INTO entities (id, name, type, park) VALUES
+                        ('DUP-1', 'Twin Ride', 'ATTRACTION', 'Epcot'),
+                        ('DUP-2', 'Twin Ride', 'ATTRACTION', 'Epcot')""")
+        conn.executemany(
+            "INSERT INTO queue_status (entity_id, timestamp, status, wait_minutes, park) VALUES (?, ?, 'OPERATING', ?, 'Epcot')",
+            [('DUP-1', latest, 35), ('DUP-2', latest[:-2] + '00', 70), ('DUP-2', latest, None), ('DUP-1', latest, 900)]
+        )
+
+
+def timed(conn, fn):
+    statements = []
+    conn.set_trace_callback(statements.append)
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    conn.set_trace_callback(None)
+    return result, elapsed, len(statements)
+
+
+IMPLEMENTATIONS = {
+    'batch': calculate_crowd_index_batch,
+    'lite': calculate_crowd_index_lite,
+}
+
+
+def compare(conn, timestamp, parks):
+    """Mismatches against the per-park loop as (name, park, expected, actual), plus (time, queries) per implementation."""
+    loop, loop_time, loop_queries = timed(conn, lambda: {p: calculate_crowd_index(conn, p, timestamp) for p in parks})
+    stats = {'loop': (loop_time, loop_queries)}
+    mismatches = []
+    for name, fn in IMPLEMENTATIONS.items():
+        result, elapsed, queries = timed(conn, lambda: fn(conn, parks, timestamp))
+        stats[name] = (elapsed, queries)
+        mismatches += [(name, park, loop[park], result.get(park)) for park in parks if loop[park] != result.get(park)]
+    return mismatches, stats
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Check the batch crowd index against the per-park implementation.")
+    arg_parser.add_argument("--db", help=f"Existing live.db (e.g. {DB_PATH}); default: build a synthetic one")
+    arg_parser.add_argument("--samples", type=int, default=25, help="Extra historical poll timestamps to compare")
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = args.db
+        if not db_path:
+            db_path = os.path.join(tmp, "live.db")
+            build_synthetic_db(db_path, days=2)
+            add_edge_cases(db_path)
+
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        try:
+            latest = get_latest_timestamp(conn)
+            polls = [row[0] for row in conn.execute("SELECT DISTINCT timestamp FROM queue_status")]
+            timestamps = [latest] + random.Random(7).sample(polls, min(args.samples, len(polls)))
+
+            failures = 0
+            totals = {key: [0.0, 0] for key in ['loop', *IMPLEMENTATIONS]}
+            for ts in timestamps:
+                mismatches, stats = compare(conn, ts, PARKS)
+                for key, (elapsed, queries) in stats.items():
+                    totals[key][0] += elapsed
+                    totals[key][1] += queries
+                for name, park, expected, actual in mismatches:
+                    failures += 1
+                    print(f"❌ {ts} {park}\n   loop:  {expected}\n   {name}: {actual}")
+        finally:
+            conn.close()
+
+    n = len(timestamps)
+    print(f"\n📊 {n} timestamps x {len(PARKS)} parks")
+    for key in totals:
+        print(f"   {key:<6} {totals[key][0] / n * 1000:>8.1f} ms/refresh   {totals[key][1] / n:>5.1f} queries/refresh")
+    if failures:
+        print(f"❌ {failures} park result(s) differ")
+        sys.exit(1)
+    print("✅ Batch and lite results identical to the per-park implementation")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+import os
+import sys
+import gzip
+import json
+import time
+import sqlite3
+import argparse
+import tempfile
+import statistics
+
+import pandas as pd
+import plotly.colors
+import plotly.offline
+import plotly.io as pio
+from dash import html
+from plotly.utils import PlotlyJSONEncoder
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils.park_frames import compact_park_frame, top_rides_hourly
+from utils.figure_cache import figure_json
+from utils.hourly_trends import build_hourly_trend_figure, build_hourly_trends_subplots, hourly_trends_park_block
+from synthetic_data import build_synthetic_db, PARKS
+
+# What the hourly trends section costs in each layout: a dcc.Graph per ride (the default) or one
+# multi-panel figure per park (HOURLY_TRENDS_SUBPLOTS = True in app_dashboard.py). Reports the
+# section's callback payload (raw and gzipped), Dash components, Plotly plots the browser mounts,
+# and figure build time.
+#
+# Browser render time and DOM node counts need a browser: --html writes one standalone page per
+# layout that shows both once its plots have rendered (open each page and compare).
+#
+#   python Tools/measure_hourly_trends_layout.py                  # synthetic 2-day live.db
+#   python Tools/measure_hourly_trends_layout.py --db live.db --html out/
+
+FRAME_QUERY = """
+SELECT
+      e.name AS Name,
+      e.type AS Type,
+      qs.wait_minutes AS wait_minutes,
+      qs.timestamp AS timestamp,
+      qs.status
+  FROM queue_status qs
+  JOIN entities e ON qs.entity_id = e.id
+  WHERE e.park = ?
+  AND e.type = 'ATTRACTION'
+  AND qs.wait_minutes > 1
+ ORDER BY qs.timestamp DESC;
+"""
+
+# The dashboard's first ten ride colors
+COLORS = plotly.colors.qualitative.D3
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head><meta charset="utf-8"><title>{title}</title></head>
+<body>
+<pre id="metrics">rendering...</pre>
+{plotly_js}
+{plots}
+<script>
+var plots = Array.prototype.slice.call(document.querySelectorAll('.js-plotly-plot'));
+Promise.all(plots.map(function (plot) {{ return Plotly.Plots.resize(plot); }})).then(function () {{
+  document.getElementById('metrics').textContent =
+    '{title}: ' + plots.length + ' plots, ' + document.getElementsByTagName('*').length + ' DOM nodes, ' +
+    'plots ready ' + Math.round(performance.now()) + ' ms after navigation start';
+}});
+</script>
+</body>
+</html>
+"""
+
+
+def park_hourly_data(conn, park_name):
+    df = compact_park_frame(pd.read_sql_query(FRAME_QUERY, conn, params=(park_name,)))
+    if df.empty:
+        return {}
+    return top_rides_hourly(df, today=df['Timestamp'].max().normalize())  # newest day in the file
+
+
+def colors_for(count):
+    return [COLORS[i % len(COLORS)] for i in range(count)]
+
+
+def build_figures(hourly, subplots):
+    """{park: {key: figure JSON}} as the dashboard's figure cache would hold it."""
+    figures = {}
+    for park_name, hourly_data in hourly.items():
+        colors = colors_for(len(hourly_data))
+        if subplots:
+            figures[park_name] = {park_name: figure_json(build_hourly_trends_subplots(park_name, hourly_data, colors))}
+        else:
+            figures[park_name] = {ride: figure_json(build_hourly_trend_figure(ride, df_hourly, colors[i]))
+                                  for i, (ride, df_hourly) in enumerate(hourly_data.items())}
+    return figures
+
+
+def count_components(component):
+    """(Dash components, dcc.Graph components) in a layout tree."""
+    if isinstance(component, (list, tuple)):
+        counts = [count_components(child) for child in component]
+        return sum(c[0] for c in counts), sum(c[1] for c in counts)
+    if not hasattr(component, 'to_plotly_json'):
+        return 0, 0
+    components, graphs = count_components(getattr(component, 'children', None))
+    return components + 1, graphs + (type(component).__name__ == 'Graph')
+
+
+def measure(hourly, subplots, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        figures = build_figures(hourly, subplots)
+        timings.append(time.perf_counter() - start)
+
+    section = html.Div([hourly_trends_park_block(park_name, '#000000', park_figures, subplots)
+                        for park_name, park_figures in figures.items() if park_figures])
+    payload = json.dumps(section, cls=PlotlyJSONEncoder).encode('utf-8')
+    layouts = sum(len(json.dumps(fig['layout'])) for park_figures in figures.values() for fig in park_figures.values())
+    components, graphs = count_components(section)
+    return {
+        'figures': figures,
+        'payload': len(payload),
+        'gzipped': len(gzip.compress(payload)),
+        'layout_bytes': layouts,
+        'components': components,
+        'graphs': graphs,
+        'build_s': statistics.median(timings),
+    }
+
+
+def write_page(path, title, figures, subplots):
+    plots = []
+    for park_figures in figures.values():
+        for fig in park_figures.values():
+            div = pio.to_html(fig, full_html=False, include_plotlyjs=False)
+            style = "width:100%;min-width:1000px" if subplots else "display:inline-block;width:25%;min-width:300px"
+            plots.append(f'<div style="{style}">{div}</div>')
+    plotly_js = f'<script type="text/javascript">{plotly.offline.get_plotlyjs()}</script>'
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(PAGE_TEMPLATE.format(title=title, plotly_js=plotly_js, plots='\n'.join(plots)))
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Measure the hourly trends section: a chart per ride vs a subplot figure per park.")
+    arg_parser.add_argument("--db", help="Existing live.db; default: build a synthetic one")
+    arg_parser.add_argument("--runs", type=int, default=3)
+    arg_parser.add_argument("--html", help="Directory to write one standalone page per layout, for browser timing")
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = args.db
+        if not db_path:
+            db_path = os.path.join(tmp, "live.db")
+            build_synthetic_db(db_path, days=2, attractions_per_park=60, poll_minutes=5)
+
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        try:
+            parks = [row[0] for row in conn.execute("SELECT DISTINCT park FROM entities WHERE type = 'ATTRACTION'")] or PARKS
+            hourly = {park_name: park_hourly_data(conn, park_name) for park_name in parks}
+        finally:
+            conn.close()
+
+    results = {name: measure(hourly, subplots, args.runs) for name, subplots in (('per ride', False), ('subplots', True))}
+
+    rides = sum(len(hourly_data) for hourly_data in hourly.values())
+    print(f"\n📊 Hourly trends section, {rides} rides in {len(hourly)} parks (median build of {args.runs})")
+    print(f"   {'layout':<10} {'payload KB':>10} {'gzip KB':>8} {'layout KB':>9} {'components':>10} {'plots':>6} {'build ms':>9}")
+    for name, result in results.items():
+        print(f"   {name:<10} {result['payload'] / 1024:>10.1f} {result['gzipped'] / 1024:>8.1f} "
+              f"{result['layout_bytes'] / 1024:>9.1f} {result['components']:>10} {result['graphs']:>6} "
+              f"{result['build_s'] * 1000:>9.0f}")
+
+    if args.html:
+        os.makedirs(args.html, exist_ok=True)
+        for name, result in results.items():
+            path = os.path.join(args.html, f"hourly_trends_{name.replace(' ', '_')}.html")
+            write_page(path, f"hourly trends ({name})", result['figures'], name == 'subplots')
+            print(f"📝 {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+import os
+import gzip
+import glob
+import time
+import shutil
+import sqlite3
+import logging
+import argparse
+import schedule
+from datetime import datetime
+
+DATABASES = {
+    "live": r'E:\app_data\db_live\live.db',
+    "warehouse": r'E:\app_data\db_data_warehouse\warehouse.db',
+}
+BACKUP_DIR = r'E:\app_data\backups'
+
+PAGES_PER_STEP = 1024        # Pages copied per backup step (1024 x 4 KB pages = 4 MB)
+STEP_SLEEP_SECONDS = 0.05    # Pause between steps so writers/readers always get a turn
+KEEP_SNAPSHOTS = 7           # Snapshots kept per database
+COMPRESS = True              # gzip finished snapshots
+BACKUP_TIME = "03:00"        # Daily, while the parks are closed
+
+# --- Setup logging ---
+log_dir = r"I:\watchdog_logs"
+os.makedirs(log_dir, exist_ok=True)
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s %(levelname)s: %(message)s',
+    handlers=[
+        logging.FileHandler(os.path.join(log_dir, "backup.log"), encoding='utf-8'),
+        logging.StreamHandler()
+    ]
+)
+
+def rotate_snapshots(name, backup_dir=BACKUP_DIR, keep=KEEP_SNAPSHOTS):
+    """Delete all but the newest `keep` snapshots for a database."""
+    snapshots = sorted(glob.glob(os.path.join(backup_dir, f"{name}_*.db*")))
+    snapshots = [s for s in snapshots if not s.endswith(".partial")]
+    for old in snapshots[:-keep] if keep > 0 else []:
+        os.remove(old)
+        logging.info(f"Rotated out old snapshot {os.path.basename(old)}")
+
+def backup_database(name, db_path, backup_dir=BACKUP_DIR, pages=PAGES_PER_STEP,
+                    step_sleep=STEP_SLEEP_SECONDS, compress=COMPRESS, keep=KEEP_SNAPSHOTS):
+    """
+    Take an online snapshot of db_path with the SQLite backup API.
+
+    The copy runs `pages` pages at a time and sleeps between steps, so the ingester and
+    dashboard keep working while a large warehouse is copied. (If another process writes
+    to the source mid-copy, SQLite restarts the copy - fine for live.db's small size and
+    warehouse.db's once-a-day writes.) The snapshot is verified with PRAGMA quick_check
+    before it replaces anything. Returns the snapshot path, or None on failure.
+    """
+    os.makedirs(backup_dir, exist_ok=True)
+    stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    partial_path = os.path.join(backup_dir, f"{name}_{stamp}.db.partial")
+    final_path = os.path.join(backup_dir, f"{name}_{stamp}.db" + (".gz" if compress else ""))
+
+    steps = 0
+    total_pages = 0
+
+    def progress(status, remaining, total):
+        nonlocal steps, total_pages
+        steps += 1
+        total_pages = total
+        time.sleep(step_sleep)
+
+    started = time.perf_counter()
+    try:
+        src = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, timeout=30.0)
+        dst = sqlite3.connect(partial_path)
+        try:
+            src.backup(dst, pages=pages, progress=progress)
+            check = dst.execute("PRAGMA quick_check").fetchone()[0]
+        finally:
+            dst.close()
+            src.close()
+
+        if check != "ok":
+            logging.error(f"Backup of {name} failed quick_check ({check}); snapshot discarded.")
+            os.remove(partial_path)
+            return None
+
+        copy_seconds = time.perf_counter() - started
+        size_bytes = os.path.getsize(partial_path)
+
+        if compress:
+            with open(partial_path, 'rb') as f_in, gzip.open(final_path + ".partial", 'wb', compresslevel=6) as f_out:
+                shutil.copyfileobj(f_in, f_out, length=1024 * 1024)
+            os.replace(final_path + ".partial", final_path)
+            os.remove(partial_path)
+        else:
+            os.replace(partial_path, final_path)
+
+        total_seconds = time.perf_counter() - started
+        size_mb = size_bytes / (1024 * 1024)
+        logging.info(
+            f"Backed up {name}: {size_mb:.1f} MB ({total_pages} pages, {steps} steps) "
+            f"in {total_seconds:.1f}s (copy {copy_seconds:.1f}s, {size_mb / max(copy_seconds, 1e-6):.1f} MB/s) "
+            f"-> {os.path.basename(final_path)} "
+            f"({os.path.getsize(final_path) / (1024 * 1024):.1f} MB on disk)"
+        )
+
+        rotate_snapshots(name, backup_dir, keep)
+        return final_path
+
+    except Exception as e:
+        logging.error(f"Backup of {name} failed: {e}")
+        for leftover in (partial_path, final_path + ".partial"):
+            if os.path.exists(leftover):
+                os.remove(leftover)
+        return None
+
+def run_backups():
+    logging.info("Starting database backups")
+    for name, db_path in DATABASES.items():
+        backup_database(name, db_path)
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Online, throttled SQLite backups with rotation.")
+    arg_parser.add_argument("--once", action="store_true", help="Back up now and exit instead of scheduling")
+    args = arg_parser.parse_args()
+
+    if args.once:
+        run_backups()
+    else:
+        logging.info(f"Starting backup scheduler — daily at {BACKUP_TIME}.")
+        schedule.every().day.at(BACKUP_TIME).do(run_backups)
+
+        while True:
+            schedule.run_pending()
+            time.sleep(30)
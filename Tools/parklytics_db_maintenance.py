@@ -0,0 +1,96 @@
+import os
+import sqlite3
+import logging
+import argparse
+
+DATABASES = {
+    "live": r'E:\app_data\db_live\live.db',
+    "warehouse": r'E:\app_data\db_data_warehouse\warehouse.db',
+}
+
+# Run only while the parks are closed (Eastern hours, start inclusive / end exclusive)
+MAINTENANCE_WINDOW_ET = (2, 6)
+
+ANALYSIS_LIMIT = 1000            # Rows sampled per index by ANALYZE - keeps it bounded on the warehouse
+INCREMENTAL_VACUUM_PAGES = 2000  # Free pages released per incremental_vacuum step
+MAX_VACUUM_STEPS = 25            # Upper bound on steps per run
+
+def db_file_sizes(db_path):
+    """(database bytes, WAL bytes) on disk."""
+    db_size = os.path.getsize(db_path) if os.path.exists(db_path) else 0
+    wal_path = db_path + "-wal"
+    wal_size = os.path.getsize(wal_path) if os.path.exists(wal_path) else 0
+    return db_size, wal_size
+
+def format_mb(num_bytes):
+    return f"{num_bytes / (1024 * 1024):.1f} MB"
+
+def run_maintenance(name, db_path):
+    """
+    Checkpoint and truncate the WAL, refresh planner statistics and release free pages
+    in bounded incremental_vacuum steps. Logs file and WAL size before and after.
+    """
+    db_before, wal_before = db_file_sizes(db_path)
+    logging.info(f"[{name}] Maintenance start: file {format_mb(db_before)}, WAL {format_mb(wal_before)}")
+
+    conn = sqlite3.connect(db_path, timeout=60.0)
+    try:
+        busy, wal_frames, checkpointed = conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()
+        if busy:
+            logging.warning(f"[{name}] Checkpoint could not finish (a reader or writer was active); "
+                            f"{checkpointed}/{wal_frames} frames checkpointed.")
+
+        conn.execute(f"PRAGMA analysis_limit = {ANALYSIS_LIMIT}")
+        conn.execute("ANALYZE")
+        conn.execute("PRAGMA optimize")
+        conn.commit()
+
+        freed_pages = 0
+        if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:  # INCREMENTAL
+            for _ in range(MAX_VACUUM_STEPS):
+                free_pages = conn.execute("PRAGMA freelist_count").fetchone()[0]
+                if free_pages == 0:
+                    break
+                # executescript steps the pragma to completion; execute() would free a single page
+                conn.executescript(f"PRAGMA incremental_vacuum({INCREMENTAL_VACUUM_PAGES});")
+                freed_pages += free_pages - conn.execute("PRAGMA freelist_count").fetchone()[0]
+            remaining = conn.execute("PRAGMA freelist_count").fetchone()[0]
+            logging.info(f"[{name}] Incremental vacuum released {freed_pages} pages ({remaining} still free)")
+        else:
+            logging.info(f"[{name}] auto_vacuum is not INCREMENTAL; skipping vacuum "
+                         f"(run with --enable-incremental-vacuum once during closed hours)")
+
+        # Vacuumed pages went through the WAL; fold them back in and truncate again
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()
+    finally:
+        conn.close()
+
+    db_after, wal_after = db_file_sizes(db_path)
+    logging.info(
+        f"[{name}] Maintenance done: file {format_mb(db_before)} -> {format_mb(db_after)}, "
+        f"WAL {format_mb(wal_before)} -> {format_mb(wal_after)}"
+    )
+    return {'db_before': db_before, 'db_after': db_after, 'wal_before': wal_before, 'wal_after': wal_after}
+
+def enable_incremental_vacuum(name, db_path):
+    """One-time switch of an existing DB to auto_vacuum=INCREMENTAL (requires a full VACUUM)."""
+    conn = sqlite3.connect(db_path, timeout=60.0)
+    try:
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        conn.execute("VACUUM")
+    finally:
+        conn.close()
+    logging.info(f"[{name}] auto_vacuum set to INCREMENTAL")
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s: %(message)s')
+
+    arg_parser = argparse.ArgumentParser(description="Checkpoint, ANALYZE and incrementally vacuum the Parklytics DBs.")
+    arg_parser.add_argument("--enable-incremental-vacuum", action="store_true",
+                            help="Switch the DBs to auto_vacuum=INCREMENTAL (full VACUUM; run while parks are closed)")
+    args = arg_parser.parse_args()
+
+    for db_name, path in DATABASES.items():
+        if args.enable_incremental_vacuum:
+            enable_incremental_vacuum(db_name, path)
+        run_maintenance(db_name, path)
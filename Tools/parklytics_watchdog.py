@@ -1,4 +1,6 @@
 import os
+import sys
+import glob
 import schedule
 import time
 import datetime
@@ -6,10 +8,21 @@ import psutil
 import sqlite3
 import pytz
 import logging
+from parklytics_db_maintenance import DATABASES, MAINTENANCE_WINDOW_ET, run_maintenance
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+# pandas-free crowd index path: keeps the watchdog's imports light
+from utils.crowd_index_utils import calculate_crowd_index_lite, get_latest_timestamp, PARKS
 
 DB_PATH = r'E:\app_data\db_live\live.db'
 PROCESS_NAMES = ['daily_live_api.py', 'daily_scheudle_api.py', 'parklytics_ETL_updated.py', 'weather_api_fetch.py']
 DATA_MAX_AGE_MINUTES = 15
+ETL_PROCESS_NAME = 'parklytics_ETL'  # Maintenance waits until the ETL has finished
+ETL_LOG_DIR = r'E:\app_data\etl_logging'
+ETL_DONE_LINES = ('Changes committed successfully', '=== ETL PROCESS COMPLETED ===')  # both in today's ETL log
+BACKUP_DIR = r'E:\app_data\backups'
+BACKUP_PARTIAL_MAX_AGE_MINUTES = 120  # Older .partial snapshots are leftovers of a killed backup, not one in progress
+last_maintenance_date = None
 
 # --- Setup logging ---
 log_dir = r"I:\watchdog_logs"
@@ -18,6 +31,7 @@ os.makedirs(log_dir, exist_ok=True)  # make sure folder exists
 log_file = os.path.join(log_dir, "watchdog.log")
 
 logging.basicConfig(
+    force=True,  # crowd_index_utils configures console logging on import
     level=logging.INFO,
     format='%(asctime)s %(levelname)s: %(message)s',
     handlers=[
@@ -74,6 +88,20 @@ def get_latest_timestamp_et():
         print(f"[ERROR] Could not fetch latest timestamp: {e}")
         return None
 
+def log_crowd_index():
+    # Health check that the index can still be computed from the latest poll
+    try:
+        conn = sqlite3.connect(DB_PATH)
+        try:
+            latest_ts = get_latest_timestamp(conn)
+            results = calculate_crowd_index_lite(conn, PARKS, latest_ts) if latest_ts else {}
+        finally:
+            conn.close()
+        if results:
+            logging.info("Crowd index: " + ", ".join(f"{park} {r['crowd_index']}%" for park, r in results.items()))
+    except Exception as e:
+        logging.error(f"Crowd index check failed: {e}")
+
 def check_watchdog():
     logging.info("Running check")
 
@@ -89,11 +117,61 @@ def check_watchdog():
     else:
         logging.error(f"Data in 'queue_status' is STALE (latest entry at {latest_ts_et}).")
 
+    log_crowd_index()
+
+def etl_completed_today():
+    # The ETL logs to a new file per run, named after its local start time
+    pattern = os.path.join(ETL_LOG_DIR, f"ETL_LiveToWarehouse_{datetime.datetime.now().strftime('%Y%m%d')}_*.log")
+    for log_path in glob.glob(pattern):
+        try:
+            with open(log_path, encoding='utf-8') as f:
+                content = f.read()
+        except OSError as e:
+            logging.warning(f"Could not read ETL log {log_path}: {e}")
+            continue
+        if all(line in content for line in ETL_DONE_LINES):
+            return True
+    return False
+
+def is_backup_running():
+    # parklytics_backup.py writes each snapshot to a .partial file until it is verified and compressed
+    cutoff = time.time() - BACKUP_PARTIAL_MAX_AGE_MINUTES * 60
+    for partial_path in glob.glob(os.path.join(BACKUP_DIR, "*.partial")):
+        try:
+            if os.path.getmtime(partial_path) >= cutoff:
+                return True
+        except OSError:
+            continue
+    return False
+
+def maybe_run_maintenance():
+    # Once per night, inside the closed-park window and after the ETL has finished
+    global last_maintenance_date
+    now_et = datetime.datetime.now(pytz.timezone('US/Eastern'))
+    start_hour, end_hour = MAINTENANCE_WINDOW_ET
+
+    if not (start_hour <= now_et.hour < end_hour) or last_maintenance_date == now_et.date():
+        return
+    if is_script_running(ETL_PROCESS_NAME) or not etl_completed_today():
+        logging.info("ETL has not finished today; deferring DB maintenance.")
+        return
+    if is_backup_running():
+        logging.info("Backup in progress; deferring DB maintenance.")
+        return
+
+    for name, db_path in DATABASES.items():
+        try:
+            run_maintenance(name, db_path)
+        except Exception as e:
+            logging.error(f"DB maintenance failed for {name}: {e}")
+    last_maintenance_date = now_et.date()
+
 if __name__ == "__main__":
     logging.info("Starting watchdog scheduler — checks every 15 minutes.")
     check_watchdog()  # Run once at start
 
     schedule.every(15).minutes.do(check_watchdog)
+    schedule.every(15).minutes.do(maybe_run_maintenance)
 
     while True:
         schedule.run_pending()
@@ -0,0 +1,94 @@
+import os
+import sys
+import random
+import sqlite3
+import argparse
+from datetime import datetime, timedelta, timezone
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'database_tools')))
+from parklytics_create_livedb import create_live_db
+
+# Synthetic Parklytics data for benchmarks - same schema as live.db / warehouse.db
+PARKS = ["Magic Kingdom", "Epcot", "Hollywood Studios", "Animal Kingdom"]
+
+# Park hours in Eastern time; stored timestamps are naive UTC like the ingester writes
+OPEN_HOUR_ET = 8
+CLOSE_HOUR_ET = 23
+UTC_OFFSET_HOURS = 4
+
+STATUS_WEIGHTS = [("OPERATING", 0.9), ("DOWN", 0.05), ("CLOSED", 0.04), ("REFURBISHMENT", 0.01)]
+
+
+def hour_curve(hour_et):
+    """Rough midday-peaking crowd curve used to shape synthetic waits."""
+    return max(0.3, 1.4 - abs(hour_et - 13) * 0.12)
+
+
+def build_synthetic_db(db_path, days=7, attractions_per_park=40, poll_minutes=15,
+                       end_date=None, parks=PARKS, seed=42):
+    """Create a SQLite DB filled with synthetic entities and queue_status polls.
+
+    Returns the number of queue_status rows written.
+    """
+    rng = random.Random(seed)
+    create_live_db(db_path)
+    end_date = end_date or datetime.now(timezone.utc).date()
+    start_date = end_date - timedelta(days=days - 1)
+
+    statuses = [s for s, _ in STATUS_WEIGHTS]
+    status_weights = [w for _, w in STATUS_WEIGHTS]
+
+    with sqlite3.connect(db_path) as conn:
+        entities = []
+        for park in parks:
+            for i in range(attractions_per_park):
+                entity_id = f"{park[:2].upper()}-{i:04d}"
+                entity_type = 'ATTRACTION' if i % 10 else 'SHOW'
+                popularity = rng.uniform(0.3, 2.5)
+                entities.append((entity_id, f"{park} Attraction {i:03d}", entity_type, park, popularity))
+
+        conn.executemany(
+            "INSERT OR REPLACE INTO entities (id, name, type, park, is_open) VALUES (?, ?, ?, ?, 1)",
+            [(e[0], e[1], e[2], e[3]) for e in entities]
+        )
+
+        def rows():
+            day = start_date
+            while day <= end_date:
+                for minute in range(OPEN_HOUR_ET * 60, CLOSE_HOUR_ET * 60, poll_minutes):
+                    hour_et = minute // 60
+                    poll_time = datetime(day.year, day.month, day.day) + timedelta(
+                        hours=UTC_OFFSET_HOURS, minutes=minute)
+                    for park_index, park in enumerate(parks):
+                        # Each park is polled a few seconds after the previous one
+                        timestamp = (poll_time + timedelta(seconds=park_index * 3)).isoformat()
+                        for entity_id, _, entity_type, _, popularity in (e for e in entities if e[3] == park):
+                            status = rng.choices(statuses, status_weights)[0]
+                            wait = None
+                            if status == 'OPERATING' and entity_type == 'ATTRACTION':
+                                wait = int(max(0, rng.gauss(25 * popularity * hour_curve(hour_et), 8)) // 5 * 5)
+                            yield (entity_id, timestamp, status, wait, timestamp, 0, None, None, park)
+                day += timedelta(days=1)
+
+        cur = conn.executemany(
+            '''INSERT INTO queue_status
+               (entity_id, timestamp, status, wait_minutes, posted_time,
+                lightning_lane_available, lightning_lane_cost, paid_ll_cost, park)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)''',
+            rows()
+        )
+        conn.commit()
+        return cur.rowcount
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Build a synthetic Parklytics SQLite database.")
+    arg_parser.add_argument("db_path")
+    arg_parser.add_argument("--days", type=int, default=7)
+    arg_parser.add_argument("--attractions", type=int, default=40)
+    arg_parser.add_argument("--poll-minutes", type=int, default=15)
+    args = arg_parser.parse_args()
+
+    written = build_synthetic_db(args.db_path, days=args.days, attractions_per_park=args.attractions,
+                                 poll_minutes=args.poll_minutes)
+    print(f"✅ Wrote {written} synthetic queue_status rows to {args.db_path}")
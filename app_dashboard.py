@@ -6,11 +6,25 @@ import dash
 import dash_bootstrap_components as dbc
 import requests
 import sys
+import os
+import time
+import functools
+from pathlib import Path
 from dash import dcc, html
-from dash.dependencies import Input, Output
-from datetime import datetime, timedelta
+from dash.dependencies import Input, Output, State
+from datetime import datetime
 from dateutil import parser
-from utils.crowd_index_utils import get_crowd_index_summary, get_crowd_level
+from utils.crowd_index import get_crowd_index_summary, get_strategy
+from utils.crowd_index_history import get_latest_crowd_index
+from utils.change_log import tables_changed_since
+from utils.dash_cache import DashCache, MemoryBackend, DiskBackend, DISK_CACHE_DIR
+from utils.data_version import DataVersionProbe
+from utils.figure_cache import FigureCache
+from utils.hourly_trends import (hour_tick_labels, build_hourly_trend_figure, build_hourly_trends_subplots,
+                                 hourly_trends_park_block)
+from utils.warehouse_parquet import load_warehouse_parquet
+from utils.park_frames import compact_park_frame, concat_park_frames, frame_memory_mb, top_rides_hourly
+from utils import analytics_engine
 
 sys.path.append("I:/Parklytics")
 
@@ -22,8 +36,43 @@ live_db_path = r"E:\app_data\db_live\live.db"
 weather_db_path = r"E:\app_data\db_weather\weather.db"
 warehouse_db_path = r"E:\app_data\db_data_warehouse\warehouse.db"
 
+# Read-replica mode: the ingester publishes an immutable snapshot of live.db after each poll
+# (PUBLISH_READ_REPLICA in daily_live_api.py) so dashboard reads never wait on its writes
+USE_LIVE_READ_REPLICA = False
+live_replica_path = r"E:\app_data\db_live\live_replica.db"
+
+# Read the crowd index the ingester stores after each poll (RECORD_CROWD_INDEX in daily_live_api.py)
+# instead of computing it per refresh; falls back to on-demand when nothing is stored yet
+CROWD_INDEX_FROM_HISTORY = True
+# Crowd index algorithm shown on the cards: "basic" or "enhanced" (see utils/crowd_index)
+CROWD_INDEX_STRATEGY = "basic"
+
+# Where historical data is read from: "sqlite" (warehouse.db) or "parquet" (ETL's partitioned export).
+# With "sqlite" the historical section is aggregated in SQLite (day_hour_rollups, see utils/wait_rollups.py)
+# and no warehouse rows are kept in memory; "parquet" without DuckDB still loads per-park frames.
+WAREHOUSE_SOURCE = "sqlite"
+
+# Keep each park's live/warehouse frame between refreshes and read only queue_status rows with a
+# higher id; park info is only reloaded when change_log shows schedule/purchase/entity changes
+INCREMENTAL_REFRESH = True
+PARK_INFO_TABLES = ['schedule', 'purchases', 'entities']
+MAX_ROW_ID = 2 ** 63 - 1
+
+# Server-side cache for callback data, shared by every browser session (utils/dash_cache.py):
+# "memory" (this process) or "disk" (DISK_CACHE_DIR, shared by several server processes)
+DASH_CACHE_BACKEND = "memory"
+DASH_CACHE_TTL_SECONDS = 300
+# Park frames are refreshed once per new poll, and re-checked at least this often (park info date rollover)
+DATA_REFRESH_SECONDS = 60
+# Historical averages only change when the nightly ETL runs
+HISTORICAL_CACHE_TTL_SECONDS = 3600
+# Sections whose callbacks return dash.no_update while their data version is unchanged
+VERSIONED_SECTIONS = ["weather-box", "park-info-section", "crowd-index-summary",
+                      "snapshot-section", "ride-hourly-trends", "combined-day-hour"]
+
 # CONFIGURABLE PARAMETERS - Change these numbers to control how many attractions are shown
 TOP_RIDES_HOURLY_TRENDS = 10  # Number of rides to show in hourly trends section
+HOURLY_TRENDS_SUBPLOTS = False  # True: each park's top rides as one multi-panel figure instead of a chart per ride
 COMBINED_ANALYSIS_COUNT = 15  # Number of rides to show in combined day & hour analysis
 
 # Park names and color mapping
@@ -63,11 +112,59 @@ def generate_colors(num_colors):
     # If we need more colors than in our list, cycle through them
     return [colors[i % len(colors)] for i in range(num_colors)]
 
+# Layouts shared by every historical chart of a kind, built once; figures only add their title and traces
+HISTORICAL_DAY_LAYOUT = go.Layout(
+    xaxis_title="Day of Week",
+    yaxis_title="Average Wait Time (minutes)",
+    height=400,
+    margin=dict(l=50, r=50, b=50, t=100)
+)
+
+HISTORICAL_HOUR_LAYOUT = go.Layout(
+    xaxis=dict(
+        title="Hour of Day",
+        tickmode='array',
+        tickvals=list(range(7, 24)),
+        ticktext=hour_tick_labels(range(7, 24)),
+        tickangle=0,
+        tickfont=dict(size=8),
+        range=[6, 24],
+        type='linear'
+    ),
+    yaxis_title="Average Wait Time (minutes)",
+    height=400,
+    margin=dict(l=50, r=50, b=50, t=100)
+)
+
+# Open live data for reading: the published snapshot when replica mode is on, live.db otherwise
+def connect_live_db():
+    if USE_LIVE_READ_REPLICA and os.path.exists(live_replica_path):
+        # immutable=1: no locks, no WAL/journal checks - the file is only ever swapped, never edited
+        return sqlite3.connect(Path(live_replica_path).resolve().as_uri() + "?immutable=1", uri=True)
+    return sqlite3.connect(live_db_path)
+
+# Crowd index per park: one indexed read of crowd_index_history, on-demand calculation as fallback
+def get_crowd_index_data(park_names):
+    if CROWD_INDEX_FROM_HISTORY:
+        try:
+            conn = connect_live_db()
+            try:
+                data = get_latest_crowd_index(conn, park_names)
+            finally:
+                conn.close()
+            if data and CROWD_INDEX_STRATEGY == "enhanced":
+                data = {park: dict(result['enhanced'], timestamp=result['timestamp']) for park, result in data.items()}
+            if data:
+                return data
+        except sqlite3.Error as e:
+            print(f"Crowd index history unavailable, computing on demand: {e}")
+    return get_crowd_index_summary(live_db_path, park_names, CROWD_INDEX_STRATEGY)
+
 # Function to load park data from SQLite database
-def load_park_data(park_name):
-    """Load wait time data for a specific park from the database."""
+def load_park_data(park_name, since_id=0, upto_id=None):
+    """Load wait time data for a specific park from the database (queue_status ids in (since_id, upto_id])."""
     try:
-        conn = sqlite3.connect(live_db_path)
+        conn = connect_live_db()
         
         # Query to get wait time data with entity information
         query = """
@@ -76,55 +173,34 @@ def load_park_data(park_name):
               e.type AS Type,
               qs.wait_minutes AS wait_minutes,
               qs.timestamp AS timestamp,
-              qs.status,
-              qs.lightning_lane_available,
-              qs.lightning_lane_cost
+              qs.status
           FROM queue_status qs
           JOIN entities e ON qs.entity_id = e.id
           WHERE e.park = ? 
           AND e.type = 'ATTRACTION'
           AND qs.wait_minutes > 1
+          AND qs.id > ? AND qs.id <= ?
          ORDER BY qs.timestamp DESC;
         """
         
-        df = pd.read_sql_query(query, conn, params=(park_name,))
+        df = pd.read_sql_query(query, conn, params=(park_name, since_id, upto_id if upto_id is not None else MAX_ROW_ID))
         conn.close()
         
         if df.empty:
             return pd.DataFrame()
         
-        df['Timestamp'] = (
-            pd.to_datetime(df['timestamp'], errors='coerce')       # Convert to datetime
-            .dt.tz_localize('UTC')                                 # Assume incoming data is in UTC
-            .dt.tz_convert('US/Eastern')                           # Convert to Disney World time
-        )
-        df['Day of Week'] = df['Timestamp'].dt.day_name()
-        df['Hour of Day'] = df['Timestamp'].dt.hour
-                 
-        # Create Wait Minutes column (already in minutes from database)
-        df['Wait Minutes'] = df['wait_minutes'].fillna(0)
-        
-        # Create Wait Time - Stand By column for compatibility
-        df['Wait Time - Stand By'] = df['wait_minutes'].apply(
-            lambda x: f"{int(x//60):02d}:{int(x%60):02d}" if pd.notna(x) and x > 0 else ""
-        )
-        
-        # Extract day of week and hour from timestamp
-        df['Day of Week'] = df['Timestamp'].dt.day_name()
-        df['Hour of Day'] = df['Timestamp'].dt.hour
-        
-        # Create Last Updated column
-        df['Last Updated'] = df['Timestamp']
-        
-        return df
+        return compact_park_frame(df)
     
     except Exception as e:
         print(f"Error loading data for {park_name}: {e}")
         return pd.DataFrame()
 
 # Function to load historical data from warehouse database
-def load_warehouse_data(park_name):
-    """Load historical wait time data for a specific park from the warehouse database."""
+def load_warehouse_data(park_name, since_id=0, upto_id=None):
+    """Load historical wait time data for a specific park from the warehouse database (ids in (since_id, upto_id])."""
+    if WAREHOUSE_SOURCE == "parquet":
+        return load_warehouse_data_parquet(park_name)
+
     try:
         conn = sqlite3.connect(warehouse_db_path)
         
@@ -141,35 +217,114 @@ def load_warehouse_data(park_name):
         WHERE qs.park = ?  -- NOT e.park
         AND e.type = 'ATTRACTION'
         AND qs.wait_minutes > 1
+        AND qs.id > ? AND qs.id <= ?
         ORDER BY qs.timestamp DESC;
         """
         
-        df = pd.read_sql_query(query, conn, params=(park_name,))
+        df = pd.read_sql_query(query, conn, params=(park_name, since_id, upto_id if upto_id is not None else MAX_ROW_ID))
         conn.close()
         
         if df.empty:
             return pd.DataFrame()
         
-        df['Timestamp'] = (
-            pd.to_datetime(df['timestamp'], errors='coerce')       # Convert to datetime
-            .dt.tz_localize('UTC')                                 # Assume incoming data is in UTC
-            .dt.tz_convert('US/Eastern')                           # Convert to Disney World time
-        )
-        df['Day of Week'] = df['Timestamp'].dt.day_name()
-        df['Hour of Day'] = df['Timestamp'].dt.hour
-        df['Wait Minutes'] = df['wait_minutes'].fillna(0)
-        
-        return df
+        return compact_park_frame(df)
     
     except Exception as e:
         print(f"Error loading warehouse data for {park_name}: {e}")
         return pd.DataFrame()
 
+# Same frame as load_warehouse_data, but read column-pruned from the Parquet export
+def load_warehouse_data_parquet(park_name):
+    """Load historical wait time data for a specific park from the Parquet warehouse export."""
+    try:
+        df = load_warehouse_parquet(
+            park_names=[park_name],
+            columns=['name', 'type', 'wait_minutes', 'timestamp', 'status']
+        )
+        df = df[(df['type'] == 'ATTRACTION') & (df['wait_minutes'].fillna(0) > 1)]
+
+        if df.empty:
+            return pd.DataFrame()
+
+        df = df.rename(columns={'name': 'Name', 'type': 'Type'})
+        df = df.sort_values('timestamp', ascending=False).reset_index(drop=True)
+
+        return compact_park_frame(df)   # timestamp is stored as tz-aware UTC
+
+    except Exception as e:
+        print(f"Error loading Parquet warehouse data for {park_name}: {e}")
+        return pd.DataFrame()
+
+# Incremental refresh of a kept park frame: the first load reads everything, later ones only the
+# queue_status ids added since (bounded by the probed max id so no row is read twice). Rows older
+# than the source's oldest timestamp (pruned by the ETL) are dropped. A max id below the last one
+# seen means the database was replaced, so the frame is reloaded in full.
+def refresh_park_frame(frames, last_ids, park_name, connect, load):
+    current = frames.get(park_name)
+    last_id = last_ids.get(park_name)
+    try:
+        conn = connect()
+        try:
+            max_id, oldest = conn.execute(
+                "SELECT (SELECT MAX(id) FROM queue_status), (SELECT MIN(timestamp) FROM queue_status)"
+            ).fetchone()
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        print(f"Error probing queue_status for {park_name}: {e}")
+        return current if current is not None else pd.DataFrame()
+
+    started = time.perf_counter()
+    if not INCREMENTAL_REFRESH or current is None or current.empty or last_id is None or (max_id or 0) < last_id:
+        frame = load(park_name, upto_id=max_id)
+        loaded = f"full load of {len(frame)} rows"
+    elif max_id == last_id:
+        frame = current
+        loaded = None
+    else:
+        tail = load(park_name, since_id=last_id, upto_id=max_id)
+        frame = concat_park_frames([tail, current])
+        loaded = f"+{len(tail)} rows"
+
+    # Frames are newest first, so the last row says whether anything is past the horizon
+    if not frame.empty and oldest is not None:
+        horizon = pd.Timestamp(oldest, tz='UTC')
+        if frame['Timestamp'].iloc[-1] < horizon:
+            frame = frame[frame['Timestamp'] >= horizon].reset_index(drop=True)
+
+    if loaded:
+        print(f"📥 {park_name}: {loaded} in {(time.perf_counter() - started) * 1000:.0f} ms, "
+              f"frame {len(frame)} rows / {frame_memory_mb(frame):.1f} MB")
+
+    last_ids[park_name] = max_id
+    frames[park_name] = frame
+    return frame
+
+# Park info changes a few times a day: reload when change_log has schedule/purchase/entity
+# changes since the last load, or the date has rolled over (purchase rows are dated today)
+def refresh_park_info(park_name):
+    state = park_info_state.get(park_name) or {'seq': None, 'date': None}
+    today = pd.Timestamp.now().normalize()
+    try:
+        conn = connect_live_db()
+        try:
+            changed, head = tables_changed_since(conn, state['seq'] or 0, PARK_INFO_TABLES)
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        changed, head = True, None  # no change_log in this database: reload every time
+
+    if (not INCREMENTAL_REFRESH or changed or head is None or state['seq'] is None
+            or state['date'] != today or park_name not in park_info):
+        park_info[park_name] = load_park_info(park_name)
+    park_info_state[park_name] = {'seq': head, 'date': today}
+    return park_info[park_name]
+
 # Function to load park schedule and purchase information
 def load_park_info(park_name):
     """Load park information including schedule and purchases from database."""
     try:
-        conn = sqlite3.connect(live_db_path)
+        conn = connect_live_db()
 
         # Get schedule information
         schedule_query = """
@@ -272,7 +427,7 @@ def get_today_park_info(info_df):
 def get_evening_showtime(park_name, show_name):
     """Return formatted start time for the evening show if available."""
     try:
-        conn = sqlite3.connect(live_db_path)
+        conn = connect_live_db()
         
         # Query for show schedule
         query = """
@@ -309,8 +464,8 @@ def get_evening_showtime(park_name, show_name):
         return "Currently Not Available"
 
 # Function to get weather from weather database
-def get_weather_report_div():
-    """Get weather information from weather database."""
+def get_weather_report():
+    """Get the weather report sentence from the weather database (API fallback)."""
     try:
         conn = sqlite3.connect(weather_db_path)
         
@@ -345,7 +500,11 @@ def get_weather_report_div():
     except Exception as e:
         print(f"Error getting weather: {e}")
         report = "Weather information currently unavailable"
-    
+
+    return report
+
+def get_weather_report_div():
+    report = section_cache.get_or_load('weather', None, None, get_weather_report)
     return html.Div(report, style={
         'fontSize': '30px',
         'fontWeight': 'bold',
@@ -354,148 +513,65 @@ def get_weather_report_div():
         'color': '#2c3e50'
     })
 
-# Function to get latest snapshot timestamp
-def get_latest_snapshot_timestamp(conn):
-    query = "SELECT MAX(DATETIME(timestamp)) FROM queue_status"
-    result = conn.execute(query).fetchone()
-    return pd.to_datetime(result[0]) if result else None
-
-# Modified snapshot function to show ALL attractions over 10 minutes
-def get_all_waits_over_threshold(conn, park_name, timestamp, threshold=10):
-    """Get all attractions with wait times over the specified threshold."""
-    start = (timestamp - timedelta(minutes=2)).isoformat()
-    end = (timestamp + timedelta(minutes=2)).isoformat()
-    query = """
-    SELECT e.name, MAX(qs.wait_minutes) AS wait_minutes
+# Latest row per attraction, every park, in the DOWN_WINDOW_MINUTES before the newest poll; in_window
+# flags rows within SNAPSHOT_WINDOW_MINUTES, which the other snapshot metrics use. Nothing is newer
+# than the newest poll, so the windows only need lower bounds (compared as strings, like the stored ISO timestamps).
+# The bounds are scalar subqueries rather than a join so SQLite seeks idx_queue_entity_timestamp per attraction.
+SNAPSHOT_WINDOW_MINUTES = 2
+DOWN_WINDOW_MINUTES = 5
+SNAPSHOT_QUERY = f"""
+WITH bounds AS (
+    SELECT
+        strftime('%Y-%m-%dT%H:%M:%S', MAX(timestamp), '-{DOWN_WINDOW_MINUTES} minutes') AS down_start,
+        strftime('%Y-%m-%dT%H:%M:%S', MAX(timestamp), '-{SNAPSHOT_WINDOW_MINUTES} minutes') AS window_start
+    FROM queue_status
+),
+recent AS (
+    SELECT
+        e.park,
+        e.name,
+        qs.status,
+        qs.wait_minutes,
+        qs.timestamp >= (SELECT window_start FROM bounds) AS in_window,
+        ROW_NUMBER() OVER (PARTITION BY qs.entity_id ORDER BY qs.timestamp DESC, qs.id DESC) AS newest
     FROM queue_status qs
     JOIN entities e ON qs.entity_id = e.id
-    WHERE e.park = ? AND e.type = 'ATTRACTION'
-        AND qs.timestamp BETWEEN ? AND ?
-        AND qs.wait_minutes > ?
-    GROUP BY e.name
-    ORDER BY wait_minutes DESC;
-    """
-    return pd.read_sql_query(query, conn, params=(park_name, start, end, threshold))
-
-def get_extreme_waits(conn, park_name, timestamp):
-    start = (timestamp - timedelta(minutes=2)).isoformat()
-    end = (timestamp + timedelta(minutes=2)).isoformat()
-    query = """
-    SELECT e.name, qs.wait_minutes
-    FROM queue_status qs
-    JOIN entities e ON qs.entity_id = e.id
-    WHERE e.park = ? AND e.type = 'ATTRACTION'
-      AND qs.timestamp BETWEEN ? AND ?
-      AND qs.wait_minutes > 0
-    ORDER BY qs.wait_minutes ASC
-    """
-    df = pd.read_sql_query(query, conn, params=(park_name, start, end))
-    if df.empty:
-        return ("N/A", 0), ("N/A", 0)
-    return (
-        (df.iloc[-1]['name'], int(df.iloc[-1]['wait_minutes'])),  # Longest
-        (df.iloc[0]['name'], int(df.iloc[0]['wait_minutes']))     # Shortest
-    )
-
-def get_operating_percentage(conn, park_name, timestamp):
-    start = (timestamp - timedelta(minutes=2)).isoformat()
-    end = (timestamp + timedelta(minutes=2)).isoformat()
-    query = """
-    SELECT e.name, qs.status
-    FROM queue_status qs
-    JOIN entities e ON qs.entity_id = e.id
-    WHERE e.park = ? AND e.type = 'ATTRACTION'
-      AND qs.timestamp BETWEEN ? AND ?
-    """
-    df = pd.read_sql_query(query, conn, params=(park_name, start, end))
-    if df.empty:
-        return 0
-    operating = df[df['status'] == 'OPERATING']
-    return round((len(operating) / len(df)) * 100)
-
-def get_closed_attractions(conn, park_name, timestamp):
-    start = (timestamp - timedelta(minutes=2)).isoformat()
-    end = (timestamp + timedelta(minutes=2)).isoformat()
-
-    query = """
-    SELECT e.name, qs.status
-    FROM queue_status qs
-    JOIN entities e ON qs.entity_id = e.id
-    WHERE e.park = ? AND e.type = 'ATTRACTION'
-      AND qs.timestamp BETWEEN ? AND ?
-      AND qs.status IN ('CLOSED', 'REFURBISHMENT')
-    ORDER BY e.name
-    """
-    return pd.read_sql_query(query, conn, params=(park_name, start, end))
-
-# 06/26/2025 - Function to get DOWN rides
-def get_down_attractions(conn, park_name, timestamp):
-    start = (timestamp - timedelta(minutes=5)).isoformat()
-    end = (timestamp + timedelta(minutes=5)).isoformat()
-    query = """
-    SELECT e.name
-    FROM queue_status qs
-    JOIN entities e ON qs.entity_id = e.id
-    WHERE e.park = ? AND e.type = 'ATTRACTION'
-      AND qs.timestamp BETWEEN ? AND ?
-      AND qs.status = 'DOWN'
-    ORDER BY e.name
-    """
-    df = pd.read_sql_query(query, conn, params=(park_name, start, end))
-    return df.drop_duplicates(subset=['name']) if not df.empty else pd.DataFrame()
-
-# Modified function to get configurable number of rides for hourly trends
-def get_top_rides_hourly_data_today(park_df, num_rides=TOP_RIDES_HOURLY_TRENDS):
-    """
-    Returns a dict {ride_name: hourly_df} for the **top rides TODAY**,
-    where hourly_df has columns Hour (int 7‑24) and AvgWait (float) with
-    all points where AvgWait <= 5 trimmed out.
-    """
-    if park_df.empty:
-        return {}
-
-    # Eastern time today normalized
-    today_eastern = pd.Timestamp.now(tz='US/Eastern').normalize()
-    today_df = park_df[park_df['Timestamp'].dt.normalize() == today_eastern]
+    WHERE e.type = 'ATTRACTION'
+      AND qs.timestamp >= (SELECT down_start FROM bounds)
+)
+SELECT park, name, status, wait_minutes, in_window FROM recent WHERE newest = 1
+"""
 
-    if today_df.empty:
-        return {}
+# Every metric of one park's snapshot column from its rows of SNAPSHOT_QUERY
+def summarize_snapshot(rows, threshold=10):
+    current = rows[rows['in_window'] == 1]
 
-    # Top rides by average wait time today
-    top_rides = (
-        today_df
-        .groupby('Name')['Wait Minutes']
-        .mean()
-        .nlargest(num_rides)
-        .index
-        .tolist()
-    )
+    all_waits_df = current.loc[current['wait_minutes'] > threshold, ['name', 'wait_minutes']]
+    all_waits_df = all_waits_df.groupby('name', as_index=False)['wait_minutes'].max()
+    all_waits_df = all_waits_df.sort_values(by='wait_minutes', ascending=False).reset_index(drop=True)
 
-    hourly_dict = {}
-    all_hours = pd.DataFrame({'Hour': range(7, 25)})
-
-    for ride in top_rides:
-        filtered_df = today_df.loc[today_df['Name'] == ride]
-        ride_df = pd.DataFrame(filtered_df.copy()).reset_index(drop=True)
-        ride_df['Hour'] = ride_df['Timestamp'].dt.hour
-        hourly = (
-            ride_df
-            .groupby('Hour')['Wait Minutes']
-            .mean()
-            .reset_index()
-            .rename(columns={'Wait Minutes': 'AvgWait'})
-        )
+    waiting = current[current['wait_minutes'] > 0].sort_values('name')
+    if waiting.empty:
+        longest, shortest = ("N/A", 0), ("N/A", 0)
+    else:
+        top, bottom = waiting.loc[waiting['wait_minutes'].idxmax()], waiting.loc[waiting['wait_minutes'].idxmin()]
+        longest, shortest = (top['name'], int(top['wait_minutes'])), (bottom['name'], int(bottom['wait_minutes']))
 
-        # Keep hours 7 to 24 and fill missing hours with zero
-        hourly = all_hours.merge(hourly, on='Hour', how='left').fillna(0)
+    percent_operating = round((current['status'] == 'OPERATING').mean() * 100) if not current.empty else 0
 
-        # Trim out low average waits <= 5
-        hourly = hourly[hourly['AvgWait'] > 5]
+    closed_df = current.loc[current['status'].isin(['CLOSED', 'REFURBISHMENT']), ['name', 'status']]
+    closed_df = closed_df.drop_duplicates().sort_values('name').reset_index(drop=True)
 
-        if not hourly.empty:
-            hourly_dict[ride] = hourly
+    down_df = rows.loc[rows['status'] == 'DOWN', ['name']].drop_duplicates().sort_values('name').reset_index(drop=True)
 
-    return hourly_dict
+    return {
+        'all_waits': all_waits_df,
+        'longest': longest,
+        'shortest': shortest,
+        'percent_operating': percent_operating,
+        'closed': closed_df,
+        'down': down_df
+    }
 
 # Modified functions for combined analysis using warehouse data
 def get_wait_times_by_day_warehouse(park_df, num_attractions=COMBINED_ANALYSIS_COUNT):
@@ -510,11 +586,11 @@ def get_wait_times_by_day_warehouse(park_df, num_attractions=COMBINED_ANALYSIS_C
     ]
     
     # Get top attractions by average wait time
-    top_attractions = attractions.groupby('Name')['Wait Minutes'].mean().nlargest(num_attractions).index
+    top_attractions = attractions.groupby('Name', observed=True)['Wait Minutes'].mean().nlargest(num_attractions).index
     filtered_attractions = attractions[attractions['Name'].isin(top_attractions)]
     
     # Calculate average wait times by day of week for top attractions
-    day_avg = filtered_attractions.groupby(['Name', 'Day of Week'])['Wait Minutes'].mean().reset_index()
+    day_avg = filtered_attractions.groupby(['Name', 'Day of Week'], observed=True)['Wait Minutes'].mean().reset_index()
     
     # Ensure proper day order
     day_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
@@ -535,11 +611,11 @@ def get_wait_times_by_hour_warehouse(park_df, num_attractions=COMBINED_ANALYSIS_
     ]
     
     # Get top attractions by average wait time
-    top_attractions = attractions.groupby('Name')['Wait Minutes'].mean().nlargest(num_attractions).index
+    top_attractions = attractions.groupby('Name', observed=True)['Wait Minutes'].mean().nlargest(num_attractions).index
     filtered_attractions = attractions[attractions['Name'].isin(top_attractions)]
     
     # Calculate average wait times by hour for top attractions
-    hour_avg = filtered_attractions.groupby(['Name', 'Hour of Day'])['Wait Minutes'].mean().reset_index()
+    hour_avg = filtered_attractions.groupby(['Name', 'Hour of Day'], observed=True)['Wait Minutes'].mean().reset_index()
     hour_avg = hour_avg.sort_values(['Name', 'Hour of Day'])
     
     return hour_avg
@@ -554,14 +630,121 @@ def get_wait_times_by_day_and_hour_warehouse(park_df, num_attractions=COMBINED_A
         'hour': hour_data
     }
 
+# Historical day/hour data for a park: DuckDB or SQLite aggregates when available, pandas over warehouse frames otherwise
+def get_historical_day_hour_data(park_name):
+    """Return {'day': ..., 'hour': ...} for the combined analysis section."""
+    combined = analytics_engine.day_hour_averages(park_name, COMBINED_ANALYSIS_COUNT,
+                                                  sqlite_fallback=WAREHOUSE_SOURCE == "sqlite",
+                                                  db_path=warehouse_db_path)
+    if combined is not None:
+        return combined
+
+    if park_name not in park_warehouse_data or not warehouse_frames_needed():  # fallback: not refreshed on the interval
+        refresh_warehouse_data(park_name)
+    return get_wait_times_by_day_and_hour_warehouse(park_warehouse_data[park_name])
+
+def refresh_live_data(park_name):
+    return refresh_park_frame(park_data, park_data_last_id, park_name, connect_live_db, load_park_data)
+
+# Warehouse frames are only kept when nothing can aggregate the warehouse in place
+def warehouse_frames_needed():
+    return WAREHOUSE_SOURCE == "parquet" and not analytics_engine.duckdb_enabled()
+
+def refresh_warehouse_data(park_name):
+    if WAREHOUSE_SOURCE == "parquet":  # no row ids in the export: reload
+        park_warehouse_data[park_name] = load_warehouse_data(park_name)
+        return park_warehouse_data[park_name]
+    return refresh_park_frame(park_warehouse_data, park_warehouse_last_id, park_name,
+                              lambda: sqlite3.connect(warehouse_db_path), load_warehouse_data)
+
+# Data-version probes (utils/data_version.py): newest poll id in live.db / the warehouse, newest weather row
+live_probe = (DataVersionProbe(live_replica_path, immutable=True) if USE_LIVE_READ_REPLICA
+              else DataVersionProbe(live_db_path))
+warehouse_probe = DataVersionProbe(warehouse_db_path)
+weather_probe = DataVersionProbe(weather_db_path, query="SELECT MAX(timestamp_utc) FROM weather")
+# crowd_index_history rows are recorded after the poll's queue_status rows, so the summary also
+# watches the newest recorded poll
+CROWD_INDEX_VERSION_QUERY = "SELECT MAX(poll_timestamp) FROM crowd_index_history"
+crowd_index_probe = (DataVersionProbe(live_replica_path, query=CROWD_INDEX_VERSION_QUERY, immutable=True)
+                     if USE_LIVE_READ_REPLICA else DataVersionProbe(live_db_path, query=CROWD_INDEX_VERSION_QUERY))
+
+def live_data_version():
+    return live_probe.version()
+
+def crowd_index_data_version():
+    live_version = live_data_version()
+    if not CROWD_INDEX_FROM_HISTORY or live_version is None:
+        return live_version
+    return (live_version, crowd_index_probe.version())
+
+def crowd_index_section_version():
+    # The section's version Store holds JSON, so tuples come back as lists
+    version = crowd_index_data_version()
+    return list(version) if isinstance(version, tuple) else version
+
+# Park frames are refreshed once per new poll (and at least every DATA_REFRESH_SECONDS for the
+# park info date rollover); concurrent callers share the refresh
+def ensure_data_refreshed():
+    refresh_cache.get_or_load('refresh', None, live_data_version(), refresh_all_data)
+
+section_render_counts = {}
+
+# Section callbacks get the version their session last rendered from a dcc.Store ("<section>-version");
+# while it is still current nothing is queried or sent (dash.no_update), otherwise the section is
+# rendered and the new version stored. Versions must survive JSON, so lists rather than tuples.
+def skip_unchanged(section, version_of):
+    def decorator(render):
+        @functools.wraps(render)
+        def callback(n_intervals, rendered_version):
+            version = version_of()
+            counts = section_render_counts.setdefault(section, {'skipped': 0, 'rendered': 0})
+            if version is not None and version == rendered_version:
+                counts['skipped'] += 1
+                print(f"⏭️ {section}: unchanged at version {version} (skipped {counts['skipped']}, rendered {counts['rendered']})")
+                return dash.no_update, dash.no_update
+            children = render(n_intervals)
+            counts['rendered'] += 1
+            print(f"🔄 {section}: rendered version {version} (skipped {counts['skipped']}, rendered {counts['rendered']})")
+            return children, version
+        return callback
+    return decorator
+
+def section_callback(section, version_of):
+    """app.callback for a section refreshed by the interval and skipped while its data version is unchanged."""
+    def decorator(render):
+        return app.callback(
+            Output(section, "children"),
+            Output(f"{section}-version", "data"),
+            Input("interval-component", "n_intervals"),
+            State(f"{section}-version", "data")
+        )(skip_unchanged(section, version_of)(render))
+    return decorator
+
+def refresh_all_data():
+    # Only rows added since the last refresh are read and parsed (INCREMENTAL_REFRESH)
+    for park_name in parks.keys():
+        refresh_live_data(park_name)
+        if warehouse_frames_needed():
+            refresh_warehouse_data(park_name)
+        refresh_park_info(park_name)
+
+section_cache = DashCache(
+    DiskBackend(DISK_CACHE_DIR) if DASH_CACHE_BACKEND == "disk" else MemoryBackend(),
+    ttl=DASH_CACHE_TTL_SECONDS
+)
+# The frames live in this process, so their refresh is gated in memory whatever the backend
+refresh_cache = DashCache(MemoryBackend(), ttl=DATA_REFRESH_SECONDS)
+# Serialized chart figures per (section, park, data version), in section_cache; unchanged figures are reused across versions
+figure_cache = FigureCache(section_cache)
+
 # Load all park data and park info
 park_data = {}
 park_warehouse_data = {}
 park_info = {}
-for park_name in parks.keys():
-    park_data[park_name] = load_park_data(park_name)
-    park_warehouse_data[park_name] = load_warehouse_data(park_name)
-    park_info[park_name] = load_park_info(park_name)
+park_data_last_id = {}
+park_warehouse_last_id = {}
+park_info_state = {}
+ensure_data_refreshed()
 
 # Initialize the Dash app
 app = dash.Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP])
@@ -670,15 +853,15 @@ app.layout = dbc.Container([
         n_intervals=0
     ),
     html.Div(id='live-update-text', style={'display': 'none'}),
+    # Data version each section last rendered in this session (see skip_unchanged)
+    *[dcc.Store(id=f"{section}-version") for section in VERSIONED_SECTIONS],
     
 ], fluid=True)
 
 # Callback for the park info section
-@app.callback(
-    Output("park-info-section", "children"),
-    [Input("interval-component", "n_intervals")]
-)
+@section_callback("park-info-section", lambda: [live_data_version(), datetime.now().date().isoformat()])
 def update_park_info(_):
+    ensure_data_refreshed()
     park_cards = []
 
     for park_name, info in parks.items():
@@ -694,7 +877,10 @@ def update_park_info(_):
             
             # Get evening show info
             evening_show = evening_shows.get(park_name, "N/A")
-            evening_showtime = get_evening_showtime(park_name, evening_show)
+            evening_showtime = section_cache.get_or_load(
+                'evening_showtime', park_name, live_data_version(),
+                lambda: get_evening_showtime(park_name, evening_show)
+            )
 
             # Card content
             card_content = []
@@ -775,41 +961,42 @@ def update_park_info(_):
     return dbc.Row(park_cards, className="mb-4")
 
 #07/02/2025 - adding weather callback: 
-@app.callback(
-    Output("weather-box", "children"),
-    Input("interval-component", "n_intervals")
-)
+@section_callback("weather-box", weather_probe.version)
 def update_weather(_):
     return get_weather_report_div()
 
+# Data behind the snapshot section: one query for every park, shared by every session until the next poll lands
+def load_snapshot_data():
+    """Return {park: snapshot metrics} at the latest poll, or None when there is no data."""
+    conn = connect_live_db()
+    try:
+        rows = pd.read_sql_query(SNAPSHOT_QUERY, conn)
+    finally:
+        conn.close()
+
+    if rows.empty:
+        return None
+    empty = rows.iloc[0:0]
+    by_park = dict(tuple(rows.groupby('park')))
+    return {park_name: summarize_snapshot(by_park.get(park_name, empty)) for park_name in parks.keys()}
+
 # 06/26/2025 - Updated callback to show DOWN rides
-@app.callback(
-    Output("snapshot-section", "children"),
-    [Input("interval-component", "n_intervals")]
-)
+@section_callback("snapshot-section", live_data_version)
 def update_snapshot(_):
     snapshot_rows = []
 
     try:
-        conn = sqlite3.connect(live_db_path)
-        latest_time = get_latest_snapshot_timestamp(conn)
+        snapshot = section_cache.get_or_load('snapshot', None, live_data_version(), load_snapshot_data)
 
-        if not latest_time:
+        if not snapshot:
             return html.P("No snapshot data available.")
 
         for park_name, info in parks.items():
-            # Existing data pulls
-            all_waits_df = get_all_waits_over_threshold(conn, park_name, latest_time, threshold=10)
-            all_waits_df = all_waits_df.drop_duplicates(subset=['name'])
-            all_waits_df = all_waits_df.sort_values(by='wait_minutes', ascending=False)
-            
-            longest, shortest = get_extreme_waits(conn, park_name, latest_time)
-            percent_operating = get_operating_percentage(conn, park_name, latest_time)
-            closed_df = get_closed_attractions(conn, park_name, latest_time)
-            closed_df = closed_df.drop_duplicates(subset=['name', 'status'])
-
-            # NEW: Get Down attractions
-            down_df = get_down_attractions(conn, park_name, latest_time)
+            all_waits_df = snapshot[park_name]['all_waits']
+            longest, shortest = snapshot[park_name]['longest'], snapshot[park_name]['shortest']
+            percent_operating = snapshot[park_name]['percent_operating']
+            closed_df = snapshot[park_name]['closed'].copy()  # cached frames are shared between sessions
+            down_df = snapshot[park_name]['down']
 
             # Attractions over 10 mins table
             if not all_waits_df.empty:
@@ -865,217 +1052,162 @@ def update_snapshot(_):
                 ], xs=12, sm=12, md=6, lg=3)
             )
 
-        conn.close()
         return dbc.Row(snapshot_rows)
 
     except Exception as e:
         print(f"Snapshot error: {e}")
         return html.P("Error loading snapshot data.")
 
+# {figure key: builder arguments} for a park's hourly trends: a figure per ride, or one for the park
+def hourly_trend_figure_inputs(park_name):
+    hourly_data_dict = section_cache.get_or_load(
+        'hourly_trends', park_name, park_data_last_id.get(park_name),
+        lambda: top_rides_hourly(park_data[park_name], TOP_RIDES_HOURLY_TRENDS)
+    )
+    colors = generate_colors(len(hourly_data_dict))
+    if HOURLY_TRENDS_SUBPLOTS:
+        return {park_name: (hourly_data_dict, colors)} if hourly_data_dict else {}
+    return {ride: (df_hourly, colors[i]) for i, (ride, df_hourly) in enumerate(hourly_data_dict.items())}
+
 # Fixed Callback for Top Rides Hourly Trends (corrected function name)
-@app.callback(
-    Output("ride-hourly-trends", "children"),
-    [Input("interval-component", "n_intervals")]
-)
+@section_callback("ride-hourly-trends", live_data_version)
 def update_ride_hourly_trends(_):
+    ensure_data_refreshed()
     trend_rows = []
 
     for park_name, info in parks.items():
-        # Fixed: Use the correct function name
-        hourly_data_dict = get_top_rides_hourly_data_today(park_data[park_name])
+        figures = figure_cache.figures(
+            'hourly_trends_subplots' if HOURLY_TRENDS_SUBPLOTS else 'hourly_trends_figures',
+            park_name, park_data_last_id.get(park_name),
+            lambda: hourly_trend_figure_inputs(park_name),
+            build_hourly_trends_subplots if HOURLY_TRENDS_SUBPLOTS else build_hourly_trend_figure
+        )
 
         # Skip park if no data
-        if not hourly_data_dict:
+        if not figures:
             continue
 
-        park_cols = []
-        colors = generate_colors(len(hourly_data_dict))
+        trend_rows.append(hourly_trends_park_block(park_name, info['color'], figures, HOURLY_TRENDS_SUBPLOTS))
+
+    return html.Div(trend_rows)
 
-        for i, (ride, df_hourly) in enumerate(hourly_data_dict.items()):
-            fig = go.Figure()
+# Historical day-of-week chart: one trace per attraction
+def build_historical_day_figure(park_name, day_data, attractions, colors):
+    day_fig = go.Figure(layout=HISTORICAL_DAY_LAYOUT)
+    for i, attraction in enumerate(attractions):
+        day_attraction_data = day_data[day_data['Name'] == attraction]
 
-            fig.add_trace(
+        if not day_attraction_data.empty:
+            day_fig.add_trace(
                 go.Scatter(
-                    x=df_hourly['Hour'],
-                    y=df_hourly['AvgWait'],
+                    x=day_attraction_data['Day of Week'],
+                    y=day_attraction_data['Wait Minutes'],
                     mode='lines+markers',
-                    name=ride,
+                    name=attraction,
                     line=dict(width=1.5, color=colors[i]),
                     marker=dict(size=6, color=colors[i]),
-                    hovertemplate="%{x}:00 – %{y:.1f} min"
+                    hoverinfo='text',
+                    hovertext=[
+                        f"{attraction}<br>{day}: {wait:.1f} minutes"
+                        for day, wait in zip(day_attraction_data['Day of Week'], day_attraction_data['Wait Minutes'])
+                    ]
                 )
             )
+    day_fig.update_layout(title=f"{park_name} - Average Wait Time by Day of Week (Historical)")
+    return day_fig
+
+# Historical hour-of-day chart: one trace per attraction, hours 6 to 24
+def build_historical_hour_figure(park_name, hour_data, attractions, colors):
+    hour_fig = go.Figure(layout=HISTORICAL_HOUR_LAYOUT)
+    for i, attraction in enumerate(attractions):
+        hour_attraction_data = hour_data[
+            (hour_data['Name'] == attraction) &
+            (hour_data['Hour of Day'] >= 6) &
+            (hour_data['Hour of Day'] <= 24)
+        ]
 
-            fig.update_layout(
-                title=ride,
-                xaxis=dict(
-                    title="Hour",
-                    tickmode='array',
-                    tickvals=list(range(6, 24)),
-                    ticktext=[f"{(h-1)%12 + 1} {'AM' if h < 12 else 'PM'}" for h in range(6, 24)],
-                    tickfont=dict(size=8),
-                    range=[6, 24],
-                    type='linear'
-                ),
-                yaxis_title="Avg Wait (min)",
-                height=250,
-                margin=dict(l=40, r=20, b=40, t=40),
-                showlegend=False
-            )
-
-            park_cols.append(
-                dbc.Col(
-                    dcc.Graph(
-                        figure=fig,
-                        config={'responsive': True},
-                        style={'minWidth': '300px'}
-                    ),
-                    xs=12, sm=12, md=6, lg=4, xl=3
+        if not hour_attraction_data.empty:
+            hour_fig.add_trace(
+                go.Scatter(
+                    x=hour_attraction_data['Hour of Day'],
+                    y=hour_attraction_data['Wait Minutes'],
+                    mode='lines+markers',
+                    name=attraction,
+                    line=dict(width=1.5, color=colors[i]),
+                    marker=dict(size=6, color=colors[i]),
+                    hoverinfo='text',
+                    hovertext=[
+                        f"{attraction}<br>{hour}:00 - {wait:.1f} minutes"
+                        for hour, wait in zip(hour_attraction_data['Hour of Day'], hour_attraction_data['Wait Minutes'])
+                    ]
                 )
             )
+    hour_fig.update_layout(title=f"{park_name} - Average Wait Time by Hour of Day (Historical)")
+    return hour_fig
+
+# {'day'/'hour': builder arguments} for a park's historical charts (empty without data)
+def historical_figure_inputs(park_name, combined_data):
+    day_data = combined_data['day']
+    hour_data = combined_data['hour']
+    if day_data.empty or hour_data.empty:
+        return {}
 
-        # Wrap the ride charts for this park in a card-like group
-        trend_rows.append(
-            html.Div([
-                html.H4(f"{park_name}", className="text-center mb-2", style={"color": info['color']}),
-                dbc.Row(park_cols, className="mb-5")
-            ])
-        )
+    attractions = list(day_data['Name'].unique()[:COMBINED_ANALYSIS_COUNT])  # Use configurable count
+    colors = generate_colors(len(attractions))
+    return {
+        'day': (park_name, day_data, attractions, colors),
+        'hour': (park_name, hour_data, attractions, colors)
+    }
 
-    return html.Div(trend_rows)
+def build_historical_figure(key, park_name, data, attractions, colors):
+    build = build_historical_day_figure if key == 'day' else build_historical_hour_figure
+    return build(park_name, data, attractions, colors)
 
 # Fixed Combined Day and Hour Analysis Callback (using warehouse data)
-@app.callback(
-    Output("combined-day-hour", "children"),
-    [Input("interval-component", "n_intervals")]
-)
+@section_callback("combined-day-hour", warehouse_probe.version)
 def update_combined_day_hour(_):
     park_rows = []
 
     for park_name, info in parks.items():
         # Use warehouse data for historical analysis
-        combined_data = get_wait_times_by_day_and_hour_warehouse(park_warehouse_data[park_name])
-        day_data = combined_data['day']
-        hour_data = combined_data['hour']
-
-        if not day_data.empty and not hour_data.empty:
-            attractions = day_data['Name'].unique()[:COMBINED_ANALYSIS_COUNT]  # Use configurable count
-            colors = generate_colors(len(attractions))
-
-            # --- DAY OF WEEK CHART ---
-            day_fig = go.Figure()
-            for i, attraction in enumerate(attractions):
-                day_attraction_data = day_data[day_data['Name'] == attraction]
-                
-                if not day_attraction_data.empty:
-                    day_fig.add_trace(
-                        go.Scatter(
-                            x=day_attraction_data['Day of Week'],
-                            y=day_attraction_data['Wait Minutes'],
-                            mode='lines+markers',
-                            name=attraction,
-                            line=dict(width=1.5, color=colors[i]),
-                            marker=dict(size=6, color=colors[i]),
-                            hoverinfo='text',
-                            hovertext=[
-                                f"{attraction}<br>{day}: {wait:.1f} minutes"
-                                for day, wait in zip(day_attraction_data['Day of Week'], day_attraction_data['Wait Minutes'])
-                            ]
-                        )
-                    )
-            day_fig.update_layout(
-                title=f"{park_name} - Average Wait Time by Day of Week (Historical)",
-                xaxis_title="Day of Week",
-                yaxis_title="Average Wait Time (minutes)",
-                height=400,
-                margin=dict(l=50, r=50, b=50, t=100)
-            )
+        version = warehouse_probe.version()
+        combined_data = section_cache.get_or_load(
+            'historical', park_name, version,
+            lambda: get_historical_day_hour_data(park_name), ttl=HISTORICAL_CACHE_TTL_SECONDS
+        )
+        figures = figure_cache.figures(
+            'historical_figures', park_name, version,
+            lambda: historical_figure_inputs(park_name, combined_data), build_historical_figure,
+            ttl=HISTORICAL_CACHE_TTL_SECONDS
+        )
 
-            # --- HOUR OF DAY CHART ---
-            hour_fig = go.Figure()
-            for i, attraction in enumerate(attractions):
-                # Filter to only include hours from 6 to 24
-                hour_attraction_data = hour_data[
-                    (hour_data['Name'] == attraction) &
-                    (hour_data['Hour of Day'] >= 6) &
-                    (hour_data['Hour of Day'] <= 24)
-                ]
-
-                if not hour_attraction_data.empty:
-                    hour_fig.add_trace(
-                        go.Scatter(
-                            x=hour_attraction_data['Hour of Day'],
-                            y=hour_attraction_data['Wait Minutes'],
-                            mode='lines+markers',
-                            name=attraction,
-                            line=dict(width=1.5, color=colors[i]),
-                            marker=dict(size=6, color=colors[i]),
-                            hoverinfo='text',
-                            hovertext=[
-                                f"{attraction}<br>{hour}:00 - {wait:.1f} minutes"
-                                for hour, wait in zip(hour_attraction_data['Hour of Day'], hour_attraction_data['Wait Minutes'])
-                            ]
-                        )
-                    )
-            
-            hour_fig.update_layout(
-                title=f"{park_name} - Average Wait Time by Hour of Day (Historical)",
-                xaxis=dict(
-                    title="Hour of Day",
-                    tickmode='array',
-                    tickvals=list(range(7, 24)),
-                    ticktext=[f"{(h-1)%12 + 1} {'AM' if h < 12 else 'PM'}" for h in range(7, 24)],
-                    tickangle=0,
-                    tickfont=dict(size=8),
-                    range=[6, 24],
-                    type='linear'
-                ),
-                yaxis_title="Average Wait Time (minutes)",
-                height=400,
-                margin=dict(l=50, r=50, b=50, t=100)
-            )
-            
-            # Add both charts for this park
-            park_rows.append(
-                dbc.Row(
-                    dbc.Col(
-                        html.Div(
-                            dcc.Graph(
-                                figure=day_fig,
-                                config={'responsive': True},
-                                style={'minWidth': '600px'}
-                            ),
-                            style={'overflowX': 'auto'}
-                        )
-                    ),
-                    className="mb-4"
-                )
-            )
+        # Add both charts for this park
+        for key, class_name in (('day', "mb-4"), ('hour', "mb-5")):
+            if key not in figures:
+                continue
             park_rows.append(
                 dbc.Row(
                     dbc.Col(
                         html.Div(
                             dcc.Graph(
-                                figure=hour_fig,
+                                figure=figures[key],
                                 config={'responsive': True},
                                 style={'minWidth': '600px'}
                             ),
                             style={'overflowX': 'auto'}
                         )
                     ),
-                    className="mb-5"
+                    className=class_name
                 )
             )
 
     return html.Div(park_rows)
 
 # 06/25/2025 - Bulletproofed Callback for Crowd Index Summary
-@app.callback(
-    Output("crowd-index-summary", "children"),
-    Input("interval-component", "n_intervals")
-)
+@section_callback("crowd-index-summary", crowd_index_section_version)
 def update_crowd_index_summary(n):
-    data = get_crowd_index_summary(live_db_path, list(parks.keys()))
+    data = section_cache.get_or_load('crowd_index', None, crowd_index_data_version(),
+                                     lambda: get_crowd_index_data(list(parks.keys())))
     if not data:
         return html.Div("⚠️ Crowd data unavailable.", className="text-muted text-center")
 
@@ -1095,11 +1227,13 @@ def update_crowd_index_summary(n):
             status_note = html.P("📌 Park has not opened yet. Data will begin updating at park open.", className="text-muted small")
         else:
             crowd_index = result.get('crowd_index', 0)
-            level = get_crowd_level(crowd_index)
+            level = get_strategy(CROWD_INDEX_STRATEGY).crowd_level(crowd_index)
             color = {
+                "🟢 Very Light": "green",
                 "🟢 Light": "green",
                 "🟡 Moderate": "goldenrod",
                 "🟠 Busy": "orange",
+                "🔴 Very Busy": "red",
                 "🔴 Packed": "red"
             }.get(level, "black")
             avg_wait = result.get('avg_wait', 0.0)
@@ -1140,12 +1274,11 @@ def update_crowd_index_summary(n):
     Input('interval-component', 'n_intervals')
 )
 def update_layout(n):
-    # Refresh global park data
-    global park_data, park_warehouse_data, park_info
-    for park_name in parks.keys():
-        park_data[park_name] = load_park_data(park_name)
-        park_warehouse_data[park_name] = load_warehouse_data(park_name)
-        park_info[park_name] = load_park_info(park_name)
+    # Refresh global park data; a no-op until a new poll lands, shared by every session's tick
+    ensure_data_refreshed()
+    print(f"📦 Callback data cache: {section_cache.stats['hits']} hits, {section_cache.stats['loads']} loads, "
+          f"{section_cache.stats['coalesced']} coalesced; version probes re-read {live_probe.queries} times; "
+          f"figures built {figure_cache.stats['built']}, reused {figure_cache.stats['reused']}")
 
     return f"Updated {n} times."
 
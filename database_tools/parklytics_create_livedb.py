@@ -1,13 +1,20 @@
 import sqlite3
 import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils.change_log import install_change_log
 
 DB_PATH = r'E:\app_data\db_live\live.db'
 
-def create_live_db():
-    os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
-    with sqlite3.connect(DB_PATH) as conn:
+def create_live_db(db_path=DB_PATH):
+    os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+    with sqlite3.connect(db_path) as conn:
         c = conn.cursor()
 
+        # Must precede the first table; lets the watchdog reclaim pages freed by the ETL's daily deletes
+        c.execute('PRAGMA auto_vacuum = INCREMENTAL')
+
         # Entities table
         c.execute('''
             CREATE TABLE IF NOT EXISTS entities (
@@ -68,9 +75,15 @@ def create_live_db():
 
         # Indexes
         c.execute('CREATE INDEX IF NOT EXISTS idx_queue_entity_timestamp ON queue_status(entity_id, timestamp)')
+        c.execute('CREATE INDEX IF NOT EXISTS idx_queue_status_timestamp ON queue_status(timestamp)')
         c.execute('CREATE INDEX IF NOT EXISTS idx_entities_park ON entities(park)')
         c.execute('CREATE INDEX IF NOT EXISTS idx_forecast_entity_time ON forecast(entity_id, forecast_time)')
         c.execute('CREATE INDEX IF NOT EXISTS idx_hours_entity_type ON operating_hours(entity_id, type)')
+        c.execute('CREATE INDEX IF NOT EXISTS idx_forecast_forecast_time ON forecast(forecast_time)')
+        c.execute('CREATE INDEX IF NOT EXISTS idx_operating_hours_timestamp ON operating_hours(timestamp)')
+
+        # Change-data-capture triggers (schedule/purchases get theirs when the schedule fetcher creates them)
+        install_change_log(conn)
 
     print("✅ New 'Live' database created with all required tables and indexes.")
 
@@ -1,12 +1,17 @@
+import os
 import sqlite3
+import argparse
 from datetime import datetime
 
+# Archive / move utility: streams rows older than CUTOFF from a source DB into an
+# archive DB in fixed-size chunks, optionally deleting them from the source.
+
 LIVE_DB = r"E:\app_data\db_live\live.db"
 WAREHOUSE_DB = r"E:\app_data\db_data_warehouse\warehouse.db"
 JUNE_TEST_DB = r"E:\app_data\test_data\warehouse_june_testdata.db"
 LOG_FILE = r"C:\Users\Todd\Desktop\migration_log.txt"
 
-TEST_MODE = False
+TEST_MODE = False  # True = copy only, never delete from the source
 
 TABLES = {
     "queue_status": "timestamp",
@@ -15,6 +20,7 @@ TABLES = {
 }
 
 CUTOFF = "2025-07-01"  # Updated year to 2025
+CHUNK_SIZE = 5000      # Rows held in memory / committed per step
 
 def log(msg):
     timestamp = datetime.now().strftime("[%Y-%m-%d %H:%M:%S]")
@@ -22,65 +28,149 @@ def log(msg):
         f.write(f"{timestamp} {msg}\n")
     print(f"{timestamp} {msg}")
 
-def copy_rows(src_conn, dest_conn, table, date_col):
-    dest_cursor = dest_conn.cursor()
-    # 1. Clear matching old rows in destination to avoid duplicates
-    if date_col == "date":
-        dest_cursor.execute(f"DELETE FROM {table} WHERE {date_col} < ?", (CUTOFF,))
-    else:
-        dest_cursor.execute(f"DELETE FROM {table} WHERE datetime({date_col}) < datetime(?)", (CUTOFF,))
+def ensure_archive_tables(src_conn, dest_conn, table):
+    """Create the destination table from the source schema if needed, plus the progress table."""
+    dest_conn.execute("""
+        CREATE TABLE IF NOT EXISTS archive_progress (
+            source TEXT NOT NULL,
+            table_name TEXT NOT NULL,
+            cutoff TEXT NOT NULL,
+            last_key TEXT,
+            last_rowid INTEGER,
+            rows_moved INTEGER DEFAULT 0,
+            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (source, table_name, cutoff)
+        )
+    """)
+    exists = dest_conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+    ).fetchone()
+    if not exists:
+        create_sql = src_conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+        ).fetchone()[0]
+        dest_conn.execute(create_sql)
     dest_conn.commit()
 
-    # 2. Fetch rows from source DB
-    cursor = src_conn.cursor()
-    if date_col == "date":
-        cursor.execute(f"SELECT * FROM {table} WHERE {date_col} < ?", (CUTOFF,))
-    else:
-        cursor.execute(f"SELECT * FROM {table} WHERE datetime({date_col}) < datetime(?)", (CUTOFF,))
-    rows = cursor.fetchall()
-
-    if not rows:
-        log(f"No data to copy from {table}.")
-        return
-
-    # 3. Insert rows into destination
-    placeholders = ",".join(["?"] * len(rows[0]))
-    dest_cursor.executemany(f"INSERT INTO {table} VALUES ({placeholders})", rows)
-    dest_conn.commit()
-    log(f"Copied {len(rows)} rows from {table} into test warehouse.")
-
-
-def simulate_or_delete_rows(conn, table, date_col):
-    cursor = conn.cursor()
-    if date_col == "date":
-        cursor.execute(f"SELECT COUNT(*) FROM {table} WHERE {date_col} < ?", (CUTOFF,))
-    else:
-        cursor.execute(f"SELECT COUNT(*) FROM {table} WHERE datetime({date_col}) < datetime(?)", (CUTOFF,))
-    count = cursor.fetchone()[0]
-
-    if TEST_MODE:
-        log(f"[TEST MODE] Would delete {count} old rows from {table}.")
-    else:
-        if date_col == "date":
-            cursor.execute(f"DELETE FROM {table} WHERE {date_col} < ?", (CUTOFF,))
-        else:
-            cursor.execute(f"DELETE FROM {table} WHERE datetime({date_col}) < datetime(?)", (CUTOFF,))
-        deleted = cursor.rowcount
-        conn.commit()
-        log(f"Deleted {deleted} old rows from {table}.")
-
-def process_db(db_path, label):
+def ensure_date_index(conn, table, date_col):
+    # Keyset pagination below walks this index: (date_col, rowid) in order
+    conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_{date_col} ON {table}({date_col})")
+    conn.commit()
+
+def get_progress(dest_conn, source, table, cutoff):
+    row = dest_conn.execute(
+        "SELECT last_key, last_rowid, rows_moved FROM archive_progress WHERE source = ? AND table_name = ? AND cutoff = ?",
+        (source, table, cutoff)
+    ).fetchone()
+    return row if row else ("", 0, 0)
+
+def archive_rows(src_conn, dest_conn, table, date_col, source, cutoff=CUTOFF,
+                 chunk_size=CHUNK_SIZE, delete_source=not TEST_MODE):
+    """
+    Move (or copy) rows with date_col < cutoff from src_conn to dest_conn, chunk by chunk.
+
+    Each chunk is inserted into the destination together with its progress checkpoint in one
+    transaction, then deleted from the source by key range in a second one. Memory stays at one
+    chunk, and a crash at any point resumes from the checkpoint without losing or duplicating rows.
+    """
+    ensure_archive_tables(src_conn, dest_conn, table)
+    ensure_date_index(src_conn, table, date_col)
+
+    columns = [row[1] for row in src_conn.execute(f"PRAGMA table_info({table})")]
+    column_list = ", ".join(columns)
+    placeholders = ", ".join(["?"] * len(columns))
+
+    last_key, last_rowid, total = get_progress(dest_conn, source, table, cutoff)
+
+    match_row = f"SELECT 1 FROM {table} WHERE {' AND '.join(f'{c} IS ?' for c in columns)} LIMIT 1"
+
+    def archived_as_is(values):
+        return dest_conn.execute(match_row, values).fetchone() is not None
+
+    def delete_through(key, rowid):
+        deleted = src_conn.execute(
+            f"DELETE FROM {table} WHERE {date_col} < ? AND ({date_col}, rowid) <= (?, ?)",
+            (cutoff, key, rowid)
+        ).rowcount
+        src_conn.commit()
+        return deleted
+
+    # Resume: rows up to the checkpoint are already in the archive but may not have been deleted yet
+    if delete_source and last_rowid:
+        leftover = delete_through(last_key, last_rowid)
+        if leftover:
+            log(f"Resumed {table}: removed {leftover} already-archived rows from source.")
+
+    while True:
+        rows = src_conn.execute(
+            f"""SELECT rowid, {column_list} FROM {table}
+                WHERE {date_col} < ? AND ({date_col}, rowid) > (?, ?)
+                ORDER BY {date_col}, rowid
+                LIMIT ?""",
+            (cutoff, last_key, last_rowid, chunk_size)
+        ).fetchall()
+        if not rows:
+            break
+
+        date_index = columns.index(date_col) + 1
+        last_key, last_rowid = rows[-1][date_index], rows[-1][0]
+        total += len(rows)
+
+        with dest_conn:
+            inserted = dest_conn.executemany(
+                f"INSERT OR IGNORE INTO {table} ({column_list}) VALUES ({placeholders})",
+                [row[1:] for row in rows]
+            ).rowcount
+            if inserted != len(rows):
+                # Ignored rows are only safe to delete from the source if the archive already holds them as-is
+                # (e.g. warehouse copies of live rows); a key reused for different data aborts the chunk
+                conflicting = [row for row in rows if not archived_as_is(row[1:])]
+                if conflicting:
+                    raise ValueError(
+                        f"{len(conflicting)} rows of {table} collide with different archived rows "
+                        f"(source rowids {', '.join(str(row[0]) for row in conflicting[:10])}); nothing deleted"
+                    )
+            dest_conn.execute(
+                """INSERT OR REPLACE INTO archive_progress
+                   (source, table_name, cutoff, last_key, last_rowid, rows_moved, updated_at)
+                   VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)""",
+                (source, table, cutoff, last_key, last_rowid, total)
+            )
+
+        if delete_source:
+            delete_through(last_key, last_rowid)
+
+        log(f"{'Moved' if delete_source else 'Copied'} {len(rows)} rows from {table} (total: {total}).")
+
+    if total == 0:
+        log(f"No data to archive from {table}.")
+    return total
+
+def process_db(db_path, label, dest_path=JUNE_TEST_DB, tables=TABLES, cutoff=CUTOFF,
+               chunk_size=CHUNK_SIZE, delete_source=not TEST_MODE):
     log(f"\n--- Processing {label.upper()} ---")
-    with sqlite3.connect(db_path) as src_conn, sqlite3.connect(JUNE_TEST_DB) as test_conn:
-        for table, date_col in TABLES.items():
+    with sqlite3.connect(db_path) as src_conn, sqlite3.connect(dest_path) as dest_conn:
+        for table, date_col in tables.items():
             try:
-                copy_rows(src_conn, test_conn, table, date_col)
-                simulate_or_delete_rows(src_conn, table, date_col)
+                archive_rows(src_conn, dest_conn, table, date_col, label, cutoff, chunk_size, delete_source)
             except Exception as e:
                 log(f"ERROR processing {table}: {e}")
 
 if __name__ == "__main__":
-    log(f"\n=== BEGIN MIGRATION (TEST MODE: {TEST_MODE}) ===")
-    process_db(LIVE_DB, "live.db")
-    process_db(WAREHOUSE_DB, "warehouse.db")
+    arg_parser = argparse.ArgumentParser(description="Stream rows older than a cutoff into an archive DB.")
+    arg_parser.add_argument("--source", action="append", help="Source DB (repeatable); default: live.db and warehouse.db")
+    arg_parser.add_argument("--dest", default=JUNE_TEST_DB, help="Archive DB")
+    arg_parser.add_argument("--cutoff", default=CUTOFF, help="Archive rows dated before this (YYYY-MM-DD)")
+    arg_parser.add_argument("--table", action="append", choices=list(TABLES), help="Table to archive (repeatable)")
+    arg_parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    arg_parser.add_argument("--copy-only", action="store_true", default=TEST_MODE, help="Copy without deleting from source")
+    args = arg_parser.parse_args()
+
+    sources = args.source or [LIVE_DB, WAREHOUSE_DB]
+    tables = {t: TABLES[t] for t in args.table} if args.table else TABLES
+
+    log(f"\n=== BEGIN MIGRATION (COPY ONLY: {args.copy_only}, CUTOFF: {args.cutoff}) ===")
+    for source in sources:
+        process_db(source, os.path.basename(source), args.dest, tables, args.cutoff,
+                   args.chunk_size, not args.copy_only)
     log("=== MIGRATION COMPLETE ===\n")
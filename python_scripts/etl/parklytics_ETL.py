@@ -1,11 +1,22 @@
 import sqlite3
 import os
+import sys
 from datetime import datetime, timedelta
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from utils.warehouse_parquet import export_local_day, PARQUET_ROOT
+from utils.crowd_baselines import refresh_crowd_baselines, BASELINE_WINDOW_DAYS
+from utils.wait_rollups import refresh_day_hour_rollups, first_unrolled_day
+from parklytics_reconcile import prepare_connection, ensure_date_indexes, reconcile_table
+
 # === CONFIGURATION ===
 ETL_DAYS_TO_KEEP_RUNTIME_DATA = 1
 BATCH_SIZE = 1000
 TEST_MODE = False  # Set to True to test without committing
+EXPORT_PARQUET = True  # Also write the finished local day to the partitioned Parquet export
+VERIFY_BEFORE_PRUNE = True  # Reconcile each copied day against the warehouse; only prune live.db if it matches
+REFRESH_CROWD_BASELINES = True  # Rebuild live.db's crowd_baselines from the warehouse's last 28 days
+REFRESH_DAY_HOUR_ROLLUPS = True  # Roll the copied day up into warehouse.db's day_hour_rollups (dashboard history)
 
 LIVE_DB = r'E:\app_data\db_live\live.db'
 WAREHOUSE_DB = r'E:\app_data\db_data_warehouse\warehouse.db'
@@ -59,15 +70,90 @@ def copy_data(table, date_column, conn_src, conn_dst, target_date):
             log(f"   Copied {len(rows)} rows (Total: {total_copied})")
         return total_copied
 
-def prune_old_data(table, date_column, conn, cutoff_date):
-    log(f"🧹 Pruning rows in {table} older than {cutoff_date}")
-    cur = conn.execute(
-        f"DELETE FROM {table} WHERE DATE({date_column}) < ?", (cutoff_date,)
-    )
+def prune_old_data(table, date_column, conn, cutoff_date, keep_days=()):
+    keep_days = sorted(keep_days)
+    log(f"🧹 Pruning rows in {table} older than {cutoff_date}" + (f" (keeping {', '.join(keep_days)})" if keep_days else ""))
+    query = f"DELETE FROM {table} WHERE DATE({date_column}) < ?"
+    if keep_days:
+        query += f" AND DATE({date_column}) NOT IN ({', '.join('?' * len(keep_days))})"
+    cur = conn.execute(query, (cutoff_date, *keep_days))
     deleted = cur.rowcount
     log(f"   Deleted {deleted} old rows")
     return deleted
 
+def reconcile_before_prune(table, date_column, conn_live, conn_warehouse, cutoff_date):
+    """
+    Reconcile every live.db day the prune would delete (not just today's target: a day that failed
+    on an earlier run is still waiting here). Mismatched days are re-copied once and checked again.
+    Returns (days to keep in live.db, days re-copied into the warehouse); the days to keep are None
+    to skip the prune entirely (schema mismatch).
+    """
+    first = conn_live.execute(f"SELECT DATE(MIN({date_column})) FROM {table}").fetchone()[0]
+    if first is None or first >= cutoff_date:
+        log(f"🔎 {table}: no live.db days before {cutoff_date} to reconcile")
+        return set(), set()
+    last = (datetime.strptime(cutoff_date, '%Y-%m-%d').date() - timedelta(days=1)).strftime('%Y-%m-%d')
+    log(f"🔎 Reconciling {table} {first} → {last} before pruning")
+
+    mismatches = reconcile_table(conn_live, conn_warehouse, table, date_column, first, last)
+    for m in mismatches:
+        log(f"⚠️ {table} {m['day']}: {m['issue']} (live={m.get('live')}, warehouse={m.get('warehouse')})")
+    if any(m['day'] is None for m in mismatches):
+        log(f"⏭️ Skipping prune of {table} in live.db until it reconciles")
+        return None, set()
+
+    unreconciled = set()
+    recopied = {m['day'] for m in mismatches}
+    for day in sorted(recopied):
+        copy_data(table, date_column, conn_live, conn_warehouse, day)
+        if reconcile_table(conn_live, conn_warehouse, table, date_column, day, day):
+            log(f"⏭️ Keeping {table} {day} in live.db until it reconciles")
+            unreconciled.add(day)
+        else:
+            log(f"🔁 {table} {day} re-copied and reconciled")
+    log(f"🔎 {table} {first} → {last}: {len(unreconciled)} unreconciled days")
+    return unreconciled, recopied
+
+def export_parquet_day(conn_warehouse, target_date):
+    # target_date is a UTC day; the Eastern day before it is the newest one fully in the warehouse
+    local_date = datetime.strptime(target_date, '%Y-%m-%d').date() - timedelta(days=1)
+    log(f"📦 Exporting local day {local_date} to Parquet ({PARQUET_ROOT})")
+    try:
+        exported = export_local_day(conn_warehouse, local_date, PARQUET_ROOT)
+        log(f"   Exported {exported} rows")
+    except Exception as e:
+        # The SQLite warehouse stays the source of truth, so a failed export never fails the ETL
+        log(f"⚠️ Parquet export failed: {e}")
+
+def refresh_baselines(conn_warehouse, conn_live, target_date):
+    end_day = datetime.strptime(target_date, '%Y-%m-%d').date()
+    log(f"📐 Refreshing crowd baselines ({BASELINE_WINDOW_DAYS} days through {end_day})")
+    try:
+        stored = refresh_crowd_baselines(conn_warehouse, conn_live, end_day)
+        log(f"   Stored {stored} baseline rows")
+    except Exception as e:
+        # Lookups fall back to the configured baselines, so this never fails the ETL
+        log(f"⚠️ Crowd baseline refresh failed: {e}")
+
+def refresh_rollups(conn_warehouse, target_date, recopied_days=()):
+    # The dashboard reads raw rows only after the last rolled-up day, so catch up on every day since
+    # then (a failed night, or the whole warehouse on the first run), not just the copied one.
+    # Earlier days re-copied by the reconcile are rolled up again too, or their new rows never show.
+    end_day = datetime.strptime(target_date, '%Y-%m-%d').date()
+    try:
+        start_day = min(first_unrolled_day(conn_warehouse) or end_day, end_day)
+        log(f"🧮 Rolling up {start_day} → {end_day} into day_hour_rollups")
+        stored = refresh_day_hour_rollups(conn_warehouse, start_day, end_day)
+        log(f"   Stored {stored} rollup rows")
+        for day in sorted(datetime.strptime(d, '%Y-%m-%d').date() for d in recopied_days):
+            if day < start_day:
+                log(f"🧮 Rolling up re-copied day {day} into day_hour_rollups")
+                stored = refresh_day_hour_rollups(conn_warehouse, day, day)
+                log(f"   Stored {stored} rollup rows")
+    except Exception as e:
+        # The dashboard aggregates raw days newer than the rollups, so this never fails the ETL
+        log(f"⚠️ Day/hour rollup failed: {e}")
+
 def run_etl():
     target_date = (datetime.now().date() - timedelta(days=2)).strftime('%Y-%m-%d')
     cutoff_date = (datetime.now().date() - timedelta(days=ETL_DAYS_TO_KEEP_RUNTIME_DATA)).strftime('%Y-%m-%d')
@@ -76,10 +162,16 @@ def run_etl():
     log(f"TEST MODE: {'ON' if TEST_MODE else 'OFF'}")
     log(f"Keeping {ETL_DAYS_TO_KEEP_RUNTIME_DATA} days in live.db (Cutoff: {cutoff_date})")
 
-    conn_live = sqlite3.connect(LIVE_DB)
-    conn_warehouse = sqlite3.connect(WAREHOUSE_DB)
+    conn_live = prepare_connection(sqlite3.connect(LIVE_DB))
+    conn_warehouse = prepare_connection(sqlite3.connect(WAREHOUSE_DB))
 
     try:
+        if VERIFY_BEFORE_PRUNE:
+            dated_tables = [(t, c) for t, c in TABLES_WITH_DATES if c is not None]
+            ensure_date_indexes(conn_live, dated_tables)
+            ensure_date_indexes(conn_warehouse, dated_tables)
+
+        recopied_days = set()  # queue_status days re-copied by the reconcile, rolled up again below
         for table, date_column in TABLES_WITH_DATES:
             if table == 'entities':
                 copied = copy_data(table, None, conn_live, conn_warehouse, target_date=None)
@@ -88,7 +180,14 @@ def run_etl():
             log(f"✅ Copied {copied} rows from {table}")
 
             if date_column is not None and table != 'entities':
-                deleted = prune_old_data(table, date_column, conn_live, cutoff_date)
+                keep_days = set()
+                if VERIFY_BEFORE_PRUNE:
+                    keep_days, recopied = reconcile_before_prune(table, date_column, conn_live, conn_warehouse, cutoff_date)
+                    if table == 'queue_status':
+                        recopied_days |= recopied
+                    if keep_days is None:
+                        continue
+                deleted = prune_old_data(table, date_column, conn_live, cutoff_date, keep_days)
                 log(f"🗑️ Deleted {deleted} old rows from {table} in live.db")
 
         if TEST_MODE:
@@ -100,6 +199,15 @@ def run_etl():
             conn_live.commit()
             log("✅ Changes committed successfully")
 
+            if EXPORT_PARQUET:
+                export_parquet_day(conn_warehouse, target_date)
+
+            if REFRESH_CROWD_BASELINES:
+                refresh_baselines(conn_warehouse, conn_live, target_date)
+
+            if REFRESH_DAY_HOUR_ROLLUPS:
+                refresh_rollups(conn_warehouse, target_date, recopied_days)
+
     except Exception as e:
         log(f"❌ ERROR: {e}")
         conn_warehouse.rollback()
@@ -0,0 +1,148 @@
+import sys
+import time
+import zlib
+import sqlite3
+import argparse
+from datetime import datetime, timedelta
+
+LIVE_DB = r'E:\app_data\db_live\live.db'
+WAREHOUSE_DB = r'E:\app_data\db_data_warehouse\warehouse.db'
+
+# Same date-partitioned tables the ETL copies: (table_name, date_column)
+TABLES_WITH_DATES = [
+    ('queue_status', 'timestamp'),
+    ('forecast', 'forecast_time'),
+    ('schedule', 'date'),
+    ('operating_hours', 'timestamp'),
+]
+
+
+def row_hash(*values):
+    """32-bit hash of one row. Summed per day it gives an order-independent checksum."""
+    return zlib.crc32('\x1f'.join(repr(v) for v in values).encode('utf-8'))
+
+
+def prepare_connection(conn):
+    """Register the row_hash() SQL function so checksums are aggregated inside SQLite."""
+    conn.create_function('row_hash', -1, row_hash, deterministic=True)
+    return conn
+
+
+def ensure_date_indexes(conn, tables=TABLES_WITH_DATES):
+    """Index each date column so the per-day range scans below never touch older rows."""
+    for table, date_column in tables:
+        conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_{date_column} ON {table}({date_column})")
+    conn.commit()
+
+
+def table_columns(conn, table):
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+
+
+def day_fingerprints(conn, table, date_column, start_day, end_day, columns=None):
+    """
+    {day: (row_count, checksum)} for every day in [start_day, end_day].
+    Days are DATE(date_column), exactly as the ETL selects them. The range predicate is
+    padded by a day on each side (timestamps with UTC offsets can shift day under DATE())
+    and stays sargable, so SQLite walks the date index instead of the whole table.
+    """
+    columns = columns or table_columns(conn, table)
+    lower = (datetime.strptime(start_day, '%Y-%m-%d') - timedelta(days=1)).strftime('%Y-%m-%d')
+    upper = (datetime.strptime(end_day, '%Y-%m-%d') + timedelta(days=2)).strftime('%Y-%m-%d')
+
+    query = f"""
+    SELECT DATE({date_column}) AS day, COUNT(*), SUM(row_hash({', '.join(columns)}))
+    FROM {table}
+    WHERE {date_column} >= ? AND {date_column} < ?
+    GROUP BY day
+    HAVING day BETWEEN ? AND ?
+    """
+    return {day: (count, checksum) for day, count, checksum in
+            conn.execute(query, (lower, upper, start_day, end_day))}
+
+
+def reconcile_table(conn_live, conn_warehouse, table, date_column, start_day, end_day, skip_pruned_days=True):
+    """
+    Compare one table day by day. Returns a list of mismatch dicts (empty when every day matches).
+    Days with no rows left in live.db have normally been pruned after a good copy and are
+    skipped unless skip_pruned_days is False.
+    Both connections must have been passed through prepare_connection().
+    """
+    live_columns = table_columns(conn_live, table)
+    warehouse_columns = table_columns(conn_warehouse, table)
+    if live_columns != warehouse_columns:
+        return [{'table': table, 'day': None, 'issue': 'SCHEMA_MISMATCH',
+                 'live': live_columns, 'warehouse': warehouse_columns}]
+
+    live = day_fingerprints(conn_live, table, date_column, start_day, end_day, live_columns)
+    warehouse = day_fingerprints(conn_warehouse, table, date_column, start_day, end_day, live_columns)
+
+    mismatches = []
+    for day in sorted(set(live) | set(warehouse)):
+        if skip_pruned_days and day not in live:
+            continue
+        live_count, live_sum = live.get(day, (0, 0))
+        wh_count, wh_sum = warehouse.get(day, (0, 0))
+        if live_count > wh_count:
+            issue = 'MISSING_IN_WAREHOUSE'
+        elif live_count < wh_count:
+            issue = 'EXTRA_IN_WAREHOUSE'
+        elif live_sum != wh_sum:
+            issue = 'CHECKSUM_MISMATCH'
+        else:
+            continue
+        mismatches.append({'table': table, 'day': day, 'issue': issue,
+                           'live': live_count, 'warehouse': wh_count})
+    return mismatches
+
+
+def copied_day_range(conn_live):
+    """
+    Days still in live.db that the ETL should already have copied: from the oldest
+    day in queue_status up to the ETL's last target date (two days ago).
+    """
+    first = conn_live.execute("SELECT MIN(timestamp) FROM queue_status").fetchone()[0]
+    last_target = (datetime.now().date() - timedelta(days=2)).strftime('%Y-%m-%d')
+    if not first or first[:10] > last_target:
+        return None, None
+    return first[:10], last_target
+
+
+def run_reconciliation(start_day=None, end_day=None, tables=TABLES_WITH_DATES,
+                       live_db=LIVE_DB, warehouse_db=WAREHOUSE_DB):
+    started = time.perf_counter()
+    with sqlite3.connect(live_db) as conn_live, sqlite3.connect(warehouse_db) as conn_warehouse:
+        prepare_connection(conn_live)
+        prepare_connection(conn_warehouse)
+        ensure_date_indexes(conn_live, tables)
+        ensure_date_indexes(conn_warehouse, tables)
+
+        if not start_day:
+            start_day, end_day = copied_day_range(conn_live)
+            if not start_day:
+                print("No already-copied days left in live.db to reconcile.")
+                return []
+        end_day = end_day or start_day
+
+        print(f"🔎 Reconciling live → warehouse for {start_day} → {end_day}")
+        mismatches = []
+        for table, date_column in tables:
+            table_mismatches = reconcile_table(conn_live, conn_warehouse, table, date_column, start_day, end_day)
+            status = "✅ OK" if not table_mismatches else f"❌ {len(table_mismatches)} mismatched day(s)"
+            print(f"   {table:<16} {status}")
+            mismatches.extend(table_mismatches)
+
+    for m in mismatches:
+        print(f"   {m['table']} {m['day']}: {m['issue']} (live={m['live']}, warehouse={m['warehouse']})")
+    print(f"Finished in {time.perf_counter() - started:.2f}s")
+    return mismatches
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Verify warehouse.db holds exactly the live.db rows per table and day.")
+    arg_parser.add_argument("--start", help="First day (YYYY-MM-DD); default: oldest day still in live.db")
+    arg_parser.add_argument("--end", help="Last day (YYYY-MM-DD); default: --start, or the ETL's last target date")
+    args = arg_parser.parse_args()
+
+    result = run_reconciliation(args.start, args.end)
+    sys.exit(1 if result else 0)
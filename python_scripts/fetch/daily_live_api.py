@@ -4,9 +4,22 @@ import datetime
 import json
 import schedule
 import time
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from utils.change_log import install_change_log, prune_change_log
+from utils.crowd_index_history import record_crowd_index
 
 DB_PATH = r'E:\app_data\db_live\live.db'
 
+# Publish a consistent read-only copy of live.db after each poll for the dashboard (USE_LIVE_READ_REPLICA)
+PUBLISH_READ_REPLICA = False
+REPLICA_PATH = r'E:\app_data\db_live\live_replica.db'
+
+# Store basic + enhanced crowd index per park in crowd_index_history after each poll cycle
+RECORD_CROWD_INDEX = True
+
 PARKS = {
     "Magic Kingdom": "75ea578a-adc8-4116-a54d-dccb60765ef9",
     "Epcot": "47f90d2c-e191-4239-a466-5892ef59a88b",
@@ -72,6 +85,8 @@ def create_tables():
             )
         ''')
 
+        install_change_log(conn)
+
         print("🎉 Tables created/verified.")
 
 def fetch_and_insert_data(park_name, park_id):
@@ -181,11 +196,62 @@ def fetch_and_insert_data(park_name, park_id):
     except Exception as e:
         print(f"❌ Unexpected error processing live data for {park_name}: {e}")
 
+def publish_read_replica(db_path=DB_PATH, replica_path=REPLICA_PATH):
+    """Snapshot live.db with the backup API and atomically swap it in as the read replica."""
+    start = time.perf_counter()
+    tmp_path = replica_path + ".tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    src = sqlite3.connect(db_path, timeout=30.0)
+    dst = sqlite3.connect(tmp_path)
+    try:
+        src.backup(dst)  # Single step = one consistent read transaction on live.db
+        dst.execute("PRAGMA journal_mode=DELETE")  # Readers open it with immutable=1, so no WAL
+    finally:
+        dst.close()
+        src.close()
+
+    # On Windows the swap fails while a reader has the old copy open; readers are short, so retry
+    for attempt in range(10):
+        try:
+            os.replace(tmp_path, replica_path)
+            break
+        except PermissionError:
+            time.sleep(0.2)
+    else:
+        print("⚠️ Read replica is busy; keeping the previous snapshot.")
+        os.remove(tmp_path)
+        return
+
+    print(f"🪞 Published read replica ({os.path.getsize(replica_path) / (1024 * 1024):.1f} MB) in {time.perf_counter() - start:.2f}s")
+
 def fetch_disney_data():
     print("📡 Starting live Disney data fetch...")
     create_tables()
     for park_name, park_id in PARKS.items():
         fetch_and_insert_data(park_name, park_id)
+    if RECORD_CROWD_INDEX:
+        try:
+            start = time.perf_counter()
+            with sqlite3.connect(DB_PATH, timeout=30.0) as conn:
+                written = record_crowd_index(conn, list(PARKS))
+            print(f"📈 Recorded crowd index for {written} parks in {time.perf_counter() - start:.2f}s")
+        except Exception as e:
+            print(f"❌ Failed to record crowd index: {e}")
+    try:
+        # Every poll adds a change_log entry per row; nothing else bounds the log
+        with sqlite3.connect(DB_PATH, timeout=30.0) as conn:
+            pruned = prune_change_log(conn)
+        if pruned:
+            print(f"🧹 Pruned {pruned} change_log entries")
+    except Exception as e:
+        print(f"❌ Failed to prune change_log: {e}")
+    if PUBLISH_READ_REPLICA:
+        try:
+            publish_read_replica()
+        except Exception as e:
+            print(f"❌ Failed to publish read replica: {e}")
     print("🏁 Live data fetch complete.")
 
 if __name__ == "__main__":
@@ -4,6 +4,11 @@ import datetime
 import json
 import schedule
 import time
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from utils.change_log import install_change_log
 
 DB_PATH = r'E:\app_data\db_live\live.db'
 
@@ -45,8 +50,11 @@ def create_schedule_tables():
         ''')
 
         c.execute('CREATE INDEX IF NOT EXISTS idx_schedule_entity_date ON schedule(entity_id, date)')
+        c.execute('CREATE INDEX IF NOT EXISTS idx_schedule_date ON schedule(date)')
         c.execute('CREATE INDEX IF NOT EXISTS idx_purchases_park_entity ON purchases(park_entity_id)')
 
+        install_change_log(conn)
+
     print("🎉 Schedule tables created/verified with schema and indexes.")
 
 def fetch_and_insert_schedule(park_name, park_id):
@@ -0,0 +1,208 @@
+import os
+import sqlite3
+import logging
+import threading
+from typing import Dict, Optional
+
+import pandas as pd
+
+from utils.warehouse_parquet import PARQUET_ROOT, WAREHOUSE_DB_PATH, park_partition_name
+from utils.wait_rollups import DAY_ORDER, day_hour_cells
+
+try:
+    import duckdb
+except ImportError:  # pip install duckdb
+    duckdb = None
+
+logger = logging.getLogger(__name__)
+
+# "sqlite" keeps the existing SQLite/pandas path; "duckdb" runs the aggregate scans in-process with DuckDB
+ANALYTICS_BACKEND = "sqlite"
+
+# What DuckDB scans: "parquet" (the ETL's partitioned export) or "sqlite" (warehouse.db via DuckDB's sqlite extension)
+DUCKDB_SOURCE = "parquet"
+DUCKDB_THREADS = os.cpu_count() or 4
+
+# One relation with the same shape regardless of source: park is the partition slug, ts is TIMESTAMPTZ (UTC)
+PARQUET_VIEW = """
+CREATE OR REPLACE VIEW waits AS
+SELECT park, name, type, status, wait_minutes, timestamp AS ts
+FROM read_parquet('{root}/*/*/*.parquet', hive_partitioning = true, hive_types = {{'park': VARCHAR, 'date': VARCHAR}})
+"""
+
+SQLITE_VIEW = """
+CREATE OR REPLACE VIEW waits AS
+SELECT
+    lower(replace(qs.park, ' ', '_')) AS park,
+    e.name,
+    e.type,
+    qs.status,
+    qs.wait_minutes,
+    timezone('UTC', CAST(qs.timestamp AS TIMESTAMP)) AS ts
+FROM wh.queue_status qs
+JOIN wh.entities e ON qs.entity_id = e.id
+"""
+
+_connection = None
+_connection_lock = threading.Lock()
+
+
+def duckdb_enabled() -> bool:
+    return ANALYTICS_BACKEND == "duckdb" and duckdb is not None
+
+
+def _get_duckdb():
+    """Shared in-process DuckDB connection; each caller works on its own cursor."""
+    global _connection
+    with _connection_lock:
+        if _connection is None:
+            conn = duckdb.connect(database=':memory:')
+            conn.execute(f"SET threads TO {int(DUCKDB_THREADS)}")
+            conn.execute("SET TimeZone = 'UTC'")
+            if DUCKDB_SOURCE == "sqlite":
+                conn.execute("INSTALL sqlite")
+                conn.execute("LOAD sqlite")
+                conn.execute(f"ATTACH '{WAREHOUSE_DB_PATH}' AS wh (TYPE sqlite, READ_ONLY)")
+                conn.execute(SQLITE_VIEW)
+            else:
+                conn.execute(PARQUET_VIEW.format(root=PARQUET_ROOT.replace('\\', '/')))
+            _connection = conn
+        return _connection.cursor()
+
+
+def day_hour_averages(park_name: str, num_attractions: int, sqlite_fallback: bool = True,
+                       db_path: str = WAREHOUSE_DB_PATH) -> Optional[Dict[str, pd.DataFrame]]:
+    """
+    Day-of-week and hour-of-day average waits for the park's top attractions, in the
+    same shape as the dashboard's get_wait_times_by_day_and_hour_warehouse().
+    Aggregated in DuckDB when enabled, otherwise in SQLite over day_hour_rollups (sqlite_fallback).
+    Returns None when neither is available or both fail, so callers fall back to the pandas path.
+    """
+    cells = _duckdb_day_hour_cells(park_name, num_attractions) if duckdb_enabled() else None
+
+    if cells is None and sqlite_fallback:
+        try:
+            with sqlite3.connect(db_path) as conn:
+                cells = day_hour_cells(conn, park_name, num_attractions)
+        except Exception as e:
+            logger.error(f"SQLite day/hour aggregation failed for {park_name}: {e}")
+
+    if cells is None:
+        return None
+    if cells.empty:
+        return {'day': pd.DataFrame(), 'hour': pd.DataFrame()}
+
+    def weighted_mean(keys, column_name):
+        grouped = cells.groupby(['name', keys], as_index=False)[['total_wait', 'samples']].sum()
+        grouped['Wait Minutes'] = grouped['total_wait'] / grouped['samples']
+        return grouped.rename(columns={'name': 'Name', keys: column_name})[['Name', column_name, 'Wait Minutes']]
+
+    day_avg = weighted_mean('day_of_week', 'Day of Week')
+    day_avg['Day of Week'] = pd.Categorical(day_avg['Day of Week'], categories=DAY_ORDER, ordered=True)
+    day_avg = day_avg.sort_values(['Name', 'Day of Week']).reset_index(drop=True)
+
+    hour_avg = weighted_mean('hour_of_day', 'Hour of Day')
+    hour_avg = hour_avg.sort_values(['Name', 'Hour of Day']).reset_index(drop=True)
+
+    return {'day': day_avg, 'hour': hour_avg}
+
+
+def _duckdb_day_hour_cells(park_name: str, num_attractions: int) -> Optional[pd.DataFrame]:
+    query = """
+    WITH base AS (
+        SELECT name, wait_minutes, timezone('America/New_York', ts) AS local_ts
+        FROM waits
+        WHERE park = ? AND type = 'ATTRACTION' AND wait_minutes > 1
+    ),
+    top AS (
+        SELECT name FROM base GROUP BY name ORDER BY AVG(wait_minutes) DESC, name LIMIT ?
+    )
+    SELECT
+        b.name,
+        dayname(b.local_ts) AS day_of_week,
+        CAST(hour(b.local_ts) AS INTEGER) AS hour_of_day,
+        SUM(b.wait_minutes) AS total_wait,
+        COUNT(*) AS samples
+    FROM base b
+    JOIN top USING (name)
+    GROUP BY ALL
+    """
+
+    try:
+        return _get_duckdb().execute(query, [park_partition_name(park_name), num_attractions]).df()
+    except Exception as e:
+        logger.error(f"DuckDB day/hour aggregation failed for {park_name}: {e}")
+        return None
+
+
+def top_attractions_by_mean_wait(park_name: str, n: int = 10, db_path: str = WAREHOUSE_DB_PATH) -> pd.DataFrame:
+    """Top-N attractions by mean historical wait (columns: name, avg_wait, samples)."""
+    if duckdb_enabled():
+        query = """
+        SELECT name, AVG(wait_minutes) AS avg_wait, COUNT(*) AS samples
+        FROM waits
+        WHERE park = ? AND type = 'ATTRACTION' AND status = 'OPERATING' AND wait_minutes > 0
+        GROUP BY name
+        ORDER BY avg_wait DESC, name
+        LIMIT ?
+        """
+        try:
+            return _get_duckdb().execute(query, [park_partition_name(park_name), n]).df()
+        except Exception as e:
+            logger.error(f"DuckDB top-N failed for {park_name}, falling back to SQLite: {e}")
+
+    query = """
+    SELECT e.name, AVG(qs.wait_minutes) AS avg_wait, COUNT(*) AS samples
+    FROM queue_status qs
+    JOIN entities e ON qs.entity_id = e.id
+    WHERE qs.park = ? AND e.type = 'ATTRACTION' AND qs.status = 'OPERATING' AND qs.wait_minutes > 0
+    GROUP BY e.name
+    ORDER BY avg_wait DESC, e.name
+    LIMIT ?
+    """
+    with sqlite3.connect(db_path) as conn:
+        return pd.read_sql_query(query, conn, params=(park_name, n))
+
+
+def rolling_baselines(end_date: str, window_days: int = 28, db_path: str = WAREHOUSE_DB_PATH) -> pd.DataFrame:
+    """
+    Mean operating wait per (park, weekday, hour) over the window_days before end_date (UTC day, exclusive).
+    weekday follows Python's convention (Monday=0) and hour is the UTC hour, matching how
+    improved_crowd_index_util calls get_historical_baseline().
+    """
+    if duckdb_enabled():
+        query = """
+        SELECT
+            park,
+            CAST(isodow(ts) - 1 AS INTEGER) AS weekday,
+            CAST(hour(ts) AS INTEGER) AS hour,
+            AVG(wait_minutes) AS avg_wait,
+            COUNT(*) AS samples
+        FROM waits
+        WHERE type = 'ATTRACTION' AND status = 'OPERATING'
+          AND wait_minutes > 0 AND wait_minutes < 300
+          AND ts >= CAST(? AS TIMESTAMPTZ) - to_days(?)
+          AND ts < CAST(? AS TIMESTAMPTZ)
+        GROUP BY ALL
+        """
+        try:
+            return _get_duckdb().execute(query, [end_date, window_days, end_date]).df()
+        except Exception as e:
+            logger.error(f"DuckDB baseline scan failed, falling back to SQLite: {e}")
+
+    query = """
+    SELECT
+        lower(replace(qs.park, ' ', '_')) AS park,
+        (CAST(strftime('%w', qs.timestamp) AS INTEGER) + 6) % 7 AS weekday,
+        CAST(strftime('%H', qs.timestamp) AS INTEGER) AS hour,
+        AVG(qs.wait_minutes) AS avg_wait,
+        COUNT(*) AS samples
+    FROM queue_status qs
+    JOIN entities e ON qs.entity_id = e.id
+    WHERE e.type = 'ATTRACTION' AND qs.status = 'OPERATING'
+      AND qs.wait_minutes > 0 AND qs.wait_minutes < 300
+      AND qs.timestamp >= date(?, ?) AND qs.timestamp < ?
+    GROUP BY 1, 2, 3
+    """
+    with sqlite3.connect(db_path) as conn:
+        return pd.read_sql_query(query, conn, params=(end_date, f"-{window_days} days", end_date))
@@ -0,0 +1,141 @@
+import sqlite3
+import logging
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Tables whose inserts/updates/deletes are captured in change_log
+CHANGE_CAPTURE_TABLES = ['queue_status', 'entities', 'schedule', 'purchases']
+
+# Safety cap so an abandoned consumer can't grow the log forever; consumers that fall
+# further behind than this are told to resync
+CHANGE_LOG_MAX_ROWS = 2_000_000
+
+
+def install_change_log(conn: sqlite3.Connection, tables: Iterable[str] = CHANGE_CAPTURE_TABLES) -> None:
+    """Create the changelog tables and the capture triggers for every listed table that exists."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS change_log (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            table_name TEXT NOT NULL,
+            row_id INTEGER NOT NULL,
+            op TEXT NOT NULL  -- 'I', 'U' or 'D'
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS change_consumers (
+            consumer TEXT PRIMARY KEY,
+            last_seq INTEGER NOT NULL DEFAULT 0,
+            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    existing = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    for table in tables:
+        if table not in existing:
+            continue
+        for event, op, row_ref in (('INSERT', 'I', 'NEW'), ('UPDATE', 'U', 'NEW'), ('DELETE', 'D', 'OLD')):
+            conn.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS trg_{table}_cdc_{event.lower()}
+                AFTER {event} ON {table}
+                BEGIN
+                    INSERT INTO change_log (table_name, row_id, op) VALUES ('{table}', {row_ref}.rowid, '{op}');
+                END
+            """)
+    conn.commit()
+
+
+def _last_acknowledged(conn: sqlite3.Connection, consumer: str) -> int:
+    conn.execute("INSERT OR IGNORE INTO change_consumers (consumer, last_seq) VALUES (?, 0)", (consumer,))
+    return conn.execute("SELECT last_seq FROM change_consumers WHERE consumer = ?", (consumer,)).fetchone()[0]
+
+
+def get_changes(conn: sqlite3.Connection, consumer: str, tables: Optional[Iterable[str]] = None,
+                limit: int = 50_000) -> Dict:
+    """
+    Changes after the consumer's last acknowledged sequence number, oldest first.
+
+    Returns {'changes': [(seq, table_name, row_id, op), ...], 'last_seq': <highest seq returned
+    or the current position>, 'resync': True if entries the consumer never saw were pruned}.
+    Pass last_seq to acknowledge() once the batch has been processed.
+    """
+    since = _last_acknowledged(conn, consumer)
+    conn.commit()
+    head = latest_seq(conn)
+
+    query = "SELECT seq, table_name, row_id, op FROM change_log WHERE seq > ? AND seq <= ?"
+    params = [since, head]
+    if tables:
+        tables = list(tables)
+        query += f" AND table_name IN ({', '.join('?' * len(tables))})"
+        params.extend(tables)
+    query += " ORDER BY seq LIMIT ?"
+    params.append(limit)
+    changes = conn.execute(query, params).fetchall()
+
+    oldest = conn.execute("SELECT MIN(seq) FROM change_log").fetchone()[0]
+    resync = since > 0 and oldest is not None and oldest > since + 1
+
+    # A short batch means everything up to head has been seen (entries for other tables included)
+    last_seq = changes[-1][0] if len(changes) == limit else max(since, head)
+
+    return {'changes': changes, 'last_seq': last_seq, 'resync': resync}
+
+
+def acknowledge(conn: sqlite3.Connection, consumer: str, seq: int) -> None:
+    """Record that the consumer has processed everything up to seq, then prune what all consumers have seen."""
+    conn.execute("""
+        INSERT INTO change_consumers (consumer, last_seq, updated_at) VALUES (?, ?, CURRENT_TIMESTAMP)
+        ON CONFLICT(consumer) DO UPDATE SET
+            last_seq = MAX(last_seq, excluded.last_seq),
+            updated_at = CURRENT_TIMESTAMP
+    """, (consumer, seq))
+    conn.commit()
+    prune_change_log(conn)
+
+
+def latest_seq(conn: sqlite3.Connection) -> int:
+    row = conn.execute("SELECT MAX(seq) FROM change_log").fetchone()
+    return row[0] or 0
+
+
+def tables_changed_since(conn: sqlite3.Connection, since: int, tables: Iterable[str]) -> Tuple[bool, int]:
+    """
+    Read-only probe for readers that keep their own position instead of acknowledging (the
+    dashboard reads a replica): (whether any of `tables` changed after seq `since`, current head).
+    A head below `since` (database replaced) or entries after `since` already pruned count as changed.
+    """
+    head = latest_seq(conn)
+    if head < since:
+        return True, head
+    oldest = conn.execute("SELECT MIN(seq) FROM change_log").fetchone()[0]
+    if oldest is not None and oldest > since + 1:
+        return True, head
+    tables = list(tables)
+    changed = conn.execute(
+        f"SELECT 1 FROM change_log WHERE seq > ? AND seq <= ? AND table_name IN ({', '.join('?' * len(tables))}) LIMIT 1",
+        (since, head, *tables)
+    ).fetchone()
+    return changed is not None, head
+
+
+def prune_change_log(conn: sqlite3.Connection) -> int:
+    """
+    Delete entries every consumer has acknowledged, and anything beyond the newest
+    CHANGE_LOG_MAX_ROWS. Run by the ingester after each poll, so the cap holds even when no
+    consumer is registered (read-only probes like the dashboard's never acknowledge).
+    """
+    cap_floor = latest_seq(conn) - CHANGE_LOG_MAX_ROWS
+    min_acked = conn.execute("SELECT MIN(last_seq) FROM change_consumers").fetchone()[0]
+    floor = cap_floor if min_acked is None else max(min_acked, cap_floor)
+    deleted = conn.execute("DELETE FROM change_log WHERE seq <= ?", (floor,)).rowcount
+    conn.commit()
+    if deleted:
+        logger.debug(f"Pruned {deleted} change_log entries")
+    return deleted
+
+
+def changed_row_ids(changes, table: str, ops: Iterable[str] = ('I', 'U')) -> Set[int]:
+    """rowids of `table` touched by the given operations in a get_changes() batch."""
+    ops = set(ops)
+    return {row_id for _, table_name, row_id, op in changes if table_name == table and op in ops}
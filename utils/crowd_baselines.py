@@ -0,0 +1,140 @@
+import time
+import sqlite3
+import logging
+from datetime import date, timedelta
+from typing import Dict, Optional
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Rolling window the nightly refresh summarizes (days of warehouse data, ending at the ETL's target day)
+BASELINE_WINDOW_DAYS = 28
+# Baselines pool the neighbouring hours too (h-1..h+1), as get_historical_baseline() always has
+SMOOTHING_HOURS = 1
+INCLUDE_ENTITY_BASELINES = True
+
+PARK_LEVEL = ''  # entity_id of park-wide rows
+
+# Wait histogram per (park, entity, weekday, UTC hour): waits are whole minutes, so counts per
+# value give exact means and percentiles without pulling individual rows into pandas.
+# weekday is Monday=0 (datetime.weekday()); strftime('%w') is Sunday=0.
+HISTOGRAM_QUERY = """
+SELECT
+    e.park,
+    qs.entity_id,
+    (CAST(strftime('%w', qs.timestamp) AS INTEGER) + 6) % 7 AS weekday,
+    CAST(strftime('%H', qs.timestamp) AS INTEGER) AS hour,
+    qs.wait_minutes AS wait,
+    COUNT(*) AS n
+FROM queue_status qs
+JOIN entities e ON qs.entity_id = e.id
+WHERE qs.timestamp >= ? AND qs.timestamp < ?
+  AND e.type = 'ATTRACTION'
+  AND qs.status = 'OPERATING'
+  AND qs.wait_minutes > 0
+  AND qs.wait_minutes < 300
+GROUP BY e.park, qs.entity_id, weekday, hour, wait
+"""
+
+
+def create_crowd_baselines(conn: sqlite3.Connection) -> None:
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS crowd_baselines (
+            park TEXT NOT NULL,
+            entity_id TEXT NOT NULL,      -- '' for the park-wide baseline
+            weekday INTEGER NOT NULL,     -- Monday = 0
+            hour INTEGER NOT NULL,        -- UTC hour, smoothed over hour-1..hour+1
+            mean_wait REAL,
+            p50_wait REAL,
+            p90_wait REAL,
+            samples INTEGER,
+            window_start TEXT,
+            window_end TEXT,
+            refreshed_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (park, entity_id, weekday, hour)
+        ) WITHOUT ROWID
+    """)
+    conn.commit()
+
+
+def _summarize(histogram: pd.DataFrame, keys: list) -> pd.DataFrame:
+    """Mean, p50, p90 and sample count per key group from a (keys..., wait, n) histogram."""
+    histogram = histogram.groupby(keys + ['wait'], as_index=False)['n'].sum()
+    histogram = histogram.sort_values(keys + ['wait'], ignore_index=True)
+    grouped = histogram.groupby(keys, sort=False)
+    histogram['cumulative'] = grouped['n'].cumsum()
+    histogram['total'] = grouped['n'].transform('sum')
+    histogram['weighted'] = histogram['wait'] * histogram['n']
+
+    summary = grouped.agg(samples=('n', 'sum'), weighted=('weighted', 'sum'))
+    summary['mean_wait'] = summary['weighted'] / summary['samples']
+    # Nearest-rank percentiles: first wait whose cumulative count reaches the fraction
+    for column, fraction in (('p50_wait', 0.5), ('p90_wait', 0.9)):
+        reached = histogram[histogram['cumulative'] >= fraction * histogram['total']]
+        summary[column] = reached.groupby(keys, sort=False)['wait'].first()
+    return summary.drop(columns='weighted').reset_index()
+
+
+def compute_crowd_baselines(conn_source: sqlite3.Connection, window_start: date, window_end: date,
+                            include_entities: bool = INCLUDE_ENTITY_BASELINES) -> pd.DataFrame:
+    """Baseline rows for [window_start, window_end] (UTC days) from queue_status in conn_source."""
+    histogram = pd.read_sql_query(HISTOGRAM_QUERY, conn_source,
+                                  params=(window_start.isoformat(), (window_end + timedelta(days=1)).isoformat()))
+    if histogram.empty:
+        return histogram
+
+    # Hour h pools the samples of h-1..h+1 on the same weekday
+    shifted = []
+    for offset in range(-SMOOTHING_HOURS, SMOOTHING_HOURS + 1):
+        part = histogram.assign(hour=histogram['hour'] + offset)
+        shifted.append(part[(part['hour'] >= 0) & (part['hour'] <= 23)])
+    smoothed = pd.concat(shifted, ignore_index=True)
+
+    frames = [_summarize(smoothed, ['park', 'weekday', 'hour']).assign(entity_id=PARK_LEVEL)]
+    if include_entities:
+        frames.append(_summarize(smoothed, ['park', 'entity_id', 'weekday', 'hour']))
+    baselines = pd.concat(frames, ignore_index=True)
+    baselines['window_start'] = window_start.isoformat()
+    baselines['window_end'] = window_end.isoformat()
+    return baselines
+
+
+def refresh_crowd_baselines(conn_source: sqlite3.Connection, conn_target: sqlite3.Connection,
+                            end_day: date, window_days: int = BASELINE_WINDOW_DAYS) -> int:
+    """
+    Rebuild crowd_baselines in conn_target from the window_days ending at end_day (inclusive) in
+    conn_source. Run nightly by the ETL (warehouse -> live.db). Returns the number of rows stored.
+    """
+    started = time.perf_counter()
+    window_start = end_day - timedelta(days=window_days - 1)
+    baselines = compute_crowd_baselines(conn_source, window_start, end_day)
+
+    create_crowd_baselines(conn_target)
+    columns = ['park', 'entity_id', 'weekday', 'hour', 'mean_wait', 'p50_wait', 'p90_wait',
+               'samples', 'window_start', 'window_end']
+    rows = [tuple(v.item() if hasattr(v, 'item') else v for v in row)
+            for row in baselines[columns].itertuples(index=False)] if not baselines.empty else []
+    with conn_target:
+        # Replace in one transaction so readers see either the old or the new baselines
+        conn_target.execute("DELETE FROM crowd_baselines")
+        conn_target.executemany(
+            f"INSERT INTO crowd_baselines ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+            rows
+        )
+    logger.info(f"Refreshed {len(rows)} crowd baselines for {window_start} → {end_day} "
+                f"in {time.perf_counter() - started:.1f}s")
+    return len(rows)
+
+
+def get_crowd_baseline(conn: sqlite3.Connection, park: str, weekday: int, hour: int,
+                       entity_id: str = PARK_LEVEL) -> Optional[Dict]:
+    """{'mean_wait', 'p50_wait', 'p90_wait', 'samples'} for one key, or None if there is no row."""
+    row = conn.execute(
+        """SELECT mean_wait, p50_wait, p90_wait, samples FROM crowd_baselines
+           WHERE park = ? AND entity_id = ? AND weekday = ? AND hour = ?""",
+        (park, entity_id, weekday, hour)
+    ).fetchone()
+    if row is None:
+        return None
+    return dict(zip(('mean_wait', 'p50_wait', 'p90_wait', 'samples'), row))
@@ -0,0 +1,4 @@
+from utils.crowd_index.common import (PARKS, DB_PATH, get_db_connection, parse_timestamp, validate_timestamp,
+                                      get_latest_timestamp, get_crowd_level, format_crowd_report)
+from utils.crowd_index.registry import (CrowdIndexStrategy, STRATEGIES, register_strategy, get_strategy,
+                                        available_strategies, evaluate, get_crowd_index_summary)
@@ -0,0 +1,90 @@
+import sqlite3
+import logging
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+from contextlib import contextmanager
+
+# Helpers shared by every crowd index algorithm (crowd_index_utils, improved_crowd_index_util)
+
+logger = logging.getLogger(__name__)
+
+PARKS = ["Magic Kingdom", "Epcot", "Hollywood Studios", "Animal Kingdom"]
+DB_PATH = r'E:\app_data\db_live\live.db'
+
+@contextmanager
+def get_db_connection(db_path: str):
+    """Context manager for database connections with proper error handling."""
+    conn = None
+    try:
+        conn = sqlite3.connect(db_path, timeout=30.0)
+        conn.execute("PRAGMA journal_mode=WAL")  # Better concurrency
+        yield conn
+    except sqlite3.Error as e:
+        logger.error(f"Database error: {e}")
+        raise
+    finally:
+        if conn:
+            conn.close()
+
+def parse_timestamp(timestamp: str) -> datetime:
+    """queue_status timestamp (ISO 8601, optionally with a trailing Z) as a datetime."""
+    return datetime.fromisoformat(timestamp.replace('Z', '+00:00') if timestamp.endswith('Z') else timestamp)
+
+def validate_timestamp(timestamp: str) -> bool:
+    """Validate timestamp format."""
+    try:
+        parse_timestamp(timestamp)
+        return True
+    except (ValueError, TypeError, AttributeError):
+        return False
+
+def get_latest_timestamp(conn: sqlite3.Connection) -> Optional[str]:
+    """Get the latest timestamp from queue_status with validation."""
+    try:
+        query = """
+        SELECT MAX(timestamp) as latest_timestamp
+        FROM queue_status
+        WHERE timestamp IS NOT NULL
+        """
+        result = conn.execute(query).fetchone()
+
+        if result and result[0]:
+            timestamp = result[0]
+            if validate_timestamp(timestamp):
+                return timestamp
+            else:
+                logger.warning(f"Invalid timestamp format found: {timestamp}")
+
+        return None
+    except sqlite3.Error as e:
+        logger.error(f"Error fetching latest timestamp: {e}")
+        return None
+
+def get_crowd_level(score: int, thresholds: list, inclusive: bool = False) -> str:
+    """
+    Crowd level label for a score from (upper bound, label) thresholds. inclusive=True puts a score
+    equal to a bound in that level; otherwise it moves up one. Scores past the last bound get its label.
+    """
+    for threshold, level in thresholds:
+        if score < threshold or (inclusive and score == threshold):
+            return level
+    return thresholds[-1][1]
+
+def format_crowd_report(park_results: Dict, title: str, window_minutes: int,
+                        detail_lines: Callable[[Dict], List[str]], level: Callable[[int], str],
+                        parks: list = PARKS, width: int = 80) -> None:
+    """Print a per-park crowd report; detail_lines(result) adds the algorithm's own lines."""
+    print(f"\n🌐 {title}")
+    print(f"📅 Timestamp: {park_results[parks[0]]['timestamp']}")
+    print(f"⏰ Analysis Window: ±{window_minutes} minutes")
+    print("=" * width)
+
+    for park in parks:
+        result = park_results[park]
+        score = result['crowd_index']
+
+        print(f"\n🏰 {park}")
+        print(f"   Crowd Index: {score:>3}% {level(score)}")
+        print(f"   Avg Wait: {result['avg_wait']:>5.1f} min  |  Max Wait: {result['max_wait']:>3} min")
+        for line in detail_lines(result):
+            print(f"   {line}")
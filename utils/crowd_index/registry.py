@@ -0,0 +1,88 @@
+import sqlite3
+import logging
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, List, Optional, Union
+
+from utils.crowd_index.common import get_crowd_level, get_db_connection, get_latest_timestamp
+
+logger = logging.getLogger(__name__)
+
+STRATEGIES: Dict[str, 'CrowdIndexStrategy'] = {}
+
+
+class CrowdIndexStrategy(ABC):
+    """
+    One crowd index algorithm, in two forms that must agree:
+
+    calculate(conn, parks, timestamp) - live path: {park: result dict} for one poll, straight from SQL
+    compute(data)                     - every poll cycle of preloaded SnapshotData at once; a frame
+                                        indexed by (snap, park) with the same result keys as columns
+    """
+    name = ''
+    thresholds = []          # (upper bound, label) pairs for crowd_level()
+    inclusive_levels = False
+
+    @abstractmethod
+    def calculate(self, conn: sqlite3.Connection, parks: list, timestamp: str) -> Dict[str, Dict]:
+        ...
+
+    @abstractmethod
+    def compute(self, data):
+        ...
+
+    def crowd_level(self, score: int) -> str:
+        return get_crowd_level(score, self.thresholds, self.inclusive_levels)
+
+
+def register_strategy(cls):
+    """
+    Class decorator: make a CrowdIndexStrategy subclass available by its name. Instantiates it,
+    so a strategy missing calculate() or compute() fails here with a TypeError.
+    """
+    STRATEGIES[cls.name] = cls()
+    return cls
+
+
+def _load_builtin() -> None:
+    # The built-in strategies wrap modules that import this package's helpers, so they are
+    # registered on first lookup rather than when the package is imported
+    from utils.crowd_index import strategies  # noqa: F401
+
+
+def get_strategy(name: str) -> CrowdIndexStrategy:
+    _load_builtin()
+    try:
+        return STRATEGIES[name]
+    except KeyError:
+        raise ValueError(f"Unknown crowd index strategy {name!r} (available: {', '.join(sorted(STRATEGIES))})")
+
+
+def available_strategies() -> List[str]:
+    _load_builtin()
+    return sorted(STRATEGIES)
+
+
+def evaluate(strategies: Iterable[Union[str, CrowdIndexStrategy]], snapshots) -> Dict:
+    """
+    Run every strategy over the same preloaded snapshots (crowd_index_backfill.load_snapshot_data()).
+    Returns {strategy name: frame indexed by (snap, park)}.
+    """
+    results = {}
+    for strategy in strategies:
+        if isinstance(strategy, str):
+            strategy = get_strategy(strategy)
+        results[strategy.name] = strategy.compute(snapshots)
+    return results
+
+
+def get_crowd_index_summary(db_path: str, parks: list, strategy: str = 'basic') -> Optional[Dict[str, Dict]]:
+    """Crowd index per park at the latest poll with the named strategy, for Dash."""
+    try:
+        with get_db_connection(db_path) as conn:
+            latest_timestamp = get_latest_timestamp(conn)
+            if not latest_timestamp:
+                return None
+            return get_strategy(strategy).calculate(conn, parks, latest_timestamp)
+    except Exception as e:
+        logger.error(f"Failed to calculate {strategy} crowd index summary: {e}")
+        return None
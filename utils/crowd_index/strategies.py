@@ -0,0 +1,40 @@
+import sqlite3
+from typing import Dict
+
+from utils import crowd_index_utils as basic
+from utils import improved_crowd_index_util as enhanced
+from utils import crowd_index_backfill as backfill
+from utils.crowd_index_history import ENHANCED_COLUMNS
+from utils.crowd_index.registry import CrowdIndexStrategy, register_strategy
+
+
+@register_strategy
+class BasicCrowdIndex(CrowdIndexStrategy):
+    """Average wait x operating attractions, normalized per park (crowd_index_utils)."""
+    name = 'basic'
+    thresholds = basic.CROWD_THRESHOLDS
+
+    def calculate(self, conn: sqlite3.Connection, parks: list, timestamp: str) -> Dict[str, Dict]:
+        try:
+            return basic.calculate_crowd_index_batch(conn, parks, timestamp)
+        except Exception as e:
+            basic.logger.warning(f"Batch crowd index failed ({e}); falling back to per-park queries")
+            return {park: basic.calculate_crowd_index(conn, park, timestamp) for park in parks}
+
+    def compute(self, data):
+        return backfill.compute_basic(data.rows, data.snaps, data.parks, data.totals)
+
+
+@register_strategy
+class EnhancedCrowdIndex(CrowdIndexStrategy):
+    """Popularity-weighted average wait against the historical baseline (improved_crowd_index_util)."""
+    name = 'enhanced'
+    thresholds = enhanced.CROWD_THRESHOLDS
+    inclusive_levels = True
+
+    def calculate(self, conn: sqlite3.Connection, parks: list, timestamp: str) -> Dict[str, Dict]:
+        return {park: enhanced.calculate_enhanced_crowd_index(conn, park, timestamp) for park in parks}
+
+    def compute(self, data):
+        frame = backfill.compute_enhanced(data.rows, data.snaps, data.parks, data.totals, data.buckets)
+        return frame.rename(columns=ENHANCED_COLUMNS)
@@ -0,0 +1,435 @@
+import time
+import sqlite3
+import logging
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+from typing import List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils import crowd_index_utils as basic
+from utils import improved_crowd_index_util as enhanced
+from utils.crowd_index_history import create_crowd_index_history, write_history_rows, HISTORY_COLUMNS
+
+# Backfills crowd_index_history for past days from the warehouse. Each chunk of days is loaded
+# once and the basic and enhanced index are computed for every poll in it with array operations
+# (no per-timestamp queries). The enhanced index's trailing statistics (7-day popularity, key
+# attraction weights, 4-week baseline) come from per-entity hourly buckets, so a chunk never has
+# to load raw rows from outside its own days. Long ranges are split across a process pool.
+#
+#   python -m utils.crowd_index_backfill --start 2025-07-01 --end 2025-07-31
+
+logger = logging.getLogger(__name__)
+
+WAREHOUSE_DB_PATH = r'E:\app_data\db_data_warehouse\warehouse.db'
+
+CHUNK_DAYS = 3            # Days per worker task
+MAX_WORKERS = None        # Process pool size (None = CPU count)
+POLL_GAP_SECONDS = 60     # Park polls closer together than this form one poll cycle
+RECENT_DAYS = 7           # Popularity window of the enhanced index
+BASELINE_WEEKS = 4        # Historical baseline lookback of the enhanced index
+
+KEY_STRIDE = 10 ** 10     # group code * stride + time -> one sortable int64 key
+
+# OPERATING rows only: every window, dedup and "operating in the last hour" count filters on it
+ROWS_QUERY = """
+SELECT id, entity_id, timestamp, wait_minutes
+FROM queue_status
+WHERE timestamp >= ? AND timestamp < ?
+  AND status = 'OPERATING'
+"""
+
+POLLS_QUERY = "SELECT DISTINCT timestamp FROM queue_status WHERE timestamp >= ? AND timestamp < ?"
+
+# Positive waits per (entity, UTC day, UTC hour) with the filters of the three trailing lookups:
+# avg_recent_wait (any status), get_key_attraction_weights (OPERATING) and get_historical_baseline
+# (OPERATING, < 300)
+HOUR_BUCKETS_QUERY = """
+SELECT entity_id,
+       substr(timestamp, 1, 10) AS day,
+       CAST(substr(timestamp, 12, 2) AS INTEGER) AS hour,
+       SUM(wait_minutes) AS recent_sum,
+       COUNT(*) AS recent_count,
+       SUM(CASE WHEN status = 'OPERATING' THEN wait_minutes END) AS operating_sum,
+       COUNT(CASE WHEN status = 'OPERATING' THEN 1 END) AS operating_count,
+       SUM(CASE WHEN status = 'OPERATING' AND wait_minutes < 300 THEN wait_minutes END) AS baseline_sum,
+       COUNT(CASE WHEN status = 'OPERATING' AND wait_minutes < 300 THEN 1 END) AS baseline_count
+FROM queue_status
+WHERE timestamp >= ? AND timestamp < ?
+  AND wait_minutes > 0
+GROUP BY entity_id, day, hour
+"""
+
+
+def _connect_ro(db_path):
+    return sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+
+
+def _epoch_seconds(timestamps: pd.Series) -> np.ndarray:
+    return pd.to_datetime(timestamps, format='ISO8601').values.astype('datetime64[s]').astype('int64')
+
+
+def _expand_windows(row_seconds: np.ndarray, snap_seconds: np.ndarray, width: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (row index, snapshot index) for every row with snapshot - width <= row <= snapshot.
+    snap_seconds must be sorted. A row lands in every snapshot window that contains it.
+    """
+    lo = np.searchsorted(snap_seconds, row_seconds, side='left')
+    hi = np.searchsorted(snap_seconds, row_seconds + width, side='right')
+    counts = hi - lo
+    row_idx = np.repeat(np.arange(len(row_seconds)), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    return row_idx, np.repeat(lo, counts) + offsets
+
+
+def _trailing(group_codes, times, sums, counts):
+    """Sorted composite keys plus prefix sums, for trailing-window lookups per group."""
+    keys = np.asarray(group_codes, dtype='int64') * KEY_STRIDE + np.asarray(times, dtype='int64')
+    order = np.argsort(keys, kind='stable')
+    prefix_sums = np.concatenate([[0.0], np.cumsum(np.asarray(sums, dtype='float64')[order])])
+    prefix_counts = np.concatenate([[0], np.cumsum(np.asarray(counts, dtype='int64')[order])])
+    return keys[order], prefix_sums, prefix_counts
+
+
+def _trailing_stats(table, group_codes, first, last):
+    """(sum, count) over first <= time <= last for each (group, first, last) query."""
+    keys, prefix_sums, prefix_counts = table
+    base = np.asarray(group_codes, dtype='int64') * KEY_STRIDE
+    hi = np.searchsorted(keys, base + last, side='right')
+    lo = np.searchsorted(keys, base + first, side='left')
+    return prefix_sums[hi] - prefix_sums[lo], prefix_counts[hi] - prefix_counts[lo]
+
+
+def load_entities(conn) -> pd.DataFrame:
+    """ATTRACTION entities with a dense integer code used for all per-entity arrays."""
+    entities = pd.read_sql_query("SELECT id, name, park FROM entities WHERE type = 'ATTRACTION'", conn)
+    entities['code'] = np.arange(len(entities))
+    return entities.set_index('id')
+
+
+def load_hour_buckets(db_path: str, start_day: date, end_day: date) -> pd.DataFrame:
+    """Per-entity hourly positive-wait sums and counts for [start_day, end_day] (UTC)."""
+    conn = _connect_ro(db_path)
+    try:
+        buckets = pd.read_sql_query(HOUR_BUCKETS_QUERY, conn,
+                                    params=(start_day.isoformat(), (end_day + timedelta(days=1)).isoformat()))
+    finally:
+        conn.close()
+    day_index = pd.to_datetime(buckets.pop('day'), format='%Y-%m-%d').values.astype('datetime64[D]').astype('int64')
+    buckets['hour_index'] = day_index * 24 + buckets.pop('hour').values
+    return buckets
+
+
+def poll_snapshots(timestamps: pd.Series, start_day: date, end_day: date) -> pd.DataFrame:
+    """
+    One snapshot per poll cycle: consecutive park polls less than POLL_GAP_SECONDS apart are
+    grouped, and the cycle is stamped with its last timestamp - the MAX(timestamp) the
+    ingester computes against. Only cycles ending in [start_day, end_day] are returned.
+    """
+    distinct = timestamps.sort_values(ignore_index=True)
+    seconds = _epoch_seconds(distinct)
+    cycle = np.concatenate([[0], np.cumsum(np.diff(seconds) >= POLL_GAP_SECONDS)])
+    last = pd.Series(np.arange(len(distinct))).groupby(cycle).max().values
+
+    snaps = pd.DataFrame({'poll_timestamp': distinct.values[last], 'seconds': seconds[last]})
+    day = snaps['seconds'] // 86400
+    first_day = np.datetime64(start_day, 'D').astype('int64')
+    last_day = np.datetime64(end_day, 'D').astype('int64')
+    return snaps[(day >= first_day) & (day <= last_day)].reset_index(drop=True)
+
+
+def _window_latest(rows, snaps, window, max_wait):
+    """Latest row per (snapshot, park, attraction name) in [poll - window, poll], plus raw row counts."""
+    valid = rows[rows['wait_minutes'].between(0, max_wait)]
+    row_idx, snap_idx = _expand_windows(valid['seconds'].values, snaps['seconds'].values, window)
+    hits = valid.iloc[row_idx].assign(snap=snap_idx)
+    data_points = hits.groupby(['snap', 'park']).size()
+    latest = (hits.sort_values(['snap', 'park', 'name', 'seconds', 'id'])
+                  .drop_duplicates(['snap', 'park', 'name'], keep='last')
+                  .reset_index(drop=True))
+    return latest, data_points
+
+
+def compute_basic(rows, snaps, parks, totals) -> pd.DataFrame:
+    """calculate_crowd_index() for every (snapshot, park), indexed by (snap, park)."""
+    latest, data_points = _window_latest(rows, snaps, basic.TIME_WINDOW_MINUTES * 60, 480)
+    aggregates = latest.groupby(['snap', 'park'])['wait_minutes'].agg(['mean', 'max', 'size'])
+    aggregates.columns = ['avg_wait', 'max_wait', 'num_operating']
+    aggregates['data_points'] = data_points
+
+    # Distinct attractions with an OPERATING row in the hour before the poll (the live query's
+    # COUNT(DISTINCT e.id) over the "last hour"); reported as attractions_operating when the
+    # window has no data
+    operating_count = {}
+    for park in parks:
+        park_rows = rows[rows['park'] == park].sort_values('seconds', kind='stable')
+        park_seconds = park_rows['seconds'].values
+        park_codes = park_rows['code'].values
+        hi = np.searchsorted(park_seconds, snaps['seconds'].values, side='right')
+        lo = np.searchsorted(park_seconds, snaps['seconds'].values - 3600, side='left')
+        operating_count[park] = np.array([len(np.unique(park_codes[a:b])) for a, b in zip(lo, hi)], dtype='int64')
+
+    grid = pd.MultiIndex.from_product([snaps.index, parks], names=['snap', 'park'])
+    frame = basic.park_config_frame(parks).reindex(grid, level='park')
+    frame['operating_count'] = np.column_stack([operating_count[p] for p in parks]).ravel()
+    frame['total_count'] = totals.reindex(parks).fillna(0).astype(int).tolist() * len(snaps)
+    frame = basic.add_basic_scores(frame.join(aggregates))
+
+    has_data = frame['num_operating'] > 0
+    expected = frame['expected_operating']
+    out = pd.DataFrame(index=grid)
+    out['crowd_index'] = np.minimum(np.round(frame['adjusted_index'].fillna(0)), 100).astype(int)
+    out['avg_wait'] = frame['avg_wait'].fillna(0).round(1)
+    out['max_wait'] = frame['max_wait'].fillna(0).astype(int)
+    out['attractions_operating'] = np.where(has_data, frame['num_operating'], frame['operating_count']).astype(int)
+    out['attractions_total'] = frame['total_count']
+    out['data_points'] = frame['data_points'].fillna(0).astype(int)
+    out['confidence'] = np.select(
+        [frame['num_operating'] >= expected * basic.HIGH_CONFIDENCE_SHARE,
+         frame['num_operating'] >= expected * basic.MEDIUM_CONFIDENCE_SHARE],
+        ['High', 'Medium'], 'Low')
+    out['utilization_rate'] = (frame['utilization_factor'] * 100).round(1).where(has_data)
+    return out
+
+
+def compute_enhanced(rows, snaps, parks, totals, buckets) -> pd.DataFrame:
+    """
+    calculate_enhanced_crowd_index() for every (snapshot, park), indexed by (snap, park).
+    Trailing lookups are hour-aligned: they cover whole UTC hours before the poll's hour.
+    """
+    latest, data_points = _window_latest(rows, snaps, enhanced.TIME_WINDOW_MINUTES * 60, 300)
+    latest_hour = snaps['seconds'].values[latest['snap'].values] // 3600
+    recent_hours = RECENT_DAYS * 24
+
+    # Popularity: each entity's mean positive wait over the last RECENT_DAYS
+    recent = _trailing(buckets['code'], buckets['hour_index'], buckets['recent_sum'], buckets['recent_count'])
+    recent_sum, recent_count = _trailing_stats(recent, latest['code'].values,
+                                               latest_hour - recent_hours, latest_hour - 1)
+    avg_recent = np.divide(recent_sum, recent_count, out=np.zeros(len(latest)), where=recent_count > 0)
+
+    # Key attractions: the entities each key name resolves to in the live path (resolve_key_attractions,
+    # LIKE '%name%', so case-insensitive), weighted by their pooled recent operating waits, >= 5 samples
+    is_key = np.zeros(len(latest), dtype=bool)
+    key_weight = np.zeros(len(latest))
+    for park in parks:
+        in_park = (latest['park'] == park).values
+        park_buckets = buckets[buckets['park'] == park]
+        for key in enhanced.PARK_CONFIG.get(park, {}).get('key_attractions', []):
+            matches_key = in_park & latest['name'].str.contains(key, case=False, regex=False).values
+            if not matches_key.any():
+                continue
+            like_buckets = park_buckets[park_buckets['name'].str.contains(key, case=False, regex=False)]
+            table = _trailing(np.zeros(len(like_buckets)), like_buckets['hour_index'],
+                              like_buckets['operating_sum'], like_buckets['operating_count'])
+            hours = latest_hour[matches_key]
+            k_sum, k_count = _trailing_stats(table, np.zeros(len(hours)), hours - recent_hours, hours - 1)
+            k_weight = np.where(k_count >= 5, np.minimum(k_sum / np.maximum(k_count, 1) / 30.0, 3.0), 1.0)
+            key_weight[matches_key] = np.maximum(key_weight[matches_key], k_weight)
+            is_key |= matches_key
+
+    baseline_wait = latest['park'].map({p: enhanced.PARK_CONFIG.get(p, {}).get('baseline_wait', 15) for p in parks}).values
+    weight = np.where(is_key, key_weight * 2.0, 1.0)
+    weight = np.where(avg_recent > 0, weight * np.minimum(avg_recent / baseline_wait, 3.0), weight)
+
+    latest['weight'] = weight
+    latest['weighted_wait'] = latest['wait_minutes'] * weight
+    per_snap = latest.groupby(['snap', 'park'])
+    aggregates = per_snap[['weighted_wait', 'weight']].sum()
+    aggregates['max_wait'] = per_snap['wait_minutes'].max()
+    aggregates['num_operating'] = per_snap.size()
+    aggregates['data_points'] = data_points
+
+    grid = pd.MultiIndex.from_product([snaps.index, parks], names=['snap', 'park'])
+    frame = aggregates.reindex(grid)
+    park_level = grid.get_level_values('park')
+    snap_seconds = snaps['seconds'].values[grid.get_level_values('snap')]
+    hour = (snap_seconds // 3600) % 24
+    day_index = snap_seconds // 86400
+    weekday = (day_index + 3) % 7  # 1970-01-01 was a Thursday; Monday = 0 like datetime.weekday()
+
+    # Historical baseline as crowd_baselines holds it for the poll's day: same weekday in the
+    # BASELINE_WEEKS before it (the nightly refresh lags two days, so the current week never counts),
+    # pooled over hours h-1..h+1
+    park_codes = pd.Index(parks)
+    baseline_table = _trailing(park_codes.get_indexer(buckets['park']), buckets['hour_index'],
+                               buckets['baseline_sum'], buckets['baseline_count'])
+    grid_park_codes = park_codes.get_indexer(park_level)
+    wait_sum = np.zeros(len(grid))
+    samples = np.zeros(len(grid))
+    lookups = [(7 * week, dh) for week in range(1, BASELINE_WEEKS + 1) for dh in (-1, 0, 1)]
+    for days_back, hour_offset in lookups:
+        bucket_hour = hour + hour_offset
+        hour_index = (day_index - days_back) * 24 + bucket_hour
+        s, c = _trailing_stats(baseline_table, grid_park_codes, hour_index, hour_index)
+        in_range = (bucket_hour >= 0) & (bucket_hour <= 23)
+        wait_sum += np.where(in_range, s, 0)
+        samples += np.where(in_range, c, 0)
+    config = [enhanced.PARK_CONFIG.get(p, {}) for p in park_level]
+    config_baseline = np.array([c.get('baseline_wait', 15) for c in config], dtype=float)
+    historical_baseline = np.where(samples > 0, wait_sum / np.maximum(samples, 1), config_baseline)
+
+    weight_factor = np.array([c.get('weight_factor', 1.0) for c in config])
+    capacity_factor = np.array([c.get('capacity_factor', 1.0) for c in config])
+    total_attractions = totals.reindex(park_level).fillna(0).values
+
+    num_operating = frame['num_operating'].fillna(0).values
+    data_count = frame['data_points'].fillna(0).values
+    total_weight = frame['weight'].fillna(0).values
+    weighted_avg = np.divide(frame['weighted_wait'].fillna(0).values, total_weight,
+                             out=np.zeros(len(grid)), where=total_weight > 0)
+    baseline_ratio = weighted_avg / np.maximum(historical_baseline, 5)
+    hour_adjustment = np.array([enhanced.HOURLY_ADJUSTMENTS.get(h, 1.0) for h in hour])
+    day_adjustment = np.array([enhanced.DAY_ADJUSTMENTS.get(d, 1.0) for d in weekday])
+    adjusted_score = baseline_ratio * 100 / (hour_adjustment * day_adjustment)
+    capacity_adjusted = adjusted_score * weight_factor / capacity_factor
+    operating_ratio = np.minimum(num_operating / np.maximum(total_attractions * 0.6, 1), 1.0)
+    final_score = capacity_adjusted * (0.7 + 0.3 * operating_ratio)
+
+    confidence_score = ((num_operating >= 5).astype(int) + (data_count >= 10) +
+                        (operating_ratio >= 0.4) + (weighted_avg > 0)) / 4
+    has_data = num_operating > 0
+
+    out = pd.DataFrame(index=grid)
+    out['enhanced_index'] = np.where(has_data, np.clip(np.round(final_score), 0, 100), 0).astype(int)
+    out['enhanced_avg_wait'] = np.where(has_data, np.round(weighted_avg, 1), 0)
+    out['enhanced_max_wait'] = frame['max_wait'].fillna(0).astype(int).values
+    out['enhanced_attractions_operating'] = num_operating.astype(int)
+    out['enhanced_attractions_total'] = np.where(has_data, total_attractions, 0).astype(int)
+    out['enhanced_data_points'] = data_count.astype(int)
+    out['enhanced_confidence'] = np.where(has_data, np.select(
+        [confidence_score >= 0.8, confidence_score >= 0.5], ['High', 'Medium'], 'Low'), 'Low')
+    out['baseline_comparison'] = np.where(has_data, np.round(baseline_ratio, 2), np.nan)
+    out['historical_baseline'] = np.where(has_data, np.round(historical_baseline, 1), np.nan)
+    out['operating_ratio'] = np.where(has_data, np.round(operating_ratio * 100, 1), np.nan)
+    return out
+
+
+def bucket_range(start_day: date, end_day: date) -> Tuple[date, date]:
+    """Days of hourly buckets the trailing lookups of polls in [start_day, end_day] can touch."""
+    return start_day - timedelta(days=7 * BASELINE_WEEKS + 1), end_day
+
+
+class SnapshotData(NamedTuple):
+    """Everything the vectorized index computations need for a range of poll cycles, loaded once."""
+    rows: pd.DataFrame      # OPERATING rows with park, name and epoch seconds
+    snaps: pd.DataFrame     # one row per poll cycle: poll_timestamp, seconds
+    parks: list
+    totals: pd.Series       # ATTRACTION entities per park
+    buckets: pd.DataFrame   # hourly trailing buckets (enhanced index)
+
+
+def load_snapshot_data(db_path: str, start_day: date, end_day: date, buckets: Optional[pd.DataFrame] = None,
+                       parks: list = basic.PARKS) -> Optional[SnapshotData]:
+    """Rows, poll cycles and buckets for every poll cycle ending in [start_day, end_day]; None if there are none."""
+    if buckets is None:
+        buckets = load_hour_buckets(db_path, *bucket_range(start_day, end_day))
+
+    # Rows from an hour before the first poll (for the last-hour operating count) to just past the
+    # last; built from datetimes, since adding hours or seconds to a date silently drops them
+    load_from = (datetime.combine(start_day, datetime.min.time()) - timedelta(hours=1)).isoformat()
+    load_to = (datetime.combine(end_day + timedelta(days=1), datetime.min.time()) + timedelta(seconds=POLL_GAP_SECONDS)).isoformat()
+    conn = _connect_ro(db_path)
+    try:
+        entities = load_entities(conn)
+        rows = pd.read_sql_query(ROWS_QUERY, conn, params=(load_from, load_to))
+        polls = pd.read_sql_query(POLLS_QUERY, conn, params=(load_from, load_to))['timestamp']
+    finally:
+        conn.close()
+
+    snaps = poll_snapshots(polls, start_day, end_day)
+    if snaps.empty:
+        return None
+
+    rows = rows.join(entities, on='entity_id', how='inner')
+    rows = rows[rows['park'].isin(parks)].reset_index(drop=True)
+    rows['seconds'] = _epoch_seconds(rows['timestamp'])
+    return SnapshotData(rows=rows, snaps=snaps, parks=list(parks), totals=entities.groupby('park').size(),
+                        buckets=buckets.join(entities, on='entity_id', how='inner'))
+
+
+def compute_chunk(db_path: str, start_day: date, end_day: date, buckets: Optional[pd.DataFrame] = None,
+                  parks: list = basic.PARKS) -> List[tuple]:
+    """crowd_index_history rows for every poll cycle ending in [start_day, end_day]."""
+    data = load_snapshot_data(db_path, start_day, end_day, buckets, parks)
+    if data is None:
+        return []
+
+    history = compute_basic(data.rows, data.snaps, data.parks, data.totals).join(
+        compute_enhanced(data.rows, data.snaps, data.parks, data.totals, data.buckets))
+    history.insert(0, 'poll_timestamp', data.snaps['poll_timestamp'].values[history.index.get_level_values('snap')])
+    history = history.reset_index(level='park').reset_index(drop=True)[HISTORY_COLUMNS]
+    history = history.astype(object).where(history.notna(), None)
+    return [tuple(v.item() if hasattr(v, 'item') else v for v in row) for row in history.itertuples(index=False)]
+
+
+def day_chunks(start_day: date, end_day: date, chunk_days: int = CHUNK_DAYS) -> List[Tuple[date, date]]:
+    chunks = []
+    chunk_start = start_day
+    while chunk_start <= end_day:
+        chunk_end = min(chunk_start + timedelta(days=chunk_days - 1), end_day)
+        chunks.append((chunk_start, chunk_end))
+        chunk_start = chunk_end + timedelta(days=1)
+    return chunks
+
+
+def run_backfill(start_day: date, end_day: date, db_path: str = WAREHOUSE_DB_PATH, target_db: str = None,
+                 chunk_days: int = CHUNK_DAYS, workers: int = MAX_WORKERS) -> int:
+    """
+    Compute and store crowd_index_history rows for [start_day, end_day]. Returns rows written.
+
+    Two passes over the pool: hourly buckets for the range plus its lookback (each day scanned
+    once), then the per-chunk index computation with the buckets each chunk needs.
+    """
+    started = time.perf_counter()
+    target_db = target_db or db_path
+    chunks = day_chunks(start_day, end_day, chunk_days)
+    bucket_chunks = day_chunks(*bucket_range(start_day, end_day), chunk_days)
+    written = 0
+
+    with sqlite3.connect(target_db, timeout=60.0) as target, \
+            ProcessPoolExecutor(max_workers=workers) as pool:
+        create_crowd_index_history(target)
+
+        buckets = pd.concat(pool.map(load_hour_buckets, [db_path] * len(bucket_chunks),
+                                     *zip(*bucket_chunks)), ignore_index=True)
+        logger.info(f"Loaded {len(buckets)} hourly buckets in {time.perf_counter() - started:.1f}s")
+
+        futures = []
+        for chunk in chunks:
+            first, last = bucket_range(*chunk)
+            hours = buckets['hour_index'] // 24
+            needed = buckets[(hours >= np.datetime64(first, 'D').astype('int64')) &
+                             (hours <= np.datetime64(last, 'D').astype('int64'))]
+            futures.append((chunk, pool.submit(compute_chunk, db_path, *chunk, needed)))
+
+        for chunk, future in futures:
+            rows = future.result()
+            write_history_rows(target, rows)
+            written += len(rows)
+            logger.info(f"{chunk[0]} → {chunk[1]}: {len(rows)} rows ({time.perf_counter() - started:.1f}s)")
+
+    logger.info(f"Backfilled {written} crowd index rows for {start_day} → {end_day} "
+                f"in {time.perf_counter() - started:.1f}s")
+    return written
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    arg_parser = argparse.ArgumentParser(description="Backfill crowd_index_history from the warehouse.")
+    arg_parser.add_argument("--start", required=True, help="First UTC day (YYYY-MM-DD)")
+    arg_parser.add_argument("--end", help="Last UTC day (YYYY-MM-DD); default: --start")
+    arg_parser.add_argument("--db", default=WAREHOUSE_DB_PATH, help="Source warehouse.db")
+    arg_parser.add_argument("--target", help="DB that receives crowd_index_history (default: --db)")
+    arg_parser.add_argument("--chunk-days", type=int, default=CHUNK_DAYS)
+    arg_parser.add_argument("--workers", type=int, default=MAX_WORKERS)
+    args = arg_parser.parse_args()
+
+    start_day = date.fromisoformat(args.start)
+    end_day = date.fromisoformat(args.end) if args.end else start_day
+    run_backfill(start_day, end_day, args.db, args.target, args.chunk_days, args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+import sqlite3
+import logging
+from typing import Dict, List, Optional
+
+from utils.crowd_index_utils import calculate_crowd_index_batch, get_latest_timestamp, PARKS
+from utils.improved_crowd_index_util import calculate_enhanced_crowd_index
+
+logger = logging.getLogger(__name__)
+
+# Result keys stored per (poll, park). Basic columns keep calculate_crowd_index()'s names so rows
+# read back into the same dict the dashboard already renders; enhanced ones are prefixed.
+BASIC_COLUMNS = ['crowd_index', 'avg_wait', 'max_wait', 'attractions_operating', 'attractions_total',
+                 'data_points', 'confidence', 'utilization_rate']
+ENHANCED_COLUMNS = {
+    'enhanced_index': 'crowd_index',
+    'enhanced_avg_wait': 'avg_wait',
+    'enhanced_max_wait': 'max_wait',
+    'enhanced_attractions_operating': 'attractions_operating',
+    'enhanced_attractions_total': 'attractions_total',
+    'enhanced_data_points': 'data_points',
+    'enhanced_confidence': 'confidence',
+    'baseline_comparison': 'baseline_comparison',
+    'historical_baseline': 'historical_baseline',
+    'operating_ratio': 'operating_ratio',
+}
+HISTORY_COLUMNS = ['poll_timestamp', 'park'] + BASIC_COLUMNS + list(ENHANCED_COLUMNS)
+
+
+def create_crowd_index_history(conn: sqlite3.Connection) -> None:
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS crowd_index_history (
+            poll_timestamp TEXT NOT NULL,
+            park TEXT NOT NULL,
+            crowd_index INTEGER,
+            avg_wait REAL,
+            max_wait INTEGER,
+            attractions_operating INTEGER,
+            attractions_total INTEGER,
+            data_points INTEGER,
+            confidence TEXT,
+            utilization_rate REAL,
+            enhanced_index INTEGER,
+            enhanced_avg_wait REAL,
+            enhanced_max_wait INTEGER,
+            enhanced_attractions_operating INTEGER,
+            enhanced_attractions_total INTEGER,
+            enhanced_data_points INTEGER,
+            enhanced_confidence TEXT,
+            baseline_comparison REAL,
+            historical_baseline REAL,
+            operating_ratio REAL,
+            computed_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (poll_timestamp, park)
+        )
+    """)
+    # Per-park time series for charts
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_crowd_index_history_park ON crowd_index_history(park, poll_timestamp)")
+    conn.commit()
+
+
+def history_row(poll_timestamp: str, park: str, basic: Dict, enhanced: Dict) -> tuple:
+    """One crowd_index_history row from a basic and an enhanced result dict."""
+    values = [basic.get(column) for column in BASIC_COLUMNS]
+    values += [enhanced.get(key) for key in ENHANCED_COLUMNS.values()]
+    # NumPy scalars (np.int64 in particular) can't be bound by sqlite3
+    return (poll_timestamp, park) + tuple(v.item() if hasattr(v, 'item') else v for v in values)
+
+
+def write_history_rows(conn: sqlite3.Connection, rows: List[tuple]) -> None:
+    conn.executemany(
+        f"INSERT OR REPLACE INTO crowd_index_history ({', '.join(HISTORY_COLUMNS)}) "
+        f"VALUES ({', '.join('?' * len(HISTORY_COLUMNS))})",
+        rows
+    )
+    conn.commit()
+
+
+def record_crowd_index(conn: sqlite3.Connection, parks: list = PARKS, poll_timestamp: Optional[str] = None) -> int:
+    """
+    Compute the basic and enhanced index for every park at the latest poll (or poll_timestamp)
+    and store them. Called by the ingester right after a poll cycle commits. Returns rows written.
+    """
+    create_crowd_index_history(conn)
+    poll_timestamp = poll_timestamp or get_latest_timestamp(conn)
+    if not poll_timestamp:
+        return 0
+
+    basic = calculate_crowd_index_batch(conn, parks, poll_timestamp)
+    rows = [
+        history_row(poll_timestamp, park, basic.get(park, {}),
+                    calculate_enhanced_crowd_index(conn, park, poll_timestamp))
+        for park in parks
+    ]
+    write_history_rows(conn, rows)
+    return len(rows)
+
+
+def get_latest_crowd_index(conn: sqlite3.Connection, parks: list) -> Optional[Dict[str, Dict]]:
+    """
+    Basic crowd index per park for the newest stored poll, in get_crowd_index_summary()'s shape
+    (the enhanced values ride along under 'enhanced'). One read on the primary key; None if empty.
+    """
+    cursor = conn.execute(f"""
+        SELECT {', '.join(HISTORY_COLUMNS)}
+        FROM crowd_index_history
+        WHERE poll_timestamp = (SELECT MAX(poll_timestamp) FROM crowd_index_history)
+    """)
+    stored = {row[1]: dict(zip(HISTORY_COLUMNS, row)) for row in cursor}
+    if not stored:
+        return None
+
+    results = {}
+    for park in parks:
+        row = stored.get(park)
+        if row is None:
+            continue
+        result = {column: row[column] for column in BASIC_COLUMNS if row[column] is not None}
+        result['timestamp'] = row['poll_timestamp']
+        result['enhanced'] = {key: row[column] for column, key in ENHANCED_COLUMNS.items() if row[column] is not None}
+        results[park] = result
+    return results
+
+
+def get_crowd_index_series(conn: sqlite3.Connection, park: str, since: str,
+                           columns: tuple = ('crowd_index', 'enhanced_index')) -> List[tuple]:
+    """(poll_timestamp, *columns) for one park from `since` (UTC ISO) on, oldest first."""
+    return conn.execute(
+        f"SELECT poll_timestamp, {', '.join(columns)} FROM crowd_index_history "
+        f"WHERE park = ? AND poll_timestamp >= ? ORDER BY poll_timestamp",
+        (park, since)
+    ).fetchall()
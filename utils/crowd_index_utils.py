@@ -1,9 +1,17 @@
+import os
+import sys
 import sqlite3
-from datetime import datetime, timedelta
-import pandas as pd
+from datetime import timedelta
 import logging
 from typing import Dict, Optional, Tuple
-from contextlib import contextmanager
+
+# pandas is imported inside the functions that need it: the CLI and health checks run the
+# pandas-free calculate_crowd_index_lite() and would otherwise spend most of their time importing it
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils.crowd_index import common
+from utils.crowd_index.common import (get_db_connection, get_latest_timestamp, parse_timestamp,
+                                      validate_timestamp, PARKS, DB_PATH)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -23,12 +31,62 @@ NORMALIZATION_FACTORS = {
     for park, config in PARK_CONFIG.items()
 }
 
-PARKS = list(NORMALIZATION_FACTORS.keys())
-DB_PATH = r'E:\app_data\db_live\live.db'
-
 # Time window for crowd calculation (minutes)
 TIME_WINDOW_MINUTES = 5  # Increased for more stable results
 
+# Confidence: share of a park's max_attractions operating in the window for High / Medium
+HIGH_CONFIDENCE_SHARE = 0.7
+MEDIUM_CONFIDENCE_SHARE = 0.4
+
+# Latest in-window row per (park, attraction name) as rn = 1, mirroring calculate_crowd_index()'s
+# groupby().last() dedup, with each park's raw row count alongside. {parks} = one ? per park.
+LATEST_ROWS_CTE = """
+    WITH window_rows AS (
+        SELECT
+            e.park,
+            e.name AS attraction_name,
+            qs.wait_minutes,
+            ROW_NUMBER() OVER (PARTITION BY e.park, e.name ORDER BY qs.timestamp DESC, qs.id DESC) AS rn,
+            COUNT(*) OVER (PARTITION BY e.park) AS data_points
+        FROM queue_status qs
+        JOIN entities e ON qs.entity_id = e.id
+        WHERE e.park IN ({parks})
+          AND e.type = 'ATTRACTION'
+          AND qs.status = 'OPERATING'
+          AND qs.timestamp BETWEEN ? AND ?
+          AND qs.wait_minutes IS NOT NULL
+          AND qs.wait_minutes >= 0
+          AND qs.wait_minutes <= 480
+    )
+"""
+
+ATTRACTION_COUNTS_QUERY = """
+    WITH totals AS (
+        SELECT park, COUNT(*) AS total
+        FROM entities
+        WHERE park IN ({parks}) AND type = 'ATTRACTION'
+        GROUP BY park
+    ),
+    operating AS (
+        -- Same count as get_park_attraction_stats(), but each entity's probe stops at its first
+        -- matching row on idx_queue_entity_timestamp instead of joining every recent row
+        SELECT e.park, COUNT(*) AS operating
+        FROM entities e
+        WHERE e.park IN ({parks})
+          AND e.type = 'ATTRACTION'
+          AND EXISTS (
+              SELECT 1 FROM queue_status qs
+              WHERE qs.entity_id = e.id
+                AND qs.timestamp >= datetime('now', '-1 hour')
+                AND qs.status = 'OPERATING'
+          )
+        GROUP BY e.park
+    )
+    SELECT t.park, t.total, COALESCE(o.operating, 0)
+    FROM totals t
+    LEFT JOIN operating o ON o.park = t.park
+"""
+
 # Crowd level thresholds (configurable)
 CROWD_THRESHOLDS = [
     (25, "🟢 Light"),
@@ -37,51 +95,6 @@ CROWD_THRESHOLDS = [
     (100, "🔴 Packed")
 ]
 
-@contextmanager
-def get_db_connection(db_path: str):
-    """Context manager for database connections with proper error handling."""
-    conn = None
-    try:
-        conn = sqlite3.connect(db_path, timeout=30.0)
-        conn.execute("PRAGMA journal_mode=WAL")  # Better concurrency
-        yield conn
-    except sqlite3.Error as e:
-        logger.error(f"Database error: {e}")
-        raise
-    finally:
-        if conn:
-            conn.close()
-
-def validate_timestamp(timestamp: str) -> bool:
-    """Validate timestamp format."""
-    try:
-        datetime.fromisoformat(timestamp.replace('Z', '+00:00') if timestamp.endswith('Z') else timestamp)
-        return True
-    except (ValueError, TypeError):
-        return False
-
-def get_latest_timestamp(conn: sqlite3.Connection) -> Optional[str]:
-    """Get the latest timestamp from queue_status with validation."""
-    try:
-        query = """
-        SELECT MAX(timestamp) as latest_timestamp
-        FROM queue_status 
-        WHERE timestamp IS NOT NULL
-        """
-        result = conn.execute(query).fetchone()
-        
-        if result and result[0]:
-            timestamp = result[0]
-            if validate_timestamp(timestamp):
-                return timestamp
-            else:
-                logger.warning(f"Invalid timestamp format found: {timestamp}")
-        
-        return None
-    except sqlite3.Error as e:
-        logger.error(f"Error fetching latest timestamp: {e}")
-        return None
-
 def get_park_attraction_stats(conn: sqlite3.Connection, park_name: str) -> Tuple[int, int]:
     """Get current operating and total attractions for a park."""
     try:
@@ -113,6 +126,77 @@ def get_park_attraction_stats(conn: sqlite3.Connection, park_name: str) -> Tuple
         logger.error(f"Error getting park stats for {park_name}: {e}")
         return 0, 0
 
+def crowd_index_result(park_name: str, timestamp: str, operating_count: int, total_count: int,
+                       num_operating: int = 0, avg_wait: float = 0, max_wait: int = 0, data_points: int = 0,
+                       adjusted_index: float = 0, utilization_factor: float = 0) -> Dict:
+    """
+    The result dict of every calculate_crowd_index() path (loop, batch, lite) from a park's scored
+    window aggregates. A park with nothing operating in the window gets the no-data result, which
+    reports the last-hour operating count instead.
+    """
+    if not num_operating:
+        logger.warning(f"No valid data found for {park_name} in time window")
+        return {
+            'crowd_index': 0,
+            'avg_wait': 0,
+            'max_wait': 0,
+            'attractions_operating': int(operating_count),
+            'attractions_total': int(total_count),
+            'data_points': 0,
+            'confidence': 'Low',
+            'timestamp': timestamp
+        }
+
+    # Determine confidence level
+    expected_operating = PARK_CONFIG.get(park_name, {}).get("max_attractions", 10)
+    confidence = 'High' if num_operating >= expected_operating * HIGH_CONFIDENCE_SHARE else \
+                'Medium' if num_operating >= expected_operating * MEDIUM_CONFIDENCE_SHARE else 'Low'
+
+    return {
+        'crowd_index': min(round(adjusted_index), 100),  # Cap at 100 and round
+        'avg_wait': round(avg_wait, 1),
+        'max_wait': int(max_wait),
+        'attractions_operating': int(num_operating),
+        'attractions_total': int(total_count),
+        'data_points': int(data_points),
+        'confidence': confidence,
+        'timestamp': timestamp,
+        'utilization_rate': round(float(utilization_factor) * 100, 1)
+    }
+
+def score_crowd_index(park_name: str, avg_wait: float, max_wait: int, num_operating: int, data_points: int,
+                      operating_count: int, total_count: int, timestamp: str) -> Dict:
+    """Crowd index result from a park's deduplicated window aggregates and attraction counts."""
+    # Enhanced scoring algorithm
+    # Base score from average wait times
+    base_score = avg_wait * num_operating
+    
+    # Apply park-specific weighting
+    park_weight = PARK_CONFIG.get(park_name, {}).get("weight_factor", 1.0)
+    weighted_score = base_score * park_weight
+    
+    # Adjust for park capacity utilization
+    expected_operating = PARK_CONFIG.get(park_name, {}).get("max_attractions", 10)
+    if operating_count > 0:
+        utilization_factor = min(num_operating / expected_operating, 1.0)
+    else:
+        utilization_factor = num_operating / expected_operating if expected_operating > 0 else 0
+    
+    # Final score calculation
+    normalization_factor = NORMALIZATION_FACTORS.get(park_name, 60 * 10)
+    raw_index = (weighted_score / normalization_factor) * 100
+    
+    # Apply utilization adjustment (higher utilization = more reliable score)
+    adjusted_index = raw_index * (0.5 + 0.5 * utilization_factor)
+
+    return crowd_index_result(park_name, timestamp, operating_count, total_count, num_operating,
+                              avg_wait, max_wait, data_points, adjusted_index, utilization_factor)
+
+def get_attraction_counts(conn: sqlite3.Connection, parks: list) -> Dict[str, Tuple[int, int]]:
+    """get_park_attraction_stats() for several parks in one query: {park: (operating, total)}."""
+    query = ATTRACTION_COUNTS_QUERY.format(parks=", ".join("?" * len(parks)))
+    return {park: (operating, total) for park, total, operating in conn.execute(query, (*parks, *parks))}
+
 def calculate_crowd_index(conn: sqlite3.Connection, park_name: str, timestamp: str) -> Dict:
     """
     Calculate crowd index with enhanced accuracy and additional metrics.
@@ -120,7 +204,7 @@ def calculate_crowd_index(conn: sqlite3.Connection, park_name: str, timestamp: s
     """
     try:
         # Parse timestamp and create time window
-        base_time = datetime.fromisoformat(timestamp.replace('Z', '+00:00') if timestamp.endswith('Z') else timestamp)
+        base_time = parse_timestamp(timestamp)
         start_time = (base_time - timedelta(minutes=TIME_WINDOW_MINUTES)).isoformat()
         end_time = (base_time + timedelta(minutes=TIME_WINDOW_MINUTES)).isoformat()
 
@@ -143,23 +227,14 @@ def calculate_crowd_index(conn: sqlite3.Connection, park_name: str, timestamp: s
         ORDER BY qs.timestamp DESC
         """
 
+        import pandas as pd
         df = pd.read_sql_query(query, conn, params=(park_name, start_time, end_time))
 
         # Get park statistics
         operating_count, total_count = get_park_attraction_stats(conn, park_name)
 
         if df.empty:
-            logger.warning(f"No valid data found for {park_name} in time window")
-            return {
-                'crowd_index': 0,
-                'avg_wait': 0,
-                'max_wait': 0,
-                'attractions_operating': operating_count,
-                'attractions_total': total_count,
-                'data_points': 0,
-                'confidence': 'Low',
-                'timestamp': timestamp
-            }
+            return crowd_index_result(park_name, timestamp, operating_count, total_count)
 
         # Remove duplicate entries (keep most recent per attraction)
         df_latest = df.sort_values('timestamp').groupby('attraction_name').last().reset_index()
@@ -169,46 +244,8 @@ def calculate_crowd_index(conn: sqlite3.Connection, park_name: str, timestamp: s
         max_wait = df_latest['wait_minutes'].max()
         num_operating = len(df_latest)
         
-        # Enhanced scoring algorithm
-        # Base score from average wait times
-        base_score = avg_wait * num_operating
-        
-        # Apply park-specific weighting
-        park_weight = PARK_CONFIG.get(park_name, {}).get("weight_factor", 1.0)
-        weighted_score = base_score * park_weight
-        
-        # Adjust for park capacity utilization
-        expected_operating = PARK_CONFIG.get(park_name, {}).get("max_attractions", 10)
-        if operating_count > 0:
-            utilization_factor = min(num_operating / expected_operating, 1.0)
-        else:
-            utilization_factor = num_operating / expected_operating if expected_operating > 0 else 0
-        
-        # Final score calculation
-        normalization_factor = NORMALIZATION_FACTORS.get(park_name, 60 * 10)
-        raw_index = (weighted_score / normalization_factor) * 100
-        
-        # Apply utilization adjustment (higher utilization = more reliable score)
-        adjusted_index = raw_index * (0.5 + 0.5 * utilization_factor)
-        
-        # Cap at 100 and round
-        crowd_index = min(round(adjusted_index), 100)
-        
-        # Determine confidence level
-        confidence = 'High' if num_operating >= expected_operating * 0.7 else \
-                    'Medium' if num_operating >= expected_operating * 0.4 else 'Low'
-
-        return {
-            'crowd_index': crowd_index,
-            'avg_wait': round(avg_wait, 1),
-            'max_wait': int(max_wait),
-            'attractions_operating': num_operating,
-            'attractions_total': total_count,
-            'data_points': len(df),
-            'confidence': confidence,
-            'timestamp': timestamp,
-            'utilization_rate': round(utilization_factor * 100, 1)
-        }
+        return score_crowd_index(park_name, avg_wait, max_wait, num_operating, len(df),
+                                 operating_count, total_count, timestamp)
 
     except Exception as e:
         logger.error(f"Error calculating crowd index for {park_name}: {e}")
@@ -223,30 +260,115 @@ def calculate_crowd_index(conn: sqlite3.Connection, park_name: str, timestamp: s
             'timestamp': timestamp
         }
 
+def park_config_frame(parks: list) -> 'pd.DataFrame':
+    """Per-park scoring constants from PARK_CONFIG, indexed by park (defaults as in calculate_crowd_index)."""
+    import pandas as pd
+    return pd.DataFrame({
+        'weight_factor': [PARK_CONFIG.get(p, {}).get("weight_factor", 1.0) for p in parks],
+        'expected_operating': [PARK_CONFIG.get(p, {}).get("max_attractions", 10) for p in parks],
+        'normalization_factor': [NORMALIZATION_FACTORS.get(p, 60 * 10) for p in parks],
+    }, index=pd.Index(parks, name='park'))
+
+def add_basic_scores(frame: 'pd.DataFrame') -> 'pd.DataFrame':
+    """
+    Vectorized calculate_crowd_index() scoring. Needs the park_config_frame() columns plus
+    avg_wait, num_operating and operating_count per row; adds utilization_factor and adjusted_index.
+    """
+    frame['num_operating'] = frame['num_operating'].fillna(0)
+    # Same arithmetic, in the same order, as calculate_crowd_index()
+    ratio = frame['num_operating'] / frame['expected_operating']
+    frame['utilization_factor'] = ratio.where(frame['operating_count'] <= 0, ratio.clip(upper=1.0))
+    frame['utilization_factor'] = frame['utilization_factor'].where(frame['expected_operating'] > 0, 0)
+    weighted_score = frame['avg_wait'] * frame['num_operating'] * frame['weight_factor']
+    raw_index = (weighted_score / frame['normalization_factor']) * 100
+    frame['adjusted_index'] = raw_index * (0.5 + 0.5 * frame['utilization_factor'])
+    return frame
+
+def calculate_crowd_index_batch(conn: sqlite3.Connection, parks: list, timestamp: str) -> Dict[str, Dict]:
+    """
+    Same result as calculate_crowd_index() for every park, from two queries instead of three per park.
+
+    One windowed statement returns each attraction's latest in-window row (ROW_NUMBER per park and
+    attraction name, mirroring the groupby().last() dedup) together with the park's raw row count;
+    one grouped statement returns total and last-hour operating counts for all parks. The scoring
+    then runs once over a park-indexed frame.
+    """
+    import pandas as pd
+    base_time = parse_timestamp(timestamp)
+    start_time = (base_time - timedelta(minutes=TIME_WINDOW_MINUTES)).isoformat()
+    end_time = (base_time + timedelta(minutes=TIME_WINDOW_MINUTES)).isoformat()
+    park_placeholders = ", ".join("?" * len(parks))
+
+    latest_query = LATEST_ROWS_CTE.format(parks=park_placeholders) + """
+    SELECT park, attraction_name, wait_minutes, data_points
+    FROM window_rows
+    WHERE rn = 1
+    """
+    latest = pd.read_sql_query(latest_query, conn, params=(*parks, start_time, end_time))
+
+    stats = get_attraction_counts(conn, parks)
+
+    # One row per requested park: config, window aggregates and attraction counts side by side
+    frame = park_config_frame(parks)
+    frame['operating_count'] = [stats.get(p, (0, 0))[0] for p in parks]
+    frame['total_count'] = [stats.get(p, (0, 0))[1] for p in parks]
+    per_park = latest.groupby('park')
+    aggregates = per_park['wait_minutes'].agg(['mean', 'max', 'size'])
+    aggregates.columns = ['avg_wait', 'max_wait', 'num_operating']
+    aggregates['data_points'] = per_park['data_points'].first()
+    frame = add_basic_scores(frame.join(aggregates))
+
+    results = {}
+    for park, row in frame.iterrows():
+        results[park] = crowd_index_result(park, timestamp, row['operating_count'], row['total_count'],
+                                           int(row['num_operating']), row['avg_wait'], row['max_wait'],
+                                           row['data_points'], row['adjusted_index'], row['utilization_factor'])
+    return results
+
+def calculate_crowd_index_lite(conn: sqlite3.Connection, parks: list, timestamp: str) -> Dict[str, Dict]:
+    """
+    calculate_crowd_index_batch() without pandas: SQLite returns each park's deduplicated
+    aggregates directly and score_crowd_index() does the rest in plain Python. Used by the CLI
+    and health checks, where importing pandas would cost more than the queries.
+    """
+    base_time = parse_timestamp(timestamp)
+    start_time = (base_time - timedelta(minutes=TIME_WINDOW_MINUTES)).isoformat()
+    end_time = (base_time + timedelta(minutes=TIME_WINDOW_MINUTES)).isoformat()
+
+    query = LATEST_ROWS_CTE.format(parks=", ".join("?" * len(parks))) + """
+    SELECT park, AVG(wait_minutes), MAX(wait_minutes), COUNT(*), MAX(data_points)
+    FROM window_rows
+    WHERE rn = 1
+    GROUP BY park
+    """
+    aggregates = {row[0]: row[1:] for row in conn.execute(query, (*parks, start_time, end_time))}
+    counts = get_attraction_counts(conn, parks)
+
+    results = {}
+    for park in parks:
+        operating_count, total_count = counts.get(park, (0, 0))
+        if park not in aggregates:
+            results[park] = crowd_index_result(park, timestamp, operating_count, total_count)
+            continue
+        avg_wait, max_wait, num_operating, data_points = aggregates[park]
+        results[park] = score_crowd_index(park, avg_wait, max_wait, num_operating, data_points,
+                                          operating_count, total_count, timestamp)
+    return results
+
 def get_crowd_level(score: int) -> str:
     """Get crowd level description based on score."""
-    for threshold, level in CROWD_THRESHOLDS:
-        if score < threshold:
-            return level
-    return CROWD_THRESHOLDS[-1][1]  # Return highest level if score >= 100
+    return common.get_crowd_level(score, CROWD_THRESHOLDS)  # score >= 100 gets the highest level
 
 def format_crowd_report(park_results: Dict) -> None:
     """Format and display crowd report with enhanced information."""
-    print("\n🌐 Disney World Park Crowd Index Report")
-    print(f"📅 Timestamp: {park_results[PARKS[0]]['timestamp']}")
-    print(f"⏰ Analysis Window: ±{TIME_WINDOW_MINUTES} minutes")
-    print("=" * 80)
-    
-    for park in PARKS:
-        result = park_results[park]
-        score = result['crowd_index']
-        level = get_crowd_level(score)
-        
-        print(f"\n🏰 {park}")
-        print(f"   Crowd Index: {score:>3}% {level}")
-        print(f"   Avg Wait: {result['avg_wait']:>5.1f} min  |  Max Wait: {result['max_wait']:>3} min")
-        print(f"   Operating: {result['attractions_operating']:>2}/{result['attractions_total']:<2} attractions  |  Utilization: {result['utilization_rate']:>5.1f}%")
-        print(f"   Data Quality: {result['confidence']:<6} ({result['data_points']} data points)")
+    common.format_crowd_report(
+        park_results, "Disney World Park Crowd Index Report", TIME_WINDOW_MINUTES,
+        lambda result: [
+            f"Operating: {result['attractions_operating']:>2}/{result['attractions_total']:<2} attractions  |  Utilization: {result['utilization_rate']:>5.1f}%",
+            f"Data Quality: {result['confidence']:<6} ({result['data_points']} data points)",
+        ],
+        get_crowd_level
+    )
 
 def get_crowd_index_summary(db_path: str, parks: list) -> Optional[Dict[str, Dict]]:
     """Returns crowd index data per park for Dash."""
@@ -255,10 +377,14 @@ def get_crowd_index_summary(db_path: str, parks: list) -> Optional[Dict[str, Dic
             latest_timestamp = get_latest_timestamp(conn)
             if not latest_timestamp:
                 return None
-            return {
-                park: calculate_crowd_index(conn, park, latest_timestamp)
-                for park in parks
-            }
+            try:
+                return calculate_crowd_index_batch(conn, parks, latest_timestamp)
+            except Exception as e:
+                logger.warning(f"Batch crowd index failed ({e}); falling back to per-park queries")
+                return {
+                    park: calculate_crowd_index(conn, park, latest_timestamp)
+                    for park in parks
+                }
     except Exception as e:
         logger.error(f"Failed to calculate crowd index summary: {e}")
         return None
@@ -278,10 +404,7 @@ def main():
             logger.info(f"Processing crowd data for timestamp: {latest_timestamp}")
             
             # Calculate crowd index for all parks
-            park_results = {}
-            for park in PARKS:
-                logger.info(f"Calculating crowd index for {park}")
-                park_results[park] = calculate_crowd_index(conn, park, latest_timestamp)
+            park_results = calculate_crowd_index_lite(conn, PARKS, latest_timestamp)
             
             # Display results
             format_crowd_report(park_results)
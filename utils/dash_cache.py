@@ -0,0 +1,194 @@
+import os
+import re
+import time
+import pickle
+import hashlib
+import logging
+import tempfile
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = 300
+DISK_CACHE_DIR = r'E:\app_data\dash_cache'
+
+# (section, park, data version); park is None for dashboard-wide sections
+CacheKey = Tuple[str, Optional[str], Hashable]
+
+MISSING = object()
+
+
+def _matches(key: CacheKey, section: Optional[str], park: Optional[str], exact: bool = False) -> bool:
+    """None matches anything, unless exact (then park None only matches dashboard-wide entries)."""
+    if section is not None and key[0] != section:
+        return False
+    return key[1] == park if exact or park is not None else True
+
+
+class MemoryBackend:
+    """Entries in this process: every browser session served by the process shares them."""
+
+    def __init__(self):
+        self._entries: Dict[CacheKey, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: CacheKey) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return MISSING
+            if entry[0] < time.time():
+                del self._entries[key]
+                return MISSING
+            return entry[1]
+
+    def set(self, key: CacheKey, value: Any, expires_at: float) -> None:
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+
+    def delete(self, section: Optional[str] = None, park: Optional[str] = None, exact: bool = False) -> int:
+        with self._lock:
+            keys = [key for key in self._entries if _matches(key, section, park, exact)]
+            for key in keys:
+                del self._entries[key]
+        return len(keys)
+
+
+class DiskBackend:
+    """
+    Pickled entries in a directory, shared by every dashboard process on the host (e.g. several
+    server workers). Files are named <section>__<park>__<hash>.pkl so invalidation needs no index.
+    """
+
+    def __init__(self, directory: str = DISK_CACHE_DIR):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def _slug(value: Optional[str]) -> str:
+        return re.sub(r'[^A-Za-z0-9]+', '_', value or '').strip('_').lower()
+
+    def _prefix(self, section: Optional[str], park: Optional[str]) -> str:
+        return f"{self._slug(section)}__{self._slug(park)}__"
+
+    def _path(self, key: CacheKey) -> str:
+        digest = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.directory, f"{self._prefix(key[0], key[1])}{digest}.pkl")
+
+    def get(self, key: CacheKey) -> Any:
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                stored_key, expires_at, value = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return MISSING
+        if stored_key != key:  # digest collision
+            return MISSING
+        if expires_at < time.time():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return MISSING
+        return value
+
+    def set(self, key: CacheKey, value: Any, expires_at: float) -> None:
+        # Write then rename, so readers in other processes never see a partial file
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump((key, expires_at, value), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, self._path(key))
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def delete(self, section: Optional[str] = None, park: Optional[str] = None, exact: bool = False) -> int:
+        removed = 0
+        for name in os.listdir(self.directory):
+            if not name.endswith('.pkl'):
+                continue
+            parts = name.split('__')
+            if len(parts) != 3:
+                continue
+            if (section is None or parts[0] == self._slug(section)) and \
+                    ((park is None and not exact) or parts[1] == self._slug(park)):
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                    removed += 1
+                except OSError:
+                    pass
+        return removed
+
+
+class _Flight:
+    """One in-progress load that concurrent callers for the same key wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error: Optional[BaseException] = None
+
+
+class DashCache:
+    """
+    Server-side cache for dashboard callback data, keyed by (section, park, data version).
+
+    get_or_load() returns the stored value while it is fresh; otherwise one caller runs the loader
+    and every concurrent caller for the same key waits for that result instead of querying the
+    database too. Storing a new version drops the section/park's older versions.
+    """
+
+    def __init__(self, backend=None, ttl: float = DEFAULT_TTL_SECONDS):
+        self.backend = backend if backend is not None else MemoryBackend()
+        self.ttl = ttl
+        self.stats = {'hits': 0, 'loads': 0, 'coalesced': 0}
+        self._flights: Dict[CacheKey, _Flight] = {}
+        self._lock = threading.Lock()
+
+    def get_or_load(self, section: str, park: Optional[str], version: Hashable,
+                    loader: Callable[[], Any], ttl: Optional[float] = None) -> Any:
+        key = (section, park, version)
+        value = self.backend.get(key)
+        if value is not MISSING:
+            self.stats['hits'] += 1
+            return value
+
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+
+        if not leader:
+            flight.done.wait()
+            self.stats['coalesced'] += 1
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            # Stored by a flight that finished between the miss above and this one starting
+            value = self.backend.get(key)
+            if value is MISSING:
+                value = loader()
+                self.stats['loads'] += 1
+                self.backend.delete(section, park, exact=True)
+                self.backend.set(key, value, time.time() + (self.ttl if ttl is None else ttl))
+            flight.value = value
+            return value
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def invalidate(self, section: Optional[str] = None, park: Optional[str] = None) -> int:
+        """Drop entries for a section and/or park (everything when both are None)."""
+        removed = self.backend.delete(section, park)
+        logger.debug(f"Invalidated {removed} cache entries (section={section}, park={park})")
+        return removed
@@ -0,0 +1,82 @@
+import os
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+MAX_POLL_ID_QUERY = "SELECT MAX(id) FROM queue_status"
+
+
+class DataVersionProbe:
+    """
+    Cheap "has anything changed?" token for a SQLite database that is read far more often than it
+    is written. The token is the result of `query` (default: the newest queue_status id), so it
+    means the same thing in every process; the probe only re-runs the query when something changed:
+
+    - normal files: PRAGMA data_version on a connection kept open changes whenever another
+      connection commits; the connection is reopened if the file itself is replaced.
+    - immutable=True (the dashboard's read replica, swapped after each poll): the file's inode,
+      mtime and size; no connection is kept, so the publisher's swap is never blocked.
+
+    version() returns None when the database can't be read, which callers treat as "changed".
+    """
+
+    def __init__(self, path: str, query: str = MAX_POLL_ID_QUERY, immutable: bool = False):
+        self.path = path
+        self.query = query
+        self.immutable = immutable
+        self.queries = 0  # times the token had to be re-read
+        self._conn: Optional[sqlite3.Connection] = None
+        self._file_key = None
+        self._data_version = None
+        self._token = None
+        self._lock = threading.Lock()
+
+    def _read_token(self, conn: sqlite3.Connection):
+        self.queries += 1
+        return conn.execute(self.query).fetchone()[0]
+
+    def _probe_immutable(self, stat: os.stat_result):
+        file_key = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if file_key != self._file_key:
+            conn = sqlite3.connect(Path(self.path).resolve().as_uri() + "?immutable=1", uri=True)
+            try:
+                self._token = self._read_token(conn)
+            finally:
+                conn.close()
+            self._file_key = file_key
+        return self._token
+
+    def _probe_connection(self, stat: os.stat_result):
+        file_key = (stat.st_dev, stat.st_ino)
+        if self._conn is None or file_key != self._file_key:
+            self.close()
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._file_key = file_key
+        data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        if data_version != self._data_version:
+            self._token = self._read_token(self._conn)
+            self._data_version = data_version
+        return self._token
+
+    def version(self):
+        with self._lock:
+            try:
+                stat = os.stat(self.path)
+                if self.immutable:
+                    return self._probe_immutable(stat)
+                return self._probe_connection(stat)
+            except (OSError, sqlite3.Error) as e:
+                logger.warning(f"Data version probe failed for {self.path}: {e}")
+                self.close()
+                self._file_key = None
+                return None
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+        self._data_version = None
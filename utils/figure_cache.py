@@ -0,0 +1,102 @@
+import json
+import hashlib
+import logging
+import threading
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+import pandas as pd
+import plotly.graph_objects as go
+import plotly.io as pio
+
+from utils.dash_cache import DashCache
+
+logger = logging.getLogger(__name__)
+
+
+def figure_json(fig: go.Figure) -> dict:
+    """A figure as plain JSON data (lists, not numpy arrays): cheap to pickle and to hand to dcc.Graph."""
+    return json.loads(pio.to_json(fig, validate=False))
+
+
+def _update_digest(digest, value) -> None:
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        digest.update(pd.util.hash_pandas_object(value, index=False).to_numpy().tobytes())
+        labels = list(value.columns) if isinstance(value, pd.DataFrame) else [value.name]
+        digest.update(repr(labels).encode('utf-8'))
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            _update_digest(digest, key)
+            _update_digest(digest, item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            _update_digest(digest, item)
+    else:
+        digest.update(repr(value).encode('utf-8'))
+    digest.update(b'\x00')
+
+
+def input_digest(*inputs) -> str:
+    """
+    Digest of the values a figure is built from: frames/series by content, dicts/lists/tuples by
+    their items, anything else by repr().
+    """
+    digest = hashlib.sha1()
+    for value in inputs:
+        _update_digest(digest, value)
+    return digest.hexdigest()
+
+
+class FigureCache:
+    """
+    Serialized Plotly figures for the dashboard's chart sections.
+
+    A section's figures for a park are stored in the DashCache under (section, park, data version),
+    so every session rendering that version reuses the same figure JSON. When the version changes,
+    each figure's inputs are digested and only the figures whose inputs changed are rebuilt; the
+    rest are carried over from the last version built in this process.
+    """
+
+    def __init__(self, cache: DashCache):
+        self.cache = cache
+        self.stats = {'built': 0, 'reused': 0}
+        # (section, park) -> {figure key: (input digest, figure JSON)} of the last version built
+        self._latest: Dict[Tuple[str, Optional[str]], Dict[Hashable, Tuple[str, dict]]] = {}
+        self._lock = threading.Lock()
+
+    def figures(self, section: str, park: Optional[str], version: Hashable,
+                inputs: Callable[[], Dict[Hashable, tuple]], build: Callable[..., go.Figure],
+                ttl: Optional[float] = None) -> Dict[Hashable, dict]:
+        """
+        {key: figure JSON} in the order inputs() returns its {key: build arguments}; build(key, *arguments)
+        makes one figure. inputs() only runs when this version isn't cached yet.
+        """
+        return self.cache.get_or_load(section, park, version,
+                                      lambda: self._build(section, park, inputs(), build), ttl=ttl)
+
+    def _build(self, section: str, park: Optional[str], inputs: Dict[Hashable, tuple],
+               build: Callable[..., go.Figure]) -> Dict[Hashable, dict]:
+        with self._lock:
+            previous = self._latest.get((section, park), {})
+
+        latest = {}
+        for key, arguments in inputs.items():
+            digest = input_digest(key, *arguments)
+            cached = previous.get(key)
+            if cached is not None and cached[0] == digest:
+                self.stats['reused'] += 1
+                latest[key] = cached
+            else:
+                self.stats['built'] += 1
+                latest[key] = (digest, figure_json(build(key, *arguments)))
+
+        with self._lock:
+            self._latest[(section, park)] = latest
+        logger.debug(f"{section}/{park}: {len(latest)} figures")
+        return {key: figure for key, (_, figure) in latest.items()}
+
+    def invalidate(self, section: Optional[str] = None, park: Optional[str] = None) -> int:
+        """Drop stored figures for a section and/or park (everything when both are None)."""
+        with self._lock:
+            for key in [k for k in self._latest if (section is None or k[0] == section) and (park is None or k[1] == park)]:
+                del self._latest[key]
+        return self.cache.invalidate(section, park)
@@ -0,0 +1,124 @@
+import math
+from typing import Dict, Hashable, List
+
+import pandas as pd
+import plotly.graph_objects as go
+import dash_bootstrap_components as dbc
+from dash import dcc, html
+from plotly.subplots import make_subplots
+
+# Panels per row of the one-figure-per-park layout (the per-ride grid shows 4 per row on wide screens)
+SUBPLOT_COLUMNS = 4
+SUBPLOT_ROW_HEIGHT = 250
+SUBPLOT_MIN_WIDTH = '1000px'
+
+
+def hour_tick_labels(hours):
+    return [f"{(h-1)%12 + 1} {'AM' if h < 12 else 'PM'}" for h in hours]
+
+
+HOURLY_TREND_XAXIS = dict(
+    tickmode='array',
+    tickvals=list(range(6, 24)),
+    ticktext=hour_tick_labels(range(6, 24)),
+    tickfont=dict(size=8),
+    range=[6, 24],
+    type='linear'
+)
+
+# Layout shared by every per-ride chart, built once; figures only add their title and trace
+HOURLY_TREND_LAYOUT = go.Layout(
+    xaxis=dict(title="Hour", **HOURLY_TREND_XAXIS),
+    yaxis_title="Avg Wait (min)",
+    height=250,
+    margin=dict(l=40, r=20, b=40, t=40),
+    showlegend=False
+)
+
+
+def hourly_trend_trace(ride: str, df_hourly: pd.DataFrame, color: str) -> go.Scatter:
+    return go.Scatter(
+        x=df_hourly['Hour'],
+        y=df_hourly['AvgWait'],
+        mode='lines+markers',
+        name=ride,
+        line=dict(width=1.5, color=color),
+        marker=dict(size=6, color=color),
+        hovertemplate="%{x}:00 – %{y:.1f} min"
+    )
+
+
+def build_hourly_trend_figure(ride: str, df_hourly: pd.DataFrame, color: str) -> go.Figure:
+    """One ride's hourly trend chart."""
+    fig = go.Figure(layout=HOURLY_TREND_LAYOUT)
+    fig.add_trace(hourly_trend_trace(ride, df_hourly, color))
+    fig.update_layout(title=ride)
+    return fig
+
+
+def build_hourly_trends_subplots(park_name: str, hourly_data: Dict[str, pd.DataFrame], colors: List[str]) -> go.Figure:
+    """
+    All of a park's top rides in one figure: a panel per ride, SUBPLOT_COLUMNS per row, every panel
+    on the same hour and wait axes so rides compare at a glance.
+    """
+    rides = list(hourly_data)
+    rows = math.ceil(len(rides) / SUBPLOT_COLUMNS)
+    fig = make_subplots(
+        rows=rows, cols=SUBPLOT_COLUMNS,
+        shared_xaxes='all', shared_yaxes='all',
+        subplot_titles=rides,
+        horizontal_spacing=0.03,
+        vertical_spacing=0.4 / rows
+    )
+
+    for i, ride in enumerate(rides):
+        fig.add_trace(hourly_trend_trace(ride, hourly_data[ride], colors[i]),
+                      row=i // SUBPLOT_COLUMNS + 1, col=i % SUBPLOT_COLUMNS + 1)
+
+    # Every panel keeps its hour labels; the last row may be partly empty
+    fig.update_xaxes(showticklabels=True, **HOURLY_TREND_XAXIS)
+    fig.update_xaxes(title_text="Hour", row=rows)
+    fig.update_yaxes(title_text="Avg Wait (min)", col=1)
+    fig.update_annotations(font_size=12)
+    fig.update_layout(
+        height=SUBPLOT_ROW_HEIGHT * rows,
+        margin=dict(l=40, r=20, b=40, t=40),
+        showlegend=False
+    )
+    return fig
+
+
+def hourly_trends_park_block(park_name: str, park_color: str, figures: Dict[Hashable, dict],
+                             subplots: bool = False) -> html.Div:
+    """
+    A park's heading and charts: a responsive grid with a dcc.Graph per ride, or (subplots) the
+    park's single multi-panel figure, scrolling sideways on narrow screens.
+    """
+    if subplots:
+        charts = html.Div(
+            dcc.Graph(
+                figure=next(iter(figures.values())),
+                config={'responsive': True},
+                style={'minWidth': SUBPLOT_MIN_WIDTH}
+            ),
+            style={'overflowX': 'auto'},
+            className="mb-5"
+        )
+    else:
+        charts = dbc.Row([
+            dbc.Col(
+                dcc.Graph(
+                    figure=fig,
+                    config={'responsive': True},
+                    style={'minWidth': '300px'}
+                ),
+                xs=12, sm=12, md=6, lg=4, xl=3
+            )
+            for fig in figures.values()
+        ], className="mb-5")
+
+    # Wrap the ride charts for this park in a card-like group
+    return html.Div([
+        html.H4(f"{park_name}", className="text-center mb-2", style={"color": park_color}),
+        charts
+    ])
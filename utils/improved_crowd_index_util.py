@@ -1,12 +1,19 @@
 #7/1/2025 IMPROVED SCRIPT: 
 
+import os
+import sys
+import time
 import sqlite3
-from datetime import datetime, timedelta
+from datetime import timedelta
 import pandas as pd
 import numpy as np
 import logging
-from typing import Dict, Optional, Tuple, List
-from contextlib import contextmanager
+from typing import Dict, Tuple, List
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils.crowd_index import common
+from utils.crowd_index.common import (get_db_connection, get_latest_timestamp, parse_timestamp,
+                                      validate_timestamp, PARKS, DB_PATH)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -86,9 +93,8 @@ DAY_ADJUSTMENTS = {
     6: 1.2    # Sunday - busy
 }
 
-PARKS = list(PARK_CONFIG.keys())
-DB_PATH = r'E:\app_data\db_live\live.db'
 TIME_WINDOW_MINUTES = 10  # Wider window for more data points
+POPULARITY_TTL_SECONDS = 900  # 7-day popularity stats barely move between polls; reuse them per park
 
 # More nuanced crowd level thresholds
 CROWD_THRESHOLDS = [
@@ -100,73 +106,128 @@ CROWD_THRESHOLDS = [
     (100, "🔴 Packed")
 ]
 
-@contextmanager
-def get_db_connection(db_path: str):
-    """Context manager for database connections with proper error handling."""
-    conn = None
-    try:
-        conn = sqlite3.connect(db_path, timeout=30.0)
-        conn.execute("PRAGMA journal_mode=WAL")
-        yield conn
-    except sqlite3.Error as e:
-        logger.error(f"Database error: {e}")
-        raise
-    finally:
-        if conn:
-            conn.close()
-
 def get_historical_baseline(conn: sqlite3.Connection, park_name: str, hour: int, weekday: int) -> float:
-    """Get historical baseline wait times for similar conditions."""
+    """
+    Historical baseline wait for the park at this weekday (Monday=0) and UTC hour, pooled over
+    hour-1..hour+1 and the last 4 weeks. Reads the crowd_baselines table the ETL refreshes nightly
+    (utils/crowd_baselines.py); falls back to the configured baseline_wait.
+    """
+    fallback = PARK_CONFIG.get(park_name, {}).get("baseline_wait", 15)
     try:
-        # Look at same hour and day of week from past 4 weeks
-        query = """
-        SELECT AVG(qs.wait_minutes) as avg_wait
-        FROM queue_status qs
-        JOIN entities e ON qs.entity_id = e.id
-        WHERE e.park = ?
-          AND e.type = 'ATTRACTION'
-          AND qs.status = 'OPERATING'
-          AND qs.wait_minutes > 0
-          AND qs.wait_minutes < 300
-          AND CAST(strftime('%H', qs.timestamp) AS INTEGER) BETWEEN ? AND ?
-          AND CAST(strftime('%w', qs.timestamp) AS INTEGER) = ?
-          AND qs.timestamp >= datetime('now', '-28 days')
-          AND qs.timestamp < datetime('now', '-1 day')
-        """
-        
-        result = conn.execute(query, (park_name, hour-1, hour+1, weekday)).fetchone()
+        result = conn.execute(
+            "SELECT mean_wait FROM crowd_baselines WHERE park = ? AND entity_id = '' AND weekday = ? AND hour = ?",
+            (park_name, weekday, hour)
+        ).fetchone()
         if result and result[0]:
             return float(result[0])
-        
-        # Fallback to park baseline
-        return PARK_CONFIG.get(park_name, {}).get("baseline_wait", 15)
-        
+        return fallback
+
     except sqlite3.Error as e:
-        logger.error(f"Error getting historical baseline for {park_name}: {e}")
-        return PARK_CONFIG.get(park_name, {}).get("baseline_wait", 15)
+        logger.warning(f"No historical baseline for {park_name} ({e}); using configured baseline")
+        return fallback
+
+# 7-day popularity per entity, one grouped query per park:
+#   avg_recent_wait          - positive waits, any status (popularity factor of every attraction)
+#   operating_sum/_count     - positive waits while OPERATING (key attraction weights)
+POPULARITY_QUERY = """
+SELECT
+    qs.entity_id,
+    AVG(qs.wait_minutes) AS avg_recent_wait,
+    SUM(CASE WHEN qs.status = 'OPERATING' THEN qs.wait_minutes END) AS operating_sum,
+    COUNT(CASE WHEN qs.status = 'OPERATING' THEN 1 END) AS operating_count
+FROM queue_status qs
+JOIN entities e ON qs.entity_id = e.id
+WHERE e.park = ?
+  AND e.type = 'ATTRACTION'
+  AND qs.wait_minutes > 0
+  AND qs.timestamp >= datetime('now', '-7 days')
+GROUP BY qs.entity_id
+"""
+
+_popularity_cache = {}   # park -> (loaded_at, {entity_id: (avg_recent_wait, operating_sum, operating_count)})
+_alias_cache = {}        # park -> (loaded_at, {alias: [entity_id, ...]})
+
+def clear_popularity_cache() -> None:
+    """Forget cached popularity stats and alias resolutions (e.g. after switching databases)."""
+    _popularity_cache.clear()
+    _alias_cache.clear()
+
+def get_attraction_popularity(conn: sqlite3.Connection, park_name: str) -> Dict[str, Tuple]:
+    """7-day popularity stats per entity of a park, cached for POPULARITY_TTL_SECONDS."""
+    cached = _popularity_cache.get(park_name)
+    if cached and time.monotonic() - cached[0] < POPULARITY_TTL_SECONDS:
+        return cached[1]
+
+    stats = {row[0]: tuple(row[1:]) for row in conn.execute(POPULARITY_QUERY, (park_name,))}
+    _popularity_cache[park_name] = (time.monotonic(), stats)
+    return stats
+
+def resolve_key_attractions(conn: sqlite3.Connection, park_name: str, attractions: List[str]) -> Dict[str, List[str]]:
+    """
+    Entity ids per key attraction name from the attraction_aliases table. Names not in the table yet
+    are matched against entity names once (the old LIKE '%name%' rule) and stored, so the table can
+    also be edited by hand for renamed rides. Works read-only too; the matches just aren't stored.
+    """
+    cached = _alias_cache.get(park_name)
+    if cached and time.monotonic() - cached[0] < POPULARITY_TTL_SECONDS and all(a in cached[1] for a in attractions):
+        return cached[1]
+
+    resolved = {attraction: [] for attraction in attractions}
+    try:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS attraction_aliases (
+                park TEXT NOT NULL,
+                alias TEXT NOT NULL,
+                entity_id TEXT NOT NULL,
+                PRIMARY KEY (park, alias, entity_id)
+            )
+        """)
+    except sqlite3.OperationalError:
+        pass  # read-only connection: resolve in memory below
+
+    try:
+        for alias, entity_id in conn.execute("SELECT alias, entity_id FROM attraction_aliases WHERE park = ?", (park_name,)):
+            if alias in resolved:
+                resolved[alias].append(entity_id)
+    except sqlite3.OperationalError:
+        pass
+
+    missing = [attraction for attraction, ids in resolved.items() if not ids]
+    if missing:
+        new_rows = []
+        for attraction in missing:
+            ids = [row[0] for row in conn.execute(
+                "SELECT id FROM entities WHERE park = ? AND type = 'ATTRACTION' AND name LIKE ?",
+                (park_name, f"%{attraction}%")
+            )]
+            resolved[attraction] = ids
+            new_rows += [(park_name, attraction, entity_id) for entity_id in ids]
+        if new_rows:
+            try:
+                conn.executemany("INSERT OR IGNORE INTO attraction_aliases (park, alias, entity_id) VALUES (?, ?, ?)", new_rows)
+                conn.commit()
+            except sqlite3.OperationalError:
+                pass
+
+    _alias_cache[park_name] = (time.monotonic(), resolved)
+    return resolved
 
 def get_key_attraction_weights(conn: sqlite3.Connection, park_name: str, attractions: List[str]) -> Dict[str, float]:
     """Calculate weights for key attractions based on recent popularity."""
     weights = {}
     
     try:
+        popularity = get_attraction_popularity(conn, park_name)
+        aliases = resolve_key_attractions(conn, park_name, attractions)
+
         for attraction in attractions:
-            query = """
-            SELECT AVG(qs.wait_minutes) as avg_wait, COUNT(*) as data_points
-            FROM queue_status qs
-            JOIN entities e ON qs.entity_id = e.id
-            WHERE e.park = ? 
-              AND e.name LIKE ?
-              AND e.type = 'ATTRACTION'
-              AND qs.status = 'OPERATING'
-              AND qs.wait_minutes > 0
-              AND qs.timestamp >= datetime('now', '-7 days')
-            """
-            
-            result = conn.execute(query, (park_name, f"%{attraction}%")).fetchone()
-            
-            if result and result[0] and result[1] >= 5:  # Minimum data points
-                avg_wait = float(result[0])
+            # Pool the OPERATING waits of every entity the name resolves to
+            stats = [popularity[entity_id] for entity_id in aliases.get(attraction, []) if entity_id in popularity]
+            total_wait = sum(s[1] or 0 for s in stats)
+            data_points = sum(s[2] for s in stats)
+
+            if data_points >= 5:  # Minimum data points
+                avg_wait = total_wait / data_points
                 # Higher average waits indicate more popular attractions
                 weights[attraction] = min(avg_wait / 30.0, 3.0)  # Cap at 3x weight
             else:
@@ -179,13 +240,36 @@ def get_key_attraction_weights(conn: sqlite3.Connection, park_name: str, attract
     
     return weights
 
+def get_key_entity_weights(conn: sqlite3.Connection, park_name: str, attractions: List[str]) -> Dict[str, float]:
+    """
+    Attraction weight per key entity id: the highest weight of the key names it resolves to,
+    doubled (key attractions count twice). Entities not in the map weigh 1.0.
+    """
+    key_weights = get_key_attraction_weights(conn, park_name, attractions)
+    entity_weights = {}
+    for key, entity_ids in resolve_key_attractions(conn, park_name, attractions).items():
+        for entity_id in entity_ids:
+            entity_weights[entity_id] = max(entity_weights.get(entity_id, 0.0), key_weights.get(key, 1.0) * 2.0)
+    return entity_weights
+
+def weight_attractions(df_latest: pd.DataFrame, entity_weights: Dict[str, float], baseline_wait: float) -> np.ndarray:
+    """
+    Weight per row of df_latest (entity_id, avg_recent_wait): the key attraction weight times the
+    recent popularity factor min(avg_recent_wait / baseline_wait, 3) where a positive average exists.
+    """
+    weights = np.array(df_latest['entity_id'].map(entity_weights).fillna(1.0), dtype=float)  # writable copy
+    recent = pd.to_numeric(df_latest['avg_recent_wait'], errors='coerce').to_numpy(dtype=float)
+    has_recent = recent > 0  # NaN compares False
+    weights[has_recent] *= np.minimum(recent[has_recent] / baseline_wait, 3.0)
+    return weights
+
 def calculate_enhanced_crowd_index(conn: sqlite3.Connection, park_name: str, timestamp: str) -> Dict:
     """
     Enhanced crowd index calculation with multiple accuracy improvements.
     """
     try:
         # Parse timestamp and get time context
-        base_time = datetime.fromisoformat(timestamp.replace('Z', '+00:00') if timestamp.endswith('Z') else timestamp)
+        base_time = parse_timestamp(timestamp)
         start_time = (base_time - timedelta(minutes=TIME_WINDOW_MINUTES)).isoformat()
         end_time = (base_time + timedelta(minutes=TIME_WINDOW_MINUTES)).isoformat()
         
@@ -199,19 +283,14 @@ def calculate_enhanced_crowd_index(conn: sqlite3.Connection, park_name: str, tim
         peak_multiplier = park_config.get("peak_multiplier", 4.0)
         capacity_factor = park_config.get("capacity_factor", 1.0)
         
-        # Enhanced query with attraction popularity
+        # Current waits; the 7-day popularity per entity comes from the cached grouped query
         query = """
         SELECT 
             qs.wait_minutes,
             qs.timestamp,
             e.name as attraction_name,
             qs.status,
-            -- Add attraction popularity score based on recent average waits
-            (SELECT AVG(qs2.wait_minutes) 
-             FROM queue_status qs2 
-             WHERE qs2.entity_id = e.id 
-               AND qs2.timestamp >= datetime('now', '-7 days')
-               AND qs2.wait_minutes > 0) as avg_recent_wait
+            e.id as entity_id
         FROM queue_status qs
         JOIN entities e ON qs.entity_id = e.id
         WHERE e.park = ?
@@ -225,6 +304,8 @@ def calculate_enhanced_crowd_index(conn: sqlite3.Connection, park_name: str, tim
         """
 
         df = pd.read_sql_query(query, conn, params=(park_name, start_time, end_time))
+        popularity = get_attraction_popularity(conn, park_name)
+        df['avg_recent_wait'] = df['entity_id'].map(lambda entity_id: popularity.get(entity_id, (None,))[0])
 
         if df.empty:
             return {
@@ -246,34 +327,9 @@ def calculate_enhanced_crowd_index(conn: sqlite3.Connection, park_name: str, tim
         historical_baseline = get_historical_baseline(conn, park_name, current_hour, current_weekday)
         
         # Calculate weighted scores
-        key_attraction_weights = get_key_attraction_weights(conn, park_name, key_attractions)
-        
-        weighted_waits = []
-        total_weight = 0
-        
-        for _, row in df_latest.iterrows():
-            wait_time = row['wait_minutes']
-            attraction_name = row['attraction_name']
-            
-            # Determine if this is a key attraction
-            is_key_attraction = any(key in attraction_name for key in key_attractions)
-            
-            if is_key_attraction:
-                # Use calculated weight for key attractions
-                weight = max([key_attraction_weights.get(key, 1.0) 
-                             for key in key_attractions if key in attraction_name])
-                weight *= 2.0  # Key attractions get double weight
-            else:
-                # Regular attractions get baseline weight
-                weight = 1.0
-                
-            # Apply recent popularity adjustment
-            if pd.notna(row['avg_recent_wait']) and row['avg_recent_wait'] > 0:
-                popularity_factor = min(row['avg_recent_wait'] / baseline_wait, 3.0)
-                weight *= popularity_factor
-            
-            weighted_waits.append(wait_time * weight)
-            total_weight += weight
+        entity_weights = get_key_entity_weights(conn, park_name, key_attractions)
+        weights = weight_attractions(df_latest, entity_weights, baseline_wait)
+        total_weight = weights.sum()
         
         if total_weight == 0:
             return {
@@ -289,7 +345,7 @@ def calculate_enhanced_crowd_index(conn: sqlite3.Connection, park_name: str, tim
             }
         
         # Calculate metrics
-        weighted_avg_wait = sum(weighted_waits) / total_weight
+        weighted_avg_wait = float(np.dot(df_latest['wait_minutes'].to_numpy(dtype=float), weights) / total_weight)
         max_wait = df_latest['wait_minutes'].max()
         num_operating = len(df_latest)
         
@@ -381,64 +437,21 @@ def get_total_attractions(conn: sqlite3.Connection, park_name: str) -> int:
         logger.error(f"Error getting total attractions for {park_name}: {e}")
         return 0
 
-def validate_timestamp(timestamp: str) -> bool:
-    """Validate timestamp format."""
-    try:
-        datetime.fromisoformat(timestamp.replace('Z', '+00:00') if timestamp.endswith('Z') else timestamp)
-        return True
-    except (ValueError, TypeError):
-        return False
-
-def get_latest_timestamp(conn: sqlite3.Connection) -> Optional[str]:
-    """Get the latest timestamp from queue_status with validation."""
-    try:
-        query = """
-        SELECT MAX(timestamp) as latest_timestamp
-        FROM queue_status 
-        WHERE timestamp IS NOT NULL
-        """
-        result = conn.execute(query).fetchone()
-        
-        if result and result[0]:
-            timestamp = result[0]
-            if validate_timestamp(timestamp):
-                return timestamp
-            else:
-                logger.warning(f"Invalid timestamp format found: {timestamp}")
-        
-        return None
-    except sqlite3.Error as e:
-        logger.error(f"Error fetching latest timestamp: {e}")
-        return None
-
 def get_crowd_level(score: int) -> str:
     """Get crowd level description based on score."""
-    for threshold, level in CROWD_THRESHOLDS:
-        if score <= threshold:
-            return level
-    return CROWD_THRESHOLDS[-1][1]
+    return common.get_crowd_level(score, CROWD_THRESHOLDS, inclusive=True)
+
+def enhanced_report_lines(result: Dict) -> List[str]:
+    lines = [f"Operating: {result['attractions_operating']:>2}/{result['attractions_total']:<2} attractions  |  Ratio: {result.get('operating_ratio', 0):>5.1f}%"]
+    if 'baseline_comparison' in result:
+        lines.append(f"vs Historical: {result['baseline_comparison']:>4.1f}x baseline ({result['historical_baseline']:>4.1f} min)")
+    lines.append(f"Data Quality: {result['confidence']:<6} ({result['data_points']} data points)")
+    return lines
 
 def format_enhanced_crowd_report(park_results: Dict) -> None:
     """Format and display enhanced crowd report."""
-    print("\n🌐 Enhanced Disney World Park Crowd Index Report")
-    print(f"📅 Timestamp: {park_results[PARKS[0]]['timestamp']}")
-    print(f"⏰ Analysis Window: ±{TIME_WINDOW_MINUTES} minutes")
-    print("=" * 90)
-    
-    for park in PARKS:
-        result = park_results[park]
-        score = result['crowd_index']
-        level = get_crowd_level(score)
-        
-        print(f"\n🏰 {park}")
-        print(f"   Crowd Index: {score:>3}% {level}")
-        print(f"   Avg Wait: {result['avg_wait']:>5.1f} min  |  Max Wait: {result['max_wait']:>3} min")
-        print(f"   Operating: {result['attractions_operating']:>2}/{result['attractions_total']:<2} attractions  |  Ratio: {result.get('operating_ratio', 0):>5.1f}%")
-        
-        if 'baseline_comparison' in result:
-            print(f"   vs Historical: {result['baseline_comparison']:>4.1f}x baseline ({result['historical_baseline']:>4.1f} min)")
-        
-        print(f"   Data Quality: {result['confidence']:<6} ({result['data_points']} data points)")
+    common.format_crowd_report(park_results, "Enhanced Disney World Park Crowd Index Report", TIME_WINDOW_MINUTES,
+                               enhanced_report_lines, get_crowd_level, width=90)
 
 def main():
     """Main execution function."""
@@ -0,0 +1,109 @@
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from utils.wait_rollups import DAY_ORDER
+
+LOCAL_TZ = 'US/Eastern'
+DAY_DTYPE = pd.CategoricalDtype(DAY_ORDER, ordered=True)
+CATEGORY_COLUMNS = ['Name', 'Type', 'status']
+# Hours on the dashboard's hourly trend charts; hours without polls count as a 0 wait
+HOURLY_TREND_HOURS = np.arange(7, 25)
+
+# Slim per-park frame kept by the dashboard (live and warehouse alike), one row per poll:
+#   Name, Type, status      category
+#   Wait Minutes            int16
+#   Timestamp               datetime64[ns, US/Eastern] - the only timestamp column
+#   Day of Week             category (Monday..Sunday, ordered)
+#   Hour of Day             int8
+# No display strings are stored: nothing renders the old HH:MM standby wait or "last updated" columns.
+
+
+def compact_park_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Build the slim frame from query rows with Name, Type, status, wait_minutes and timestamp
+    (naive UTC ISO 8601 strings, or already tz-aware). Rows whose timestamp can't be parsed are
+    dropped; nothing could place them on a chart.
+    """
+    if pd.api.types.is_datetime64_any_dtype(df['timestamp']):
+        timestamps = df['timestamp']
+        if timestamps.dt.tz is None:
+            timestamps = timestamps.dt.tz_localize('UTC')
+    else:
+        timestamps = pd.to_datetime(df['timestamp'], format='ISO8601', utc=True, errors='coerce')
+    valid = timestamps.notna().to_numpy()
+    timestamps = timestamps[valid].dt.tz_convert(LOCAL_TZ)
+
+    frame = pd.DataFrame({
+        'Name': df['Name'][valid].astype('category'),
+        'Type': df['Type'][valid].astype('category'),
+        'status': df['status'][valid].astype('category'),
+        'Wait Minutes': df['wait_minutes'][valid].fillna(0).astype('int16'),
+        'Timestamp': timestamps,
+    }).reset_index(drop=True)
+    frame['Day of Week'] = pd.Categorical.from_codes(frame['Timestamp'].dt.dayofweek.to_numpy(), dtype=DAY_DTYPE)
+    frame['Hour of Day'] = frame['Timestamp'].dt.hour.astype('int8')
+    return frame
+
+
+def concat_park_frames(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    """pd.concat that keeps the category columns categorical when the frames' categories differ."""
+    frames = [f for f in frames if not f.empty]
+    if len(frames) < 2:
+        return frames[0] if frames else pd.DataFrame()
+    aligned = [f.copy(deep=False) for f in frames]
+    for column in CATEGORY_COLUMNS:
+        categories = pd.api.types.union_categoricals([f[column] for f in frames]).categories
+        for f in aligned:
+            f[column] = f[column].cat.set_categories(categories)
+    return pd.concat(aligned, ignore_index=True)
+
+
+def frame_memory_mb(df: pd.DataFrame) -> float:
+    return df.memory_usage(deep=True).sum() / (1024 * 1024)
+
+
+def top_rides_hourly(df: pd.DataFrame, num_rides: int = 10,
+                     today: Optional[pd.Timestamp] = None) -> Dict[str, pd.DataFrame]:
+    """
+    {ride: hourly frame} for the park's top rides by average wait today (Eastern), in that order.
+    Each frame has Hour (7..24) and AvgWait, keeping only hours whose average wait is over 5 minutes;
+    rides with none are left out. One groupby over (ride, hour) for the whole park, then a ride x hour
+    matrix, instead of filtering and merging per ride.
+    """
+    if df.empty:
+        return {}
+
+    today = today if today is not None else pd.Timestamp.now(tz=LOCAL_TZ).normalize()
+    today_df = df[df['Timestamp'].dt.normalize() == today]
+    if today_df.empty:
+        return {}
+
+    top_rides = (
+        today_df
+        .groupby('Name', observed=True)['Wait Minutes']
+        .mean()
+        .nlargest(num_rides)
+        .index
+        .tolist()
+    )
+
+    top_df = today_df[today_df['Name'].isin(top_rides)]
+    hourly = (
+        top_df
+        .groupby([top_df['Name'].astype(str), top_df['Hour of Day'].astype('int64')])['Wait Minutes']
+        .mean()
+        .unstack(fill_value=0)
+        .reindex(index=top_rides, columns=HOURLY_TREND_HOURS, fill_value=0)
+    )
+
+    waits = hourly.to_numpy(dtype='float64')
+    keep = waits > 5
+    positions = np.arange(len(HOURLY_TREND_HOURS))  # the row labels the per-ride merge used to leave
+    return {
+        ride: pd.DataFrame({'Hour': HOURLY_TREND_HOURS[row_keep], 'AvgWait': row_waits[row_keep]},
+                           index=positions[row_keep])
+        for ride, row_waits, row_keep in zip(top_rides, waits, keep)
+        if row_keep.any()
+    }
@@ -0,0 +1,168 @@
+import time
+import sqlite3
+import logging
+import argparse
+from datetime import date, timedelta
+from typing import Optional
+
+import pandas as pd
+
+from utils.warehouse_parquet import WAREHOUSE_DB_PATH
+
+logger = logging.getLogger(__name__)
+
+DAY_ORDER = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+# US/Eastern wall-clock time of a naive UTC timestamp, in SQL: EDT (UTC-4) from the second Sunday
+# of March 07:00 UTC to the first Sunday of November 06:00 UTC, EST (UTC-5) otherwise.
+# date(..., 'weekday 0') moves forward to the first Sunday on or after the given date.
+LOCAL_TIME_SQL = """datetime(qs.timestamp, CASE
+    WHEN datetime(qs.timestamp) >= date(substr(qs.timestamp, 1, 4) || '-03-08', 'weekday 0') || ' 07:00:00'
+     AND datetime(qs.timestamp) <  date(substr(qs.timestamp, 1, 4) || '-11-01', 'weekday 0') || ' 06:00:00'
+    THEN '-4 hours' ELSE '-5 hours' END)"""
+
+# Rows the dashboard's historical section averages (same filter as its warehouse query), with
+# Eastern weekday (Monday=0) and hour. {where} adds the park/timestamp filter.
+LOCAL_ROWS_QUERY = f"""
+SELECT
+    park,
+    name,
+    utc_date,
+    (CAST(strftime('%w', local_ts) AS INTEGER) + 6) % 7 AS weekday,
+    CAST(strftime('%H', local_ts) AS INTEGER) AS hour,
+    wait_minutes
+FROM (
+    SELECT qs.park, e.name, date(qs.timestamp) AS utc_date, qs.wait_minutes, {LOCAL_TIME_SQL} AS local_ts
+    FROM queue_status qs
+    JOIN entities e ON qs.entity_id = e.id
+    WHERE e.type = 'ATTRACTION'
+      AND qs.wait_minutes > 1
+      AND {{where}}
+)
+"""
+
+REFRESH_QUERY = f"""
+INSERT INTO day_hour_rollups (park, name, utc_date, weekday, hour, total_wait, samples)
+SELECT park, name, utc_date, weekday, hour, SUM(wait_minutes), COUNT(*)
+FROM ({LOCAL_ROWS_QUERY.format(where='qs.timestamp >= ? AND qs.timestamp < ?')})
+GROUP BY park, name, utc_date, weekday, hour
+"""
+
+# Per (name, weekday, hour) sums for the park's top attractions by mean wait: rolled-up days plus
+# any newer warehouse rows, collapsed over days first so only a few hundred cells leave SQLite.
+CELLS_QUERY = """
+WITH cells AS (
+    SELECT name, weekday, hour, SUM(total_wait) AS total_wait, SUM(samples) AS samples
+    FROM (
+        {rollups}
+        SELECT name, weekday, hour, wait_minutes AS total_wait, 1 AS samples FROM ({tail})
+    )
+    GROUP BY name, weekday, hour
+),
+top AS (
+    SELECT name FROM cells GROUP BY name ORDER BY SUM(total_wait) * 1.0 / SUM(samples) DESC, name LIMIT ?
+)
+SELECT name, weekday, hour, total_wait, samples FROM cells WHERE name IN (SELECT name FROM top)
+"""
+
+
+def create_day_hour_rollups(conn: sqlite3.Connection) -> None:
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS day_hour_rollups (
+            park TEXT NOT NULL,
+            name TEXT NOT NULL,
+            utc_date TEXT NOT NULL,       -- UTC day the rows were polled (the ETL's unit of copying)
+            weekday INTEGER NOT NULL,     -- Eastern weekday, Monday = 0
+            hour INTEGER NOT NULL,        -- Eastern hour
+            total_wait REAL NOT NULL,
+            samples INTEGER NOT NULL,
+            PRIMARY KEY (park, name, utc_date, weekday, hour)
+        ) WITHOUT ROWID
+    """)
+    conn.commit()
+
+
+def refresh_day_hour_rollups(conn: sqlite3.Connection, start_day: date, end_day: date) -> int:
+    """
+    Re-aggregate the UTC days start_day..end_day (inclusive) of queue_status into day_hour_rollups
+    (same database). Run by the ETL for each copied day; safe to repeat. Returns the rows stored.
+    """
+    started = time.perf_counter()
+    create_day_hour_rollups(conn)
+    bounds = (start_day.isoformat(), (end_day + timedelta(days=1)).isoformat())
+    with conn:
+        conn.execute("DELETE FROM day_hour_rollups WHERE utc_date >= ? AND utc_date < ?", bounds)
+        stored = conn.execute(REFRESH_QUERY, bounds).rowcount
+    logger.info(f"Rolled up {start_day} → {end_day}: {stored} rows in {time.perf_counter() - started:.2f}s")
+    return stored
+
+
+def rollup_end(conn: sqlite3.Connection) -> Optional[str]:
+    """Last UTC day in day_hour_rollups, or None when the table is missing or empty."""
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'day_hour_rollups'"
+    ).fetchone()
+    if not exists:
+        return None
+    return conn.execute("SELECT MAX(utc_date) FROM day_hour_rollups").fetchone()[0]
+
+
+def first_unrolled_day(conn: sqlite3.Connection) -> Optional[date]:
+    """
+    First UTC day day_hour_rollups doesn't cover yet: the day after rollup_end(), or the warehouse's
+    first day when nothing is rolled up (None when queue_status is empty too).
+    """
+    last_day = rollup_end(conn)
+    if last_day is not None:
+        return date.fromisoformat(last_day) + timedelta(days=1)
+    first = conn.execute("SELECT MIN(timestamp) FROM queue_status").fetchone()[0]
+    return date.fromisoformat(first[:10]) if first else None
+
+
+def day_hour_cells(conn: sqlite3.Connection, park_name: str, num_attractions: int) -> pd.DataFrame:
+    """
+    (name, day_of_week, hour_of_day, total_wait, samples) for the park's top attractions, from the
+    rollups plus the raw warehouse days after them (everything, if nothing is rolled up yet).
+    """
+    last_day = rollup_end(conn)
+    if last_day is None:
+        rollups, params = "", []
+        tail_start = ''
+    else:
+        rollups = ("SELECT name, weekday, hour, total_wait, samples FROM day_hour_rollups WHERE park = ?\n"
+                   "        UNION ALL")
+        params = [park_name]
+        tail_start = (date.fromisoformat(last_day) + timedelta(days=1)).isoformat()
+
+    tail = LOCAL_ROWS_QUERY.format(where='qs.park = ? AND qs.timestamp >= ?')
+    query = CELLS_QUERY.format(rollups=rollups, tail=tail)
+    cells = pd.read_sql_query(query, conn, params=params + [park_name, tail_start, num_attractions])
+
+    cells['day_of_week'] = cells['weekday'].map(dict(enumerate(DAY_ORDER)))
+    return cells.rename(columns={'hour': 'hour_of_day'})[['name', 'day_of_week', 'hour_of_day', 'total_wait', 'samples']]
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Backfill day_hour_rollups in warehouse.db.")
+    arg_parser.add_argument("--start", help="First UTC day (YYYY-MM-DD); default: first day in the warehouse")
+    arg_parser.add_argument("--end", help="Last UTC day (YYYY-MM-DD); default: last day in the warehouse")
+    arg_parser.add_argument("--db", default=WAREHOUSE_DB_PATH)
+    args = arg_parser.parse_args()
+
+    conn = sqlite3.connect(args.db)
+    try:
+        first, last = conn.execute("SELECT MIN(timestamp), MAX(timestamp) FROM queue_status").fetchone()
+        if first is None:
+            print("❌ queue_status is empty")
+            return
+        start_day = date.fromisoformat(args.start or first[:10])
+        end_day = date.fromisoformat(args.end or last[:10])
+        stored = refresh_day_hour_rollups(conn, start_day, end_day)
+        print(f"✅ Stored {stored} rollup rows ({start_day} → {end_day})")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    main()
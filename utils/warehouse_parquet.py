@@ -0,0 +1,187 @@
+import os
+import shutil
+import sqlite3
+import logging
+import argparse
+from datetime import datetime, timedelta, date
+from typing import Iterable, List, Optional
+
+import pandas as pd
+import pytz
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:  # pip install pyarrow
+    pa = ds = pq = None
+
+logger = logging.getLogger(__name__)
+
+WAREHOUSE_DB_PATH = r'E:\app_data\db_data_warehouse\warehouse.db'
+PARQUET_ROOT = r'E:\app_data\db_data_warehouse\parquet'
+
+# Partitions are by park and *local* (Disney World) date, not UTC date
+LOCAL_TZ = pytz.timezone('US/Eastern')
+
+# Low-cardinality text columns stored dictionary-encoded / loaded as pandas categoricals
+CATEGORICAL_COLUMNS = ['entity_id', 'name', 'type', 'status']
+
+EXPORT_QUERY = """
+SELECT
+    qs.id,
+    qs.entity_id,
+    e.name,
+    e.type,
+    qs.park,
+    qs.status,
+    qs.wait_minutes,
+    qs.timestamp,
+    qs.lightning_lane_available,
+    qs.lightning_lane_cost,
+    qs.paid_ll_cost
+FROM queue_status qs
+JOIN entities e ON qs.entity_id = e.id
+WHERE qs.timestamp >= ? AND qs.timestamp < ?
+"""
+
+PARTITIONING_SCHEMA = None if pa is None else pa.schema([('park', pa.string()), ('date', pa.string())])
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("pyarrow is required for Parquet export/loading (pip install pyarrow)")
+
+
+def park_partition_name(park_name: str) -> str:
+    """Directory-safe partition value for a park, e.g. 'Magic Kingdom' -> 'magic_kingdom'."""
+    return park_name.strip().lower().replace(' ', '_')
+
+
+def local_day_utc_bounds(local_date: date) -> tuple:
+    """UTC [start, end) ISO strings covering one Eastern calendar day, in the stored timestamp format."""
+    start_local = LOCAL_TZ.localize(datetime(local_date.year, local_date.month, local_date.day))
+    end_local = LOCAL_TZ.localize(datetime.combine(local_date + timedelta(days=1), datetime.min.time()))
+    start_utc = start_local.astimezone(pytz.utc).replace(tzinfo=None)
+    end_utc = end_local.astimezone(pytz.utc).replace(tzinfo=None)
+    return start_utc.isoformat(), end_utc.isoformat()
+
+
+def _to_compact_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Apply the columnar schema: categoricals, small ints and a tz-aware UTC timestamp."""
+    df['timestamp'] = pd.to_datetime(df['timestamp'], format='ISO8601', utc=True)
+    df['wait_minutes'] = df['wait_minutes'].astype('Int16')
+    df['lightning_lane_available'] = df['lightning_lane_available'].astype('boolean')
+    for column in CATEGORICAL_COLUMNS:
+        df[column] = df[column].astype('category')
+    return df
+
+
+def export_local_day(conn: sqlite3.Connection, local_date: date, parquet_root: str = PARQUET_ROOT) -> int:
+    """
+    Export one Eastern-local day of warehouse queue_status rows to Parquet,
+    one file per park under <root>/park=<park>/date=<YYYY-MM-DD>/.
+    Existing partitions for the day are replaced, so re-running is safe.
+    Returns the number of rows written.
+    """
+    _require_pyarrow()
+    start_utc, end_utc = local_day_utc_bounds(local_date)
+    df = pd.read_sql_query(EXPORT_QUERY, conn, params=(start_utc, end_utc))
+    if df.empty:
+        logger.info(f"No warehouse rows to export for {local_date}")
+        return 0
+
+    df = _to_compact_frame(df)
+    day_str = local_date.isoformat()
+    written = 0
+
+    for park_name, park_df in df.groupby('park', sort=False):
+        partition_dir = os.path.join(parquet_root, f"park={park_partition_name(park_name)}", f"date={day_str}")
+        tmp_dir = partition_dir + ".tmp"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+
+        table = pa.Table.from_pandas(
+            park_df.drop(columns=['park']).sort_values('timestamp'),
+            preserve_index=False
+        )
+        pq.write_table(table, os.path.join(tmp_dir, "part-0.parquet"), compression='zstd')
+
+        # Swap the finished partition in so readers never see a half-written day
+        shutil.rmtree(partition_dir, ignore_errors=True)
+        os.replace(tmp_dir, partition_dir)
+        written += len(park_df)
+
+    logger.info(f"Exported {written} rows for {day_str} to {parquet_root}")
+    return written
+
+
+def export_date_range(db_path: str, start_date: date, end_date: date, parquet_root: str = PARQUET_ROOT) -> int:
+    """Export every local day in [start_date, end_date] - used to backfill existing history."""
+    total = 0
+    with sqlite3.connect(db_path) as conn:
+        day = start_date
+        while day <= end_date:
+            total += export_local_day(conn, day, parquet_root)
+            day += timedelta(days=1)
+    return total
+
+
+def load_warehouse_parquet(park_names: Optional[Iterable[str]] = None,
+                           columns: Optional[List[str]] = None,
+                           start_date: Optional[str] = None,
+                           end_date: Optional[str] = None,
+                           parquet_root: str = PARQUET_ROOT) -> pd.DataFrame:
+    """
+    Load warehouse rows from the Parquet export, reading only the requested
+    columns and only the park/date partitions that match.
+    Dates are local 'YYYY-MM-DD' strings (inclusive). Text columns come back as categoricals.
+    """
+    _require_pyarrow()
+    if not os.path.isdir(parquet_root):
+        return pd.DataFrame(columns=columns or [])
+
+    dataset = ds.dataset(
+        parquet_root,
+        format='parquet',
+        partitioning=ds.partitioning(PARTITIONING_SCHEMA, flavor='hive'),
+        exclude_invalid_files=True
+    )
+
+    filters = []
+    if park_names is not None:
+        filters.append(ds.field('park').isin([park_partition_name(p) for p in park_names]))
+    if start_date:
+        filters.append(ds.field('date') >= start_date)
+    if end_date:
+        filters.append(ds.field('date') <= end_date)
+
+    expression = None
+    for f in filters:
+        expression = f if expression is None else expression & f
+
+    table = dataset.to_table(columns=columns, filter=expression)
+    df = table.to_pandas()
+
+    if 'park' in df.columns:
+        df['park'] = df['park'].astype('category')
+    return df
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Export warehouse queue_status to partitioned Parquet.")
+    arg_parser.add_argument("--start", required=True, help="First local date (YYYY-MM-DD)")
+    arg_parser.add_argument("--end", help="Last local date (YYYY-MM-DD), defaults to --start")
+    arg_parser.add_argument("--db", default=WAREHOUSE_DB_PATH)
+    arg_parser.add_argument("--out", default=PARQUET_ROOT)
+    args = arg_parser.parse_args()
+
+    start_date = date.fromisoformat(args.start)
+    end_date = date.fromisoformat(args.end) if args.end else start_date
+    total = export_date_range(args.db, start_date, end_date, args.out)
+    print(f"✅ Exported {total} rows ({start_date} → {end_date}) to {args.out}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    main()